@@ -3,15 +3,48 @@ import 'package:sqflite/sqflite.dart';
 import '../models/ayah.dart';
 import '../models/root.dart';
 import '../models/surah.dart';
+import '../models/translation.dart';
 import '../models/user_progress.dart';
 import '../models/word.dart';
 import '../../services/audio/segment.dart';
 
 class QuranDao {
-  const QuranDao(this.db);
+  const QuranDao(
+    this.db, {
+    this.wordTranslationId = 1,
+    this.ayahTranslationId,
+  });
 
   final Database db;
 
+  /// Word-level translation whose glosses fill `Word.translationEn`.
+  final int wordTranslationId;
+
+  /// Ayah-level translation for `Ayah.translationEn`; null keeps the
+  /// `ayahs.translation_en` column.
+  final int? ayahTranslationId;
+
+  /// Word columns with the gloss resolved from the interned string table;
+  /// falls back to the legacy `words.translation_en` column.
+  static const String _wordColumns = '''
+      words.id, words.ayah_id, words.position, words.text_uthmani,
+      words.text_indopak,
+      COALESCE(strings.text, words.translation_en) AS translation_en,
+      words.transliteration, words.root_id, words.lemma_id,
+      words.audio_start_ms, words.audio_end_ms
+  ''';
+
+  static const String _glossJoin = '''
+      LEFT JOIN word_glosses ON word_glosses.word_id = words.id
+        AND word_glosses.translation_id = ?
+      LEFT JOIN strings ON strings.id = word_glosses.string_id
+  ''';
+
+  Future<List<Translation>> fetchTranslations() async {
+    final rows = await db.query('translations', orderBy: 'id ASC');
+    return rows.map(Translation.fromMap).toList();
+  }
+
   Future<List<Surah>> fetchSurahs() async {
     final rows = await db.query(
       'surahs',
@@ -21,21 +54,38 @@ class QuranDao {
   }
 
   Future<List<Ayah>> fetchAyahsForSurah(int surahId) async {
-    final rows = await db.query(
-      'ayahs',
-      where: 'surah_id = ?',
-      whereArgs: [surahId],
-      orderBy: 'ayah_number ASC',
+    final translationId = ayahTranslationId;
+    if (translationId == null) {
+      final rows = await db.query(
+        'ayahs',
+        where: 'surah_id = ?',
+        whereArgs: [surahId],
+        orderBy: 'ayah_number ASC',
+      );
+      return rows.map(Ayah.fromMap).toList();
+    }
+    final rows = await db.rawQuery(
+      '''
+      SELECT ayahs.id, ayahs.surah_id, ayahs.ayah_number, ayahs.text_uthmani,
+             ayahs.text_indopak,
+             COALESCE(strings.text, ayahs.translation_en) AS translation_en
+      FROM ayahs
+      LEFT JOIN ayah_translations ON ayah_translations.ayah_id = ayahs.id
+        AND ayah_translations.translation_id = ?
+      LEFT JOIN strings ON strings.id = ayah_translations.string_id
+      WHERE ayahs.surah_id = ?
+      ORDER BY ayahs.ayah_number ASC
+      ''',
+      [translationId, surahId],
     );
     return rows.map(Ayah.fromMap).toList();
   }
 
   Future<List<Word>> fetchWordsForAyah(int ayahId) async {
-    final rows = await db.query(
-      'words',
-      where: 'ayah_id = ?',
-      whereArgs: [ayahId],
-      orderBy: 'position ASC',
+    final rows = await db.rawQuery(
+      'SELECT $_wordColumns FROM words $_glossJoin '
+      'WHERE words.ayah_id = ? ORDER BY words.position ASC',
+      [wordTranslationId, ayahId],
     );
     return rows.map(Word.fromMap).toList();
   }
@@ -65,11 +115,11 @@ class QuranDao {
     if (ids.isEmpty) {
       return [];
     }
-    final rows = await db.query(
-      'words',
-      where: 'id IN (${List.filled(ids.length, '?').join(',')})',
-      whereArgs: ids,
-      orderBy: 'id ASC',
+    final rows = await db.rawQuery(
+      'SELECT $_wordColumns FROM words $_glossJoin '
+      'WHERE words.id IN (${List.filled(ids.length, '?').join(',')}) '
+      'ORDER BY words.id ASC',
+      [wordTranslationId, ...ids],
     );
     return rows.map(Word.fromMap).toList();
   }
@@ -102,20 +152,57 @@ class QuranDao {
     final rows = await db.query(
       'user_progress',
       where: 'next_review_date <= ?',
-      whereArgs: [now.toIso8601String()],
-      orderBy: 'next_review_date ASC',
+      whereArgs: [UserProgress.epochDay(now)],
+      orderBy: 'next_review_date ASC, root_id ASC',
+    );
+    return rows.map(UserProgress.fromRow).toList();
+  }
+
+  /// Root ids due on or before [now], most overdue first.
+  ///
+  /// Answered from `idx_user_progress_due` alone, so the cost depends on
+  /// [limit], not on how many roots the learner has.
+  Future<List<int>> fetchDueQueue(DateTime now, {int limit = 50}) async {
+    final rows = await db.rawQuery(
+      '''
+      SELECT root_id FROM user_progress
+      WHERE next_review_date <= ?
+      ORDER BY next_review_date ASC, root_id ASC
+      LIMIT ?
+      ''',
+      [UserProgress.epochDay(now), limit],
     );
-    return rows.map(UserProgress.fromMap).toList();
+    return rows.map((row) => row['root_id'] as int).toList();
+  }
+
+  Future<int> countDue(DateTime now) async {
+    final rows = await db.rawQuery(
+      'SELECT COUNT(*) AS due FROM user_progress WHERE next_review_date <= ?',
+      [UserProgress.epochDay(now)],
+    );
+    return rows.first['due'] as int? ?? 0;
   }
 
   Future<void> upsertUserProgress(UserProgress progress) async {
     await db.insert(
       'user_progress',
-      progress.toMap(),
+      progress.toRow(),
       conflictAlgorithm: ConflictAlgorithm.replace,
     );
   }
 
+  Future<void> upsertUserProgressBatch(Iterable<UserProgress> progress) async {
+    final batch = db.batch();
+    for (final p in progress) {
+      batch.insert(
+        'user_progress',
+        p.toRow(),
+        conflictAlgorithm: ConflictAlgorithm.replace,
+      );
+    }
+    await batch.commit(noResult: true);
+  }
+
   Future<Root?> fetchRootById(int rootId) async {
     final rows = await db.query(
       'roots',
@@ -7,7 +7,7 @@ class QuranDatabase {
   QuranDatabase._();
 
   static Database? _db;
-  static const int _dbVersion = 1;
+  static const int _dbVersion = 3;
   static const String dbName = 'quran.db';
 
   static Future<Database> open() async {
@@ -27,6 +27,14 @@ class QuranDatabase {
       onCreate: (db, version) async {
         await _createSchema(db);
       },
+      onUpgrade: (db, oldVersion, newVersion) async {
+        if (oldVersion < 2) {
+          await _migrateDueDatesToEpochDays(db);
+        }
+        if (oldVersion < 3) {
+          await _createTranslationTables(db);
+        }
+      },
     );
     return _db!;
   }
@@ -115,7 +123,7 @@ class QuranDatabase {
         srs_stage TEXT NOT NULL,
         stability REAL NOT NULL,
         difficulty REAL NOT NULL,
-        next_review_date TEXT NOT NULL,
+        next_review_date INTEGER NOT NULL,
         FOREIGN KEY (root_id) REFERENCES roots(id) ON DELETE CASCADE
       );
     ''');
@@ -140,5 +148,84 @@ class QuranDatabase {
     await db.execute('CREATE INDEX idx_ayahs_surah ON ayahs(surah_id);');
     await db.execute('CREATE INDEX idx_words_ayah ON words(ayah_id);');
     await db.execute('CREATE INDEX idx_words_root ON words(root_id);');
+    await db.execute(_createDueIndex);
+    await _createTranslationTables(db);
+  }
+
+  /// Translation registry with interned texts (see tools/etl/translations.py).
+  /// `ayah_translations` and `word_glosses` hold ids into `strings`.
+  static Future<void> _createTranslationTables(Database db) async {
+    await db.execute('''
+      CREATE TABLE IF NOT EXISTS translations (
+        id INTEGER PRIMARY KEY,
+        lang TEXT NOT NULL,
+        name TEXT NOT NULL,
+        kind TEXT NOT NULL CHECK (kind IN ('ayah', 'word')),
+        UNIQUE (kind, lang, name)
+      );
+    ''');
+
+    await db.execute('''
+      CREATE TABLE IF NOT EXISTS strings (
+        id INTEGER PRIMARY KEY,
+        text TEXT NOT NULL
+      );
+    ''');
+
+    await db.execute('''
+      CREATE TABLE IF NOT EXISTS ayah_translations (
+        translation_id INTEGER NOT NULL,
+        ayah_id INTEGER NOT NULL,
+        string_id INTEGER NOT NULL,
+        PRIMARY KEY (translation_id, ayah_id),
+        FOREIGN KEY (translation_id) REFERENCES translations(id) ON DELETE CASCADE,
+        FOREIGN KEY (ayah_id) REFERENCES ayahs(id) ON DELETE CASCADE,
+        FOREIGN KEY (string_id) REFERENCES strings(id)
+      ) WITHOUT ROWID;
+    ''');
+
+    await db.execute('''
+      CREATE TABLE IF NOT EXISTS word_glosses (
+        translation_id INTEGER NOT NULL,
+        word_id INTEGER NOT NULL,
+        string_id INTEGER NOT NULL,
+        PRIMARY KEY (translation_id, word_id),
+        FOREIGN KEY (translation_id) REFERENCES translations(id) ON DELETE CASCADE,
+        FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE,
+        FOREIGN KEY (string_id) REFERENCES strings(id)
+      ) WITHOUT ROWID;
+    ''');
+  }
+
+  /// Covers the due-queue query, so it never reads the table itself.
+  static const String _createDueIndex =
+      'CREATE INDEX idx_user_progress_due '
+      'ON user_progress(next_review_date, root_id);';
+
+  /// Version 1 stored `next_review_date` as ISO-8601 text.
+  static Future<void> _migrateDueDatesToEpochDays(Database db) async {
+    await db.transaction((txn) async {
+      await txn.execute('''
+        CREATE TABLE user_progress_v2 (
+          root_id INTEGER PRIMARY KEY,
+          srs_stage TEXT NOT NULL,
+          stability REAL NOT NULL,
+          difficulty REAL NOT NULL,
+          next_review_date INTEGER NOT NULL,
+          FOREIGN KEY (root_id) REFERENCES roots(id) ON DELETE CASCADE
+        );
+      ''');
+      await txn.execute('''
+        INSERT INTO user_progress_v2
+        SELECT root_id, srs_stage, stability, difficulty,
+               CAST(julianday(next_review_date) - 2440587.5 AS INTEGER)
+        FROM user_progress;
+      ''');
+      await txn.execute('DROP TABLE user_progress;');
+      await txn.execute(
+        'ALTER TABLE user_progress_v2 RENAME TO user_progress;',
+      );
+      await txn.execute(_createDueIndex);
+    });
   }
 }
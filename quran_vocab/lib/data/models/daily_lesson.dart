@@ -44,6 +44,11 @@ class DailyLesson {
     required this.takeaways,
     required this.tags,
     required this.source,
+    this.wordRange = const [],
+    this.rootIds = const [],
+    this.newRootIds = const [],
+    this.coverageGain = 0,
+    this.coverage = 0,
   });
 
   final String id;
@@ -59,6 +64,23 @@ class DailyLesson {
   final List<String> tags;
   final LessonSource source;
 
+  /// `[start, end)` indexes into words_full.json; empty when not linked.
+  final List<int> wordRange;
+
+  /// Distinct root ids in the lesson, in reading order.
+  final List<int> rootIds;
+
+  /// Roots first met in this lesson.
+  final List<int> newRootIds;
+
+  /// Share of all Quran words whose root is in [newRootIds].
+  final double coverageGain;
+
+  /// Running share of Quran words covered through this lesson.
+  final double coverage;
+
+  int get wordCount => wordRange.length == 2 ? wordRange[1] - wordRange[0] : 0;
+
   factory DailyLesson.fromJson(Map<String, dynamic> json) {
     return DailyLesson(
       id: json['id'] as String? ?? '',
@@ -77,6 +99,12 @@ class DailyLesson {
       source: LessonSource.fromJson(
         (json['source'] as Map<String, dynamic>? ?? const {}),
       ),
+      wordRange: (json['wordRange'] as List<dynamic>? ?? const []).cast<int>(),
+      rootIds: (json['rootIds'] as List<dynamic>? ?? const []).cast<int>(),
+      newRootIds:
+          (json['newRootIds'] as List<dynamic>? ?? const []).cast<int>(),
+      coverageGain: (json['coverageGain'] as num?)?.toDouble() ?? 0,
+      coverage: (json['coverage'] as num?)?.toDouble() ?? 0,
     );
   }
 
@@ -94,6 +122,13 @@ class DailyLesson {
       'takeaways': takeaways,
       'tags': tags,
       'source': source.toJson(),
+      if (wordRange.isNotEmpty) ...{
+        'wordRange': wordRange,
+        'rootIds': rootIds,
+        'newRootIds': newRootIds,
+        'coverageGain': coverageGain,
+        'coverage': coverage,
+      },
     };
   }
 }
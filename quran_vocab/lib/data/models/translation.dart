@@ -0,0 +1,76 @@
+/// A registered translation: one text per ayah or one gloss per word.
+class Translation {
+  const Translation({
+    required this.id,
+    required this.lang,
+    required this.name,
+    required this.kind,
+  });
+
+  final int id;
+  final String lang;
+  final String name;
+
+  /// `ayah` or `word`.
+  final String kind;
+
+  bool get isWordLevel => kind == 'word';
+
+  factory Translation.fromMap(Map<String, Object?> map) {
+    return Translation(
+      id: map['id'] as int,
+      lang: map['lang'] as String? ?? '',
+      name: map['name'] as String? ?? '',
+      kind: map['kind'] as String? ?? 'word',
+    );
+  }
+}
+
+/// Interned translations from `translations.json`.
+///
+/// Every text is stored once in [strings]; each translation is a list of
+/// string ids aligned with the order of `ayahs_full.json` (ayah-level) or
+/// `words_full.json` (word-level). Id 0 is the empty string.
+class TranslationTable {
+  TranslationTable({
+    required this.strings,
+    required this.translations,
+    required Map<int, List<int>> columns,
+  }) : _columns = columns;
+
+  final List<String> strings;
+  final List<Translation> translations;
+  final Map<int, List<int>> _columns;
+
+  factory TranslationTable.fromJson(Map<String, dynamic> json) {
+    final columns = <int, List<int>>{};
+    for (final key in const ['ayahs', 'words']) {
+      final section = json[key] as Map<String, dynamic>? ?? const {};
+      section.forEach((id, ids) {
+        columns[int.parse(id)] = (ids as List).cast<int>();
+      });
+    }
+    return TranslationTable(
+      strings: (json['strings'] as List).cast<String>(),
+      translations: (json['translations'] as List)
+          .map((e) => Translation.fromMap((e as Map).cast<String, Object?>()))
+          .toList(),
+      columns: columns,
+    );
+  }
+
+  /// The text of row [index] (0-based asset order) in translation
+  /// [translationId], or '' if it has none.
+  String textAt(int translationId, int index) {
+    final ids = _columns[translationId];
+    if (ids == null || index < 0 || index >= ids.length) return '';
+    return strings[ids[index]];
+  }
+
+  Translation? byLang(String lang, {required bool wordLevel}) {
+    for (final t in translations) {
+      if (t.lang == lang && t.isWordLevel == wordLevel) return t;
+    }
+    return null;
+  }
+}
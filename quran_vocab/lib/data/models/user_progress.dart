@@ -32,6 +32,42 @@ class UserProgress {
     );
   }
 
+  /// Reads a `user_progress` row, where `next_review_date` is stored as
+  /// integer days since the Unix epoch; see [epochDay]. The due date comes
+  /// back as local midnight of that calendar day, like the dates the app
+  /// schedules with.
+  factory UserProgress.fromRow(Map<String, Object?> row) {
+    final stageRaw = row['srs_stage'] as String? ?? 'new';
+    return UserProgress(
+      rootId: row['root_id'] as int,
+      stage: _parseStage(stageRaw),
+      stability: (row['stability'] as num?)?.toDouble() ?? 0,
+      difficulty: (row['difficulty'] as num?)?.toDouble() ?? 0,
+      nextReviewDate:
+          DateTime(1970, 1, 1 + ((row['next_review_date'] as int?) ?? 0)),
+    );
+  }
+
+  /// Row shape for the `user_progress` table; see [UserProgress.fromRow].
+  Map<String, Object?> toRow() {
+    return {
+      'root_id': rootId,
+      'srs_stage': _stageToString(stage),
+      'stability': stability,
+      'difficulty': difficulty,
+      'next_review_date': epochDay(nextReviewDate),
+    };
+  }
+
+  /// Days since 1970-01-01 for the calendar date of [date], in [date]'s own
+  /// time zone. A local date keeps its local day instead of shifting to the
+  /// UTC day, so items come due on the day they were scheduled for.
+  static int epochDay(DateTime date) {
+    return DateTime.utc(date.year, date.month, date.day)
+            .millisecondsSinceEpoch ~/
+        Duration.millisecondsPerDay;
+  }
+
   Map<String, Object?> toMap() {
     return {
       'root_id': rootId,
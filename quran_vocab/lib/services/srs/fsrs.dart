@@ -9,6 +9,17 @@ class FSRSParameters {
     this.decay = -0.5,
   });
 
+  /// Reads a weights file written by `tools/srs/optimize_fsrs.py`.
+  factory FSRSParameters.fromJson(Map<String, dynamic> json) {
+    return FSRSParameters(
+      weights: (json['weights'] as List<dynamic>)
+          .map((e) => (e as num).toDouble())
+          .toList(),
+      requestRetention:
+          (json['requestRetention'] as num?)?.toDouble() ?? 0.9,
+    );
+  }
+
   final List<double> weights;
   final double requestRetention;
   final int maximumInterval;
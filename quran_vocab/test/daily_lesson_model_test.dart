@@ -0,0 +1,50 @@
+import 'package:flutter_test/flutter_test.dart';
+
+import 'package:quran_vocab/data/models/daily_lesson.dart';
+
+void main() {
+  final base = <String, dynamic>{
+    'id': 'DL-000001',
+    'dayIndex': 0,
+    'surahId': 1,
+    'ayahStart': 1,
+    'ayahEnd': 3,
+    'verseKeys': ['1:1', '1:2', '1:3'],
+    'title': 'Test Lesson',
+    'bodyShort': 'Short body.',
+    'bodyFull': 'Full body.',
+    'takeaways': ['Takeaway 1'],
+    'tags': ['general'],
+    'source': {'work': 'Abridged', 'author': 'Committee'},
+  };
+
+  test('lessons without vocabulary links parse with empty defaults', () {
+    final lesson = DailyLesson.fromJson(base);
+
+    expect(lesson.wordRange, isEmpty);
+    expect(lesson.rootIds, isEmpty);
+    expect(lesson.wordCount, 0);
+    expect(lesson.coverage, 0);
+    expect(lesson.toJson().containsKey('wordRange'), false);
+  });
+
+  test('vocabulary links parse and round-trip', () {
+    final lesson = DailyLesson.fromJson({
+      ...base,
+      'wordRange': [0, 17],
+      'rootIds': [14, 15, 1],
+      'newRootIds': [14, 15, 1],
+      'coverageGain': 0.12,
+      'coverage': 1,
+    });
+
+    expect(lesson.wordCount, 17);
+    expect(lesson.rootIds, [14, 15, 1]);
+    expect(lesson.coverage, 1.0);
+
+    final again = DailyLesson.fromJson(lesson.toJson());
+    expect(again.wordRange, [0, 17]);
+    expect(again.newRootIds, [14, 15, 1]);
+    expect(again.coverageGain, 0.12);
+  });
+}
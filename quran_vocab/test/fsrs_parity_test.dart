@@ -0,0 +1,45 @@
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:flutter_test/flutter_test.dart';
+
+import 'package:quran_vocab/services/srs/fsrs.dart';
+
+/// Keeps `tools/srs/fsrs_sim.py` honest: the simulator checks its NumPy
+/// implementation against the same outputs. The fixture is written by
+/// `tool/generate_fsrs_parity.dart`; this test fails if `fsrs.dart` changed
+/// without regenerating it.
+void main() {
+  final fixture = File('../tools/srs/fsrs_parity.json');
+  final cases = (jsonDecode(fixture.readAsStringSync())
+          as Map<String, dynamic>)['cases'] as List<dynamic>;
+
+  for (final raw in cases.cast<Map<String, dynamic>>()) {
+    test('parity: ${raw['name']}', () {
+      final weights = (raw['weights'] as List<dynamic>?)
+          ?.map((e) => (e as num).toDouble())
+          .toList();
+      final fsrs = FSRS(
+        parameters: weights == null ? null : FSRSParameters(weights: weights),
+      );
+      final review = fsrs.review(
+        stability: (raw['stability'] as num).toDouble(),
+        difficulty: (raw['difficulty'] as num).toDouble(),
+        rating: raw['rating'] as int,
+        elapsedDays: (raw['elapsedDays'] as num?)?.toDouble(),
+      );
+      final expected = raw['expected'] as Map<String, dynamic>;
+      final stability = (expected['stability'] as num).toDouble();
+      expect(review.stability, closeTo(stability, stability.abs() * 1e-9));
+      expect(
+        review.difficulty,
+        closeTo((expected['difficulty'] as num).toDouble(), 1e-9),
+      );
+      expect(
+        review.retrievability,
+        closeTo((expected['retrievability'] as num).toDouble(), 1e-9),
+      );
+      expect(review.nextIntervalDays, expected['nextIntervalDays']);
+    });
+  }
+}
@@ -47,4 +47,16 @@ void main() {
     );
     expect(review.stability, closeTo(8.0, 1e-6));
   });
+
+  test('parameters load from an optimizer weights file', () {
+    final params = FSRSParameters.fromJson({
+      'weights': [0.5, 1, 3, 15, 7, 0.5, 1, 0.02],
+      'requestRetention': 0.85,
+      'logLoss': 0.35,
+    });
+    expect(params.weights, hasLength(8));
+    expect(params.weights[1], 1.0);
+    expect(params.requestRetention, 0.85);
+    expect(params.maximumInterval, 36500);
+  });
 }
@@ -0,0 +1,39 @@
+import 'package:flutter_test/flutter_test.dart';
+
+import 'package:quran_vocab/data/models/translation.dart';
+
+void main() {
+  final table = TranslationTable.fromJson({
+    'strings': ['', 'and', 'Allah', 'In the name of Allah'],
+    'translations': [
+      {'id': 1, 'lang': 'en', 'name': 'quranwbw', 'kind': 'word'},
+      {'id': 2, 'lang': 'en', 'name': 'sahih', 'kind': 'ayah'},
+    ],
+    'ayahs': {
+      '2': [3, 0],
+    },
+    'words': {
+      '1': [1, 2, 1, 0],
+    },
+  });
+
+  test('resolves interned ids in asset order', () {
+    expect(table.textAt(1, 0), 'and');
+    expect(table.textAt(1, 1), 'Allah');
+    expect(table.textAt(1, 2), 'and');
+    expect(table.textAt(2, 0), 'In the name of Allah');
+  });
+
+  test('id 0, unknown translations and out-of-range rows are empty', () {
+    expect(table.textAt(1, 3), '');
+    expect(table.textAt(2, 1), '');
+    expect(table.textAt(9, 0), '');
+    expect(table.textAt(1, 40), '');
+  });
+
+  test('looks translations up by language and level', () {
+    expect(table.byLang('en', wordLevel: true)?.id, 1);
+    expect(table.byLang('en', wordLevel: false)?.id, 2);
+    expect(table.byLang('ur', wordLevel: true), isNull);
+  });
+}
@@ -0,0 +1,36 @@
+import 'package:flutter_test/flutter_test.dart';
+
+import 'package:quran_vocab/data/models/user_progress.dart';
+
+void main() {
+  test('epochDay counts whole days since 1970-01-01', () {
+    expect(UserProgress.epochDay(DateTime.utc(1970, 1, 1, 23, 59)), 0);
+    expect(UserProgress.epochDay(DateTime.utc(1970, 1, 2)), 1);
+    expect(UserProgress.epochDay(DateTime.utc(2026, 2, 5, 12)), 20489);
+  });
+
+  test('epochDay uses the local calendar date of local times', () {
+    expect(UserProgress.epochDay(DateTime(2026, 2, 5)), 20489);
+    expect(UserProgress.epochDay(DateTime(2026, 2, 5, 0, 1)), 20489);
+    expect(UserProgress.epochDay(DateTime(2026, 2, 5, 23, 59)), 20489);
+  });
+
+  test('row round trip stores the due date as an epoch day', () {
+    final progress = UserProgress(
+      rootId: 7,
+      stage: SrsStage.review,
+      stability: 12.5,
+      difficulty: 4.2,
+      nextReviewDate: DateTime.utc(2026, 2, 5, 18, 30),
+    );
+    final row = progress.toRow();
+    expect(row['next_review_date'], 20489);
+
+    final restored = UserProgress.fromRow(row);
+    expect(restored.rootId, 7);
+    expect(restored.stage, SrsStage.review);
+    expect(restored.nextReviewDate, DateTime(2026, 2, 5));
+    expect(restored.nextReviewDate.isUtc, false);
+    expect(UserProgress.epochDay(restored.nextReviewDate), 20489);
+  });
+}
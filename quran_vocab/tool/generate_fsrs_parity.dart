@@ -0,0 +1,48 @@
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:quran_vocab/services/srs/fsrs.dart';
+
+/// Regenerates `tools/srs/fsrs_parity.json` from `FSRS.review`.
+///
+/// Keeps each case's inputs (name, stability, difficulty, rating,
+/// elapsedDays, weights) and rewrites its `expected` outputs. Add a case by
+/// appending its inputs to the fixture and running, from `quran_vocab/`:
+///
+///     dart run tool/generate_fsrs_parity.dart
+void main() {
+  final fixture = File('../tools/srs/fsrs_parity.json');
+  final payload =
+      jsonDecode(fixture.readAsStringSync()) as Map<String, dynamic>;
+  final cases =
+      (payload['cases'] as List<dynamic>).cast<Map<String, dynamic>>();
+
+  for (final raw in cases) {
+    final weights = (raw['weights'] as List<dynamic>?)
+        ?.map((e) => (e as num).toDouble())
+        .toList();
+    final fsrs = FSRS(
+      parameters: weights == null ? null : FSRSParameters(weights: weights),
+    );
+    final review = fsrs.review(
+      stability: (raw['stability'] as num).toDouble(),
+      difficulty: (raw['difficulty'] as num).toDouble(),
+      rating: raw['rating'] as int,
+      elapsedDays: (raw['elapsedDays'] as num?)?.toDouble(),
+    );
+    raw['expected'] = <String, dynamic>{
+      'stability': review.stability,
+      'difficulty': review.difficulty,
+      'nextIntervalDays': review.nextIntervalDays,
+      'retrievability': review.retrievability,
+    };
+  }
+
+  payload['source'] = 'quran_vocab/lib/services/srs/fsrs.dart';
+  payload['generator'] =
+      'cd quran_vocab && dart run tool/generate_fsrs_parity.dart';
+  fixture.writeAsStringSync(
+    '${const JsonEncoder.withIndent('  ').convert(payload)}\n',
+  );
+  stdout.writeln('Wrote ${cases.length} cases to ${fixture.path}');
+}
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Rank word-alignment problems across reciters.
+
+Loads every alignment file (`audio_align/<reciter>.json`, entries
+`{"surah", "ayah", "segments": [[word_start, word_end, start_ms, end_ms]],
+"stats": {"deletions", "transpositions", "insertions"}}`) into flat NumPy
+arrays with one row per segment and one per ayah. All checks are array
+operations over those rows:
+
+- zero-length segments (`end_ms <= start_ms`) and empty word spans;
+- gaps and overlaps between consecutive segments of an ayah;
+- discontinuities, where a segment does not start at the previous segment's
+  end word (words skipped or repeated);
+- word coverage per ayah against the word count in words_full.json: missing
+  words, and words past the end of the ayah;
+- outlier durations: per-word durations more than `--z` robust z-scores
+  (median/MAD of log duration, per reciter) from typical;
+- the aligner's own deletion/transposition/insertion counts.
+
+Each ayah gets a weighted problem score. The report has the distributions
+per reciter and the worst ayahs across all reciters.
+
+Usage:
+    python3 analyze_alignment.py
+    python3 analyze_alignment.py --alignment audio_align/Alafasy_128kbps.json --top 50
+"""
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from asset_io import atomic_write_json
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "quran_vocab" / "assets" / "data"
+ALIGN_DIR = DATA_DIR / "audio_align"
+WORDS_PATH = DATA_DIR / "words_full.json"
+REPORT_PATH = DATA_DIR / "alignment_report.json"
+
+LARGE_GAP_MS = 1500
+PERCENTILES = [1, 5, 25, 50, 75, 95, 99]
+# Score weight of one occurrence of each issue.
+WEIGHTS = {
+    "zero_length": 5,
+    "out_of_range": 5,
+    "missing_words": 3,
+    "overlaps": 2,
+    "discontinuities": 2,
+    "outliers": 1,
+    "large_gaps": 1,
+    "aligner_errors": 1,
+}
+
+
+@dataclass
+class Alignment:
+    reciter: str
+    surah: np.ndarray  # per ayah
+    ayah: np.ndarray
+    aligner_errors: np.ndarray
+    segment_ayah: np.ndarray  # per segment: row in the ayah arrays
+    word_start: np.ndarray
+    word_end: np.ndarray
+    start_ms: np.ndarray
+    end_ms: np.ndarray
+
+
+def load_alignment(path: Path) -> Alignment:
+    entries = json.loads(path.read_text(encoding="utf-8"))
+    counts = np.array([len(e["segments"]) for e in entries], dtype=np.int64)
+    segments = np.array(
+        [s for e in entries for s in e["segments"]], dtype=np.int64
+    ).reshape(-1, 4)
+    stats = [e.get("stats", {}) for e in entries]
+    return Alignment(
+        reciter=path.stem,
+        surah=np.array([e["surah"] for e in entries], dtype=np.int64),
+        ayah=np.array([e["ayah"] for e in entries], dtype=np.int64),
+        aligner_errors=np.array(
+            [s.get("deletions", 0) + s.get("transpositions", 0) + s.get("insertions", 0) for s in stats],
+            dtype=np.int64,
+        ),
+        segment_ayah=np.repeat(np.arange(len(entries)), counts),
+        word_start=segments[:, 0],
+        word_end=segments[:, 1],
+        start_ms=segments[:, 2],
+        end_ms=segments[:, 3],
+    )
+
+
+def load_word_counts(path: Path) -> dict[int, int]:
+    """Words per ayah keyed by surah * 1000 + ayah."""
+    words = json.loads(path.read_text(encoding="utf-8"))
+    keys = np.array([w["surah_id"] * 1000 + w["ayah_number"] for w in words], dtype=np.int64)
+    unique, counts = np.unique(keys, return_counts=True)
+    return dict(zip(unique.tolist(), counts.tolist()))
+
+
+def distribution(values: np.ndarray) -> dict:
+    if not len(values):
+        return {"count": 0}
+    return {
+        "count": int(len(values)),
+        **{f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+        "max": float(values.max()),
+    }
+
+
+def analyze(alignment: Alignment, word_counts: dict[int, int] | None, z_limit: float) -> tuple[dict, dict]:
+    """Per-reciter distributions and per-ayah issue counts (arrays over ayahs)."""
+    ayahs = len(alignment.surah)
+    rows = alignment.segment_ayah
+    # Order segments by (ayah, start) so neighbours are consecutive.
+    order = np.lexsort((alignment.start_ms, rows))
+    rows = rows[order]
+    word_start, word_end = alignment.word_start[order], alignment.word_end[order]
+    start_ms, end_ms = alignment.start_ms[order], alignment.end_ms[order]
+
+    def per_ayah(mask: np.ndarray, at: np.ndarray = rows) -> np.ndarray:
+        return np.bincount(at, weights=mask, minlength=ayahs).astype(np.int64)
+
+    duration = end_ms - start_ms
+    span = word_end - word_start
+    zero_length = (duration <= 0) | (span <= 0)
+
+    same = rows[1:] == rows[:-1]
+    pair_rows = rows[1:][same]
+    gaps = (start_ms[1:] - end_ms[:-1])[same]
+    overlaps = gaps < 0
+    large_gaps = gaps > LARGE_GAP_MS
+    discontinuities = (word_start[1:] != word_end[:-1])[same]
+
+    valid = ~zero_length
+    per_word = duration[valid] / span[valid]
+    log_duration = np.log(per_word)
+    median = np.median(log_duration) if len(log_duration) else 0.0
+    mad = np.median(np.abs(log_duration - median)) * 1.4826 if len(log_duration) else 0.0
+    robust_z = (log_duration - median) / mad if mad else np.zeros_like(log_duration)
+    outliers = np.zeros(len(rows), dtype=bool)
+    outliers[np.flatnonzero(valid)[np.abs(robust_z) > z_limit]] = True
+
+    issues = {
+        "zero_length": per_ayah(zero_length),
+        "overlaps": per_ayah(overlaps, pair_rows),
+        "large_gaps": per_ayah(large_gaps, pair_rows),
+        "discontinuities": per_ayah(discontinuities, pair_rows),
+        "outliers": per_ayah(outliers),
+        "aligner_errors": alignment.aligner_errors,
+    }
+    if word_counts is not None:
+        keys = alignment.surah * 1000 + alignment.ayah
+        expected = np.array([word_counts.get(k, 0) for k in keys.tolist()], dtype=np.int64)
+        # Distinct words covered: spans clipped to the ayah, overlaps not double counted.
+        last_end = np.full(ayahs, -1, dtype=np.int64)
+        np.maximum.at(last_end, rows, word_end)
+        clipped = np.clip(word_end, None, expected[rows]) - np.clip(word_start, 0, None)
+        covered = np.bincount(rows, weights=np.clip(clipped, 0, None), minlength=ayahs).astype(np.int64)
+        covered -= np.bincount(pair_rows, weights=np.clip((word_end[:-1] - word_start[1:])[same], 0, None),
+                               minlength=ayahs).astype(np.int64)
+        issues["missing_words"] = np.clip(expected - covered, 0, None) * (expected > 0)
+        issues["out_of_range"] = np.clip(last_end - expected, 0, None) * (expected > 0)
+
+    summary = {
+        "ayahs": ayahs,
+        "segments": int(len(rows)),
+        "duration_ms": distribution(duration[valid]),
+        "word_duration_ms": distribution(per_word),
+        "gap_ms": distribution(gaps[~overlaps]),
+        "overlap_ms": distribution(-gaps[overlaps]),
+        "issues": {name: int(counts.sum()) for name, counts in issues.items()},
+        "ayahs_with_issues": int((sum(issues.values()) > 0).sum()),
+    }
+    return summary, issues
+
+
+def rank(alignments: list[Alignment], results: list[dict], top: int) -> list[dict]:
+    scored = []
+    for alignment, issues in zip(alignments, results):
+        score = sum(WEIGHTS[name] * counts for name, counts in issues.items())
+        for row in np.argsort(-score, kind="stable")[:top]:
+            if score[row] <= 0:
+                break
+            scored.append({
+                "reciter": alignment.reciter,
+                "surah": int(alignment.surah[row]),
+                "ayah": int(alignment.ayah[row]),
+                "score": int(score[row]),
+                "issues": {name: int(c[row]) for name, c in issues.items() if c[row]},
+            })
+    scored.sort(key=lambda p: (-p["score"], p["reciter"], p["surah"], p["ayah"]))
+    return scored[:top]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analyze word-alignment quality.")
+    parser.add_argument(
+        "--alignment", type=Path, action="append",
+        help="Alignment file (repeatable; default: every reciter in audio_align/)",
+    )
+    parser.add_argument("--words", type=Path, default=WORDS_PATH, help="words_full.json for coverage")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    parser.add_argument("--top", type=int, default=100, help="Ayahs in the ranked problem list")
+    parser.add_argument("--z", type=float, default=3.5, help="Robust z-score for duration outliers")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    paths = args.alignment or sorted(
+        p for p in ALIGN_DIR.glob("*.json") if not p.name.endswith(".ranges.json")
+    )
+    word_counts = load_word_counts(args.words) if args.words.exists() else None
+    if word_counts is None:
+        print(f"⚠️  {args.words} not found; skipping word coverage checks")
+
+    started = time.perf_counter()
+    alignments = [load_alignment(path) for path in paths]
+    loaded = time.perf_counter()
+    summaries, results = {}, []
+    for alignment in alignments:
+        summary, issues = analyze(alignment, word_counts, args.z)
+        summaries[alignment.reciter] = summary
+        results.append(issues)
+    problems = rank(alignments, results, args.top)
+    finished = time.perf_counter()
+
+    for reciter, summary in summaries.items():
+        words = summary["word_duration_ms"]
+        print(
+            f"{reciter}: {summary['ayahs']:,} ayahs, {summary['segments']:,} segments, "
+            f"word duration p50 {words.get('p50', 0):.0f} ms (p1 {words.get('p1', 0):.0f}, "
+            f"p99 {words.get('p99', 0):.0f}); {summary['ayahs_with_issues']:,} ayahs with issues"
+        )
+        print("  " + ", ".join(f"{name} {count:,}" for name, count in summary["issues"].items()))
+    for problem in problems[:10]:
+        issues = ", ".join(f"{name}={count}" for name, count in problem["issues"].items())
+        print(f"  {problem['score']:>4}  {problem['reciter']} {problem['surah']}:{problem['ayah']}  {issues}")
+
+    atomic_write_json(args.output, {"reciters": summaries, "problems": problems})
+    print(
+        f"Wrote {args.output} (load {loaded - started:.2f}s, "
+        f"analysis {finished - loaded:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
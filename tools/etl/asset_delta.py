@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Keyed delta patches between two releases of a JSON asset.
+
+Records are matched by key, not by position:
+
+    surahs.json, roots.json, daily_lessons.json   id
+    ayahs_full.json                               surah_id, ayah_number
+    words_full.json                               surah_id, ayah_number, position
+    lessons.json                                  units[].id
+    audio_align/*.json                            surah, ayah
+
+A patch holds `upserts` (whole new records, or records whose field set
+changed), `updates` (key plus only the fields whose values changed) and
+`deletes` (keys). It also holds what is needed to rebuild the new file byte
+for byte: the record order, and the JSON layout of the file (indent,
+ASCII escaping, trailing newline, or asset_io's `compact` record layout). The order is "sorted" or "old" (old order
+minus deletes, inserts appended) when one of those reproduces it, else the
+full key list. The applier checks the old file's SHA-256 before patching
+and the result's SHA-256 after.
+
+Every patch is verified when it is made, by applying it to the old release.
+
+Usage:
+    python3 asset_delta.py diff old/ayahs_full.json new/ayahs_full.json -o ayahs.patch.json
+    python3 asset_delta.py apply old/ayahs_full.json ayahs.patch.json -o ayahs_full.json
+"""
+import argparse
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+from asset_io import atomic_write_bytes, dumps_records
+
+PATCH_FORMAT = "asset-delta/1"
+
+# Logical name (or audio_align/ prefix) -> (list field or None, key fields).
+KEYS = {
+    "surahs.json": (None, ["id"]),
+    "roots.json": (None, ["id"]),
+    "daily_lessons.json": (None, ["id"]),
+    "ayahs_full.json": (None, ["surah_id", "ayah_number"]),
+    "words_full.json": (None, ["surah_id", "ayah_number", "position"]),
+    "lessons.json": ("units", ["id"]),
+    "audio_align/": (None, ["surah", "ayah"]),
+}
+LAYOUTS = [
+    {"indent": 2, "ensure_ascii": False},
+    {"indent": None, "ensure_ascii": False},
+    {"indent": 2, "ensure_ascii": True},
+    {"indent": None, "ensure_ascii": True},
+    # One compact record per line, as written by `--format compact`.
+    {"compact": True},
+]
+
+
+class PatchError(Exception):
+    pass
+
+
+def key_spec(name: str) -> tuple[str | None, list[str]]:
+    for prefix, spec in KEYS.items():
+        if name == prefix or (prefix.endswith("/") and name.startswith(prefix)):
+            return spec
+    raise PatchError(f"No record key known for {name}")
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def render(document, layout: dict) -> str:
+    if layout.get("compact"):
+        return dumps_records(document, "compact")
+    return json.dumps(document, indent=layout["indent"], ensure_ascii=layout["ensure_ascii"])
+
+
+def detect_layout(data: bytes, document) -> dict | None:
+    for layout in LAYOUTS:
+        if layout.get("compact") and not isinstance(document, list):
+            continue
+        text = render(document, layout)
+        for newline in ("", "\n"):
+            if (text + newline).encode("utf-8") == data:
+                return {**layout, "newline": newline}
+    return None
+
+
+def dump(document, layout: dict | None) -> bytes:
+    if layout is None:
+        return json.dumps(document, ensure_ascii=False, indent=2).encode("utf-8")
+    return (render(document, layout) + layout["newline"]).encode("utf-8")
+
+
+def split(document, records_field: str | None) -> tuple[list[dict], dict]:
+    """(records, envelope): the keyed list and the rest of the document."""
+    if records_field is None:
+        return document, {}
+    envelope = {k: v for k, v in document.items() if k != records_field}
+    return document[records_field], envelope
+
+
+def join(records: list[dict], envelope: dict, records_field: str | None, field_order: list[str]):
+    if records_field is None:
+        return records
+    document = {**envelope, records_field: records}
+    return {k: document[k] for k in field_order}
+
+
+def index(records: list[dict], key_fields: list[str]) -> dict[tuple, dict]:
+    indexed = {}
+    for record in records:
+        key = tuple(record[field] for field in key_fields)
+        if key in indexed:
+            raise PatchError(f"Duplicate key {key}")
+        indexed[key] = record
+    return indexed
+
+
+def make_patch(name: str, old_data: bytes, new_data: bytes) -> dict:
+    records_field, key_fields = key_spec(name)
+    old_doc, new_doc = json.loads(old_data), json.loads(new_data)
+    old_records, _ = split(old_doc, records_field)
+    new_records, envelope = split(new_doc, records_field)
+    old, new = index(old_records, key_fields), index(new_records, key_fields)
+
+    upserts, updates = [], []
+    for key, record in new.items():
+        previous = old.get(key)
+        if previous == record:
+            continue
+        if previous is None or list(previous) != list(record):
+            upserts.append(record)
+        else:
+            updates.append([list(key), {f: v for f, v in record.items() if previous[f] != v}])
+    deletes = [list(key) for key in old if key not in new]
+
+    new_order = list(new)
+    kept = [key for key in old if key in new]
+    if new_order == sorted(new_order):
+        order = "sorted"
+    elif new_order == kept + [key for key in new if key not in old]:
+        order = "old"
+    else:
+        order = [list(key) for key in new_order]
+
+    patch = {
+        "format": PATCH_FORMAT,
+        "asset": name,
+        "key": key_fields,
+        "records": records_field,
+        "from": {"sha256": sha256(old_data), "bytes": len(old_data)},
+        "to": {"sha256": sha256(new_data), "bytes": len(new_data)},
+        "layout": detect_layout(new_data, new_doc),
+        "order": order,
+        "upserts": upserts,
+        "updates": updates,
+        "deletes": deletes,
+    }
+    if records_field is not None:
+        patch["envelope"] = envelope
+        patch["fields"] = list(new_doc)
+    return patch
+
+
+def apply_patch(old_data: bytes, patch: dict) -> bytes:
+    if patch.get("format") != PATCH_FORMAT:
+        raise PatchError(f"Unsupported patch format {patch.get('format')!r}")
+    if sha256(old_data) != patch["from"]["sha256"]:
+        raise PatchError(f"{patch['asset']}: base does not match the patch's source release")
+    records_field, key_fields = patch["records"], patch["key"]
+    old_records, _ = split(json.loads(old_data), records_field)
+    records = index(old_records, key_fields)
+    old_order = list(records)
+
+    for key in patch["deletes"]:
+        del records[tuple(key)]
+    for key, fields in patch["updates"]:
+        records[tuple(key)] = {**records[tuple(key)], **fields}
+    for record in patch["upserts"]:
+        key = tuple(record[field] for field in key_fields)
+        records[key] = record
+
+    if patch["order"] == "sorted":
+        keys = sorted(records)
+    elif patch["order"] == "old":
+        keys = [key for key in old_order if key in records]
+        seen = set(keys)
+        keys += [key for key in records if key not in seen]
+    else:
+        keys = [tuple(key) for key in patch["order"]]
+    document = join(
+        [records[key] for key in keys], patch.get("envelope", {}), records_field, patch.get("fields", [])
+    )
+    data = dump(document, patch["layout"])
+    if patch["layout"] is not None and sha256(data) != patch["to"]["sha256"]:
+        raise PatchError(f"{patch['asset']}: patched file does not match the target release")
+    return data
+
+
+def encode_patch(patch: dict) -> bytes:
+    return json.dumps(patch, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def diff(name: str, old_data: bytes, new_data: bytes) -> tuple[dict, bytes]:
+    """Make a patch, verify it against both releases, and return it encoded."""
+    patch = make_patch(name, old_data, new_data)
+    patched = apply_patch(old_data, patch)
+    if json.loads(patched) != json.loads(new_data):
+        raise PatchError(f"{name}: patch does not reproduce the new release")
+    return patch, encode_patch(patch)
+
+
+def size_report(patch: dict, encoded: bytes, new_data: bytes) -> str:
+    full_gz = len(gzip.compress(new_data, 9))
+    patch_gz = len(gzip.compress(encoded, 9))
+    exact = "byte-exact" if patch["layout"] else "semantic only"
+    return (
+        f"{patch['asset']}: {len(patch['upserts'])} upserts, {len(patch['updates'])} updates, "
+        f"{len(patch['deletes'])} deletes ({exact}); patch {len(encoded):,} B "
+        f"({patch_gz:,} B gzip) vs full {len(new_data):,} B ({full_gz:,} B gzip), "
+        f"{patch_gz / full_gz:.2%} of the gzip download"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Make or apply keyed asset patches.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    make = sub.add_parser("diff", help="Make a patch from OLD to NEW")
+    make.add_argument("old", type=Path)
+    make.add_argument("new", type=Path)
+    make.add_argument("--name", help="Logical asset name (default: NEW's file name)")
+    make.add_argument("-o", "--output", type=Path, required=True)
+    use = sub.add_parser("apply", help="Apply PATCH to OLD")
+    use.add_argument("old", type=Path)
+    use.add_argument("patch", type=Path)
+    use.add_argument("-o", "--output", type=Path, required=True)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        if args.command == "diff":
+            new_data = args.new.read_bytes()
+            patch, encoded = diff(args.name or args.new.name, args.old.read_bytes(), new_data)
+            atomic_write_bytes(args.output, encoded)
+            print(size_report(patch, encoded, new_data))
+        else:
+            patch = json.loads(args.patch.read_text(encoding="utf-8"))
+            data = apply_patch(args.old.read_bytes(), patch)
+            atomic_write_bytes(args.output, data)
+            verified = "SHA-256 verified" if patch["layout"] else "layout unknown, not byte-verified"
+            print(f"Patched {args.old} -> {args.output} ({len(data):,} bytes, {verified})")
+    except PatchError as e:
+        raise SystemExit(f"❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
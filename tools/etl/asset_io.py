@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Shared file I/O helpers for the ETL scripts.
+
+Writes go to a temporary file in the destination directory, which is
+fsync'd and then moved over the target with `os.replace`. A crash or a
+failed run never leaves a truncated asset behind. Readers see either the
+old file or the new one.
+
+Record lists (ayahs, words, lessons, reports) can be streamed record by
+record with `write_records`, without building the whole document in memory:
+
+    json     an indented array, byte-identical to json.dumps(..., indent=2)
+    compact  an array with one compact record per line
+    ndjson   one record per line, no enclosing array (`.ndjson`)
+
+`iter_records` reads NDJSON one line at a time, and `load_json` accepts
+`.ndjson` paths.
+"""
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+RECORD_FORMATS = ("json", "compact", "ndjson")
+# Formats that keep the `.json` name, so DataLoader, pubspec and the other
+# ETL scripts read them unchanged. App assets must use one of these.
+ASSET_FORMATS = ("json", "compact")
+
+
+def _target_mode(path: Path) -> int:
+    """The existing file's permissions, or 0666 less the umask for a new one."""
+    try:
+        return path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "wb", encoding: str | None = None):
+    """Open a temporary file that replaces `path` only if the block succeeds."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; give it the mode a plain open() would.
+        os.chmod(tmp_name, _target_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    with atomic_open(path) as f:
+        f.write(data)
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def atomic_write_json(path: Path, data, indent: int | None = 2) -> None:
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=indent))
+
+
+def format_for(path: Path) -> str:
+    return "ndjson" if Path(path).suffix == ".ndjson" else "json"
+
+
+def _encode(fmt: str, records: Iterable) -> Iterator[str]:
+    if fmt == "ndjson":
+        for record in records:
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+        return
+    first = True
+    for record in records:
+        if fmt == "compact":
+            text = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+            yield ("[\n" if first else ",\n") + text
+        else:
+            text = json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            yield ("[\n  " if first else ",\n  ") + text
+        first = False
+    yield "[]" if first else "\n]"
+
+
+def dumps_records(records: Iterable, fmt: str = "json") -> str:
+    """The text `write_records` would write for `records`."""
+    return "".join(_encode(fmt, records))
+
+
+def write_records(path: Path, records: Iterable, fmt: str = "json") -> int:
+    """Stream `records` to `path` atomically; returns how many were written."""
+    if fmt not in RECORD_FORMATS:
+        raise ValueError(f"Unknown record format {fmt!r}")
+    count = 0
+
+    def counted():
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    with atomic_open(path, "w", encoding="utf-8") as f:
+        for chunk in _encode(fmt, counted()):
+            f.write(chunk)
+    return count
+
+
+def iter_records(path: Path) -> Iterator:
+    """Records of a `.ndjson` file line by line, or of a JSON array."""
+    path = Path(path)
+    if format_for(path) != "ndjson":
+        yield from load_json(path)
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_json(path: Path):
+    if format_for(path) == "ndjson":
+        return list(iter_records(path))
+    return json.loads(Path(path).read_text(encoding="utf-8"))
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""Measure cold-start asset loading the way DataLoader.load fetches it.
+
+`DataLoader.load` reads five assets one after another (surahs, ayahs_full,
+words_full, roots, daily_lessons) and then decodes them all. This harness
+serves the asset directory from a local HTTP server that emulates a network
+link:
+- `--latency-ms` is added before each response's headers, like one round
+  trip;
+- `--bandwidth-mbps` is one link shared by all open connections, so parallel
+  fetches compete for it as they would on a phone;
+- `--compression` selects none, gzip (level 9) or br (quality 11). Bodies are
+  precompressed once, like static files on a CDN.
+
+It then replays the loader's fetch sequence for each combination of:
+- layout: `monolithic` (the five files) or `sharded` (ayahs and words split
+  into 114 per-surah files, `ayahs_full/001.json`, ...);
+- strategy: `sequential` (await each fetch, as DataLoader does today) or
+  `parallel` (`--concurrency` fetches in flight, like `Future.wait`).
+
+Each fetch records time to first byte, wire and decoded bytes, and the time
+to decompress and `json.loads` the body. Each run records the total time, and
+the time to first screen: surahs plus the ayahs and words of surah 1. Python's
+JSON decoder is not Dart's, but the relative costs of asset shapes carry
+over.
+
+Usage:
+    python3 bench_cold_start.py --data-dir /path/to/assets/data
+    python3 bench_cold_start.py --latency-ms 80 --bandwidth-mbps 10 --compression gzip,br
+    python3 bench_cold_start.py --layout sharded --strategy parallel --concurrency 6 --runs 5
+"""
+import argparse
+import gzip
+import http.client
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from asset_delta import detect_layout, dump
+from asset_io import atomic_write_json
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "quran_vocab" / "assets" / "data"
+REPORT_PATH = ROOT / "data" / "cold_start_report.json"
+
+# DataLoader.load order.
+LOAD_ORDER = ["surahs.json", "ayahs_full.json", "words_full.json", "roots.json", "daily_lessons.json"]
+SHARDED = {"ayahs_full.json", "words_full.json"}
+FIRST_SCREEN = {
+    "surahs.json", "ayahs_full.json", "words_full.json", "ayahs_full/001.json", "words_full/001.json",
+}
+LAYOUTS = ("monolithic", "sharded")
+STRATEGIES = ("sequential", "parallel")
+COMPRESSIONS = ("none", "gzip", "br")
+CHUNK = 16 * 1024
+
+
+def compress(data: bytes, method: str) -> bytes:
+    if method == "gzip":
+        return gzip.compress(data, 9, mtime=0)
+    if method == "br":
+        import brotli  # pip install brotli
+
+        return brotli.compress(data, quality=11)
+    return data
+
+
+def layout_files(data_dir: Path, layout: str) -> dict[str, bytes]:
+    """Request path -> body, in load order.
+
+    Sharded layouts interleave the shards by surah (ayahs 1, words 1, ayahs 2,
+    ...) where the monolithic files would be, so surah 1 is usable first.
+    Shards are encoded in the source file's layout (indent, escaping, compact
+    lines), so both layouts compare the same encoding. A source file in an
+    unknown layout is re-encoded with indent=2 for both.
+    """
+    files: dict[str, bytes] = {}
+    shards: dict[int, dict[str, bytes]] = {}
+    sharded = [name for name in LOAD_ORDER if name in SHARDED and (data_dir / name).exists()]
+    for name in LOAD_ORDER:
+        path = data_dir / name
+        if not path.exists():
+            continue
+        data = path.read_bytes()
+        if name not in SHARDED:
+            files[name] = data
+            continue
+        document = json.loads(data)
+        source_layout = detect_layout(data, document)
+        if layout == "monolithic":
+            files[name] = data if source_layout else dump(document, None)
+            continue
+        by_surah: dict[int, list] = {}
+        for record in document:
+            by_surah.setdefault(record["surah_id"], []).append(record)
+        stem = name.removesuffix(".json")
+        for surah, records in by_surah.items():
+            body = dump(records, source_layout)
+            shards.setdefault(surah, {})[f"{stem}/{surah:03d}.json"] = body
+        if name == sharded[-1]:
+            for surah in sorted(shards):
+                files.update(shards[surah])
+    return files
+
+
+class Link:
+    """A shared link: each chunk waits for its turn at the given bandwidth."""
+
+    def __init__(self, bandwidth_mbps: float):
+        self.bytes_per_second = bandwidth_mbps * 1e6 / 8 if bandwidth_mbps > 0 else 0.0
+        self.lock = threading.Lock()
+        self.free_at = 0.0
+
+    def send(self, wfile, data: bytes) -> None:
+        for start in range(0, len(data), CHUNK):
+            chunk = data[start:start + CHUNK]
+            if self.bytes_per_second:
+                with self.lock:
+                    begin = max(time.perf_counter(), self.free_at)
+                    self.free_at = begin + len(chunk) / self.bytes_per_second
+                    done = self.free_at
+                time.sleep(max(0.0, done - time.perf_counter()))
+            wfile.write(chunk)
+
+
+class AssetServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, bodies: dict[str, bytes], latency_s: float, link: Link):
+        super().__init__(("127.0.0.1", 0), AssetHandler)
+        self.bodies = bodies  # "/<layout>/<compression>/<path>" -> wire bytes
+        self.latency_s = latency_s
+        self.link = link
+
+
+class AssetHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle on, each response
+    # would also wait for a delayed ACK.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = self.server.bodies.get(self.path)
+        time.sleep(self.server.latency_s)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        encoding = self.path.split("/")[2]
+        if encoding != "none":
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.server.link.send(self.wfile, body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@dataclass
+class Fetch:
+    path: str
+    ttfb_ms: float
+    transfer_ms: float
+    decode_ms: float
+    wire_bytes: int
+    raw_bytes: int
+    done_ms: float
+
+
+def decompress(data: bytes, method: str) -> bytes:
+    if method == "gzip":
+        return gzip.decompress(data)
+    if method == "br":
+        import brotli
+
+        return brotli.decompress(data)
+    return data
+
+
+def fetch(conn: http.client.HTTPConnection, prefix: str, path: str, method: str, started: float) -> Fetch:
+    sent = time.perf_counter()
+    conn.request("GET", f"{prefix}/{path}", headers={"Accept-Encoding": method})
+    response = conn.getresponse()
+    first = time.perf_counter()
+    wire = response.read()
+    received = time.perf_counter()
+    if response.status != 200:
+        raise SystemExit(f"❌ {path}: HTTP {response.status}")
+    raw = decompress(wire, method)
+    json.loads(raw)
+    decoded = time.perf_counter()
+    return Fetch(
+        path=path,
+        ttfb_ms=(first - sent) * 1000,
+        transfer_ms=(received - first) * 1000,
+        decode_ms=(decoded - received) * 1000,
+        wire_bytes=len(wire),
+        raw_bytes=len(raw),
+        done_ms=(decoded - started) * 1000,
+    )
+
+
+def replay(port: int, prefix: str, paths: list[str], method: str, strategy: str, concurrency: int) -> dict:
+    """One cold start: fresh connections, every asset fetched and decoded."""
+    local = threading.local()
+    connections = []
+
+    def connection() -> http.client.HTTPConnection:
+        if not hasattr(local, "conn"):
+            local.conn = http.client.HTTPConnection("127.0.0.1", port)
+            connections.append(local.conn)
+        return local.conn
+
+    started = time.perf_counter()
+    if strategy == "sequential":
+        fetches = [fetch(connection(), prefix, path, method, started) for path in paths]
+    else:
+        with ThreadPoolExecutor(concurrency) as pool:
+            fetches = list(pool.map(lambda p: fetch(connection(), prefix, p, method, started), paths))
+    total_ms = (time.perf_counter() - started) * 1000
+    for conn in connections:
+        conn.close()
+
+    needed = [f.done_ms for f in fetches if f.path in FIRST_SCREEN]
+    return {
+        "total_ms": total_ms,
+        "first_screen_ms": max(needed) if needed else total_ms,
+        "wire_bytes": sum(f.wire_bytes for f in fetches),
+        "raw_bytes": sum(f.raw_bytes for f in fetches),
+        "decode_ms": sum(f.decode_ms for f in fetches),
+        "fetches": fetches,
+    }
+
+
+def summarize(runs: list[dict]) -> dict:
+    """Medians over runs, with per-asset detail (shards grouped by asset)."""
+    median = lambda key: statistics.median(run[key] for run in runs)  # noqa: E731
+    per_asset: dict[str, dict] = {}
+    for run_index, run in enumerate(runs):
+        groups: dict[str, list[Fetch]] = {}
+        for f in run["fetches"]:
+            groups.setdefault(f.path.split("/")[0].removesuffix(".json") + ".json", []).append(f)
+        for name, fetches in groups.items():
+            entry = per_asset.setdefault(name, {"requests": len(fetches), "samples": []})
+            entry["samples"].append({
+                "ttfb_ms": statistics.median(f.ttfb_ms for f in fetches),
+                "decode_ms": sum(f.decode_ms for f in fetches),
+                "wire_bytes": sum(f.wire_bytes for f in fetches),
+                "raw_bytes": sum(f.raw_bytes for f in fetches),
+                "done_ms": max(f.done_ms for f in fetches),
+            })
+    for entry in per_asset.values():
+        samples = entry.pop("samples")
+        for key in samples[0]:
+            entry[key] = statistics.median(s[key] for s in samples)
+    return {
+        "total_ms": median("total_ms"),
+        "first_screen_ms": median("first_screen_ms"),
+        "wire_bytes": runs[0]["wire_bytes"],
+        "raw_bytes": runs[0]["raw_bytes"],
+        "decode_ms": median("decode_ms"),
+        "assets": per_asset,
+        "runs": [{k: v for k, v in run.items() if k != "fetches"} for run in runs],
+        "last_run": [asdict(f) for f in runs[-1]["fetches"]],
+    }
+
+
+def parse_list(value: str, allowed: tuple[str, ...]) -> list[str]:
+    items = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [v for v in items if v not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown {unknown}; choose from {', '.join(allowed)}")
+    return items
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark cold-start asset loading over an emulated link.")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="Added before each response")
+    parser.add_argument("--bandwidth-mbps", type=float, default=50.0, help="Shared link; 0 for unlimited")
+    parser.add_argument("--layout", type=lambda v: parse_list(v, LAYOUTS), default=list(LAYOUTS))
+    parser.add_argument("--strategy", type=lambda v: parse_list(v, STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("--compression", type=lambda v: parse_list(v, COMPRESSIONS), default=["none", "gzip"])
+    parser.add_argument("--concurrency", type=int, default=6, help="Parallel fetches in flight")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    missing = [name for name in LOAD_ORDER if not (args.data_dir / name).exists()]
+    if len(missing) == len(LOAD_ORDER):
+        raise SystemExit(f"❌ No assets found in {args.data_dir}")
+    if missing:
+        print(f"⚠️  Not in {args.data_dir}, skipped: {', '.join(missing)}")
+
+    bodies: dict[str, bytes] = {}
+    paths: dict[str, list[str]] = {}
+    for layout in args.layout:
+        files = layout_files(args.data_dir, layout)
+        paths[layout] = list(files)
+        for method in args.compression:
+            for path, data in files.items():
+                bodies[f"/{layout}/{method}/{path}"] = compress(data, method)
+
+    server = AssetServer(bodies, args.latency_ms / 1000, Link(args.bandwidth_mbps))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    link = f"{args.bandwidth_mbps:g} Mbit/s" if args.bandwidth_mbps > 0 else "unlimited"
+    print(f"Serving {args.data_dir} on :{port} ({args.latency_ms:g} ms latency, {link})")
+    print(f"{'layout':<11} {'strategy':<10} {'enc':<5} {'requests':>8} {'wire':>10} "
+          f"{'decode':>8} {'first screen':>13} {'total':>9}")
+
+    results = []
+    try:
+        for layout in args.layout:
+            for strategy in args.strategy:
+                for method in args.compression:
+                    prefix = f"/{layout}/{method}"
+                    runs = [
+                        replay(port, prefix, paths[layout], method, strategy, args.concurrency)
+                        for _ in range(args.runs)
+                    ]
+                    summary = summarize(runs)
+                    results.append({"layout": layout, "strategy": strategy, "compression": method, **summary})
+                    print(
+                        f"{layout:<11} {strategy:<10} {method:<5} {len(paths[layout]):>8} "
+                        f"{summary['wire_bytes'] / 1e6:>8.2f}MB {summary['decode_ms']:>6.0f}ms "
+                        f"{summary['first_screen_ms']:>11.0f}ms {summary['total_ms']:>7.0f}ms"
+                    )
+    finally:
+        server.shutdown()
+
+    atomic_write_json(args.output, {
+        "data_dir": str(args.data_dir),
+        "latency_ms": args.latency_ms,
+        "bandwidth_mbps": args.bandwidth_mbps,
+        "concurrency": args.concurrency,
+        "runs": args.runs,
+        "results": results,
+    })
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Load test for quran_query_server.py on localhost.
+
+Builds a pool of `--distinct` request paths from the database: whole surahs,
+ayah ranges (some with words), word-by-word verses and ranges, roots by id
+and by text, and fuzzy searches for misspelled terms (fuzzy_index.perturb).
+Requests are drawn from the pool with Zipf weights (rank^-1), so a few paths
+are hot and most are cold, as with real readers. `--concurrency` client
+threads each keep one HTTP/1.1 connection open. With `--revalidate`, that
+share of repeat requests sends the ETag it got before (`If-None-Match`).
+
+Without `--url`, the server is started in-process once per `--cache-entries`
+value (default: off, then on) so the cache's effect shows in one run. Reports
+p50/p99 latency and requests/sec overall and per endpoint, and writes them to
+`data/query_server_report.json`.
+
+Usage:
+    python3 bench_query_server.py data/quran.db
+    python3 bench_query_server.py data/quran.db --requests 20000 --concurrency 16 --revalidate 0.5
+    python3 bench_query_server.py data/quran.db --url http://127.0.0.1:8765
+"""
+import argparse
+import http.client
+import json
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from asset_io import atomic_write_json
+from fuzzy_index import perturb
+from quran_query_server import QueryServer
+
+ROOT = Path(__file__).resolve().parents[2]
+REPORT_PATH = ROOT / "data" / "query_server_report.json"
+
+
+def build_paths(db: Path, distinct: int, rng: random.Random) -> list[str]:
+  conn = sqlite3.connect(f"file:{quote(str(db.resolve()))}?mode=ro", uri=True)
+  surahs = conn.execute("SELECT id, verse_count FROM surahs").fetchall()
+  roots = conn.execute("SELECT id, root_text FROM roots").fetchall()
+  has_fuzzy = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'search_terms'").fetchone()
+  terms = [t for (t,) in conn.execute("SELECT term FROM search_terms WHERE length(term) >= 4")] if has_fuzzy else []
+  conn.close()
+
+  def verse() -> tuple[int, int, int]:
+    surah, count = rng.choice(surahs)
+    ayah = rng.randint(1, count)
+    return surah, ayah, count
+
+  def make() -> str:
+    kind = rng.random()
+    if kind < 0.1:
+      return f"/surahs/{rng.choice(surahs)[0]}"
+    if kind < 0.35:
+      surah, ayah, count = verse()
+      words = "?words=1" if rng.random() < 0.5 else ""
+      return f"/ayahs/{surah}:{ayah}-{min(count, ayah + rng.randint(0, 9))}{words}"
+    if kind < 0.6:
+      surah, ayah, count = verse()
+      last = ayah if rng.random() < 0.5 else min(count, ayah + rng.randint(1, 4))
+      return f"/words/{surah}:{ayah}" + (f"-{last}" if last != ayah else "")
+    if kind < 0.8 or not terms:
+      root_id, root_text = rng.choice(roots)
+      return f"/roots/{root_id}" if rng.random() < 0.5 else f"/roots/{quote(root_text)}"
+    return f"/search?q={quote(perturb(rng.choice(terms), rng))}"
+
+  paths = set()
+  for _ in range(distinct * 20):
+    if len(paths) >= distinct:
+      break
+    paths.add(make())
+  paths = sorted(paths)
+  rng.shuffle(paths)
+  return paths
+
+
+def endpoint(path: str) -> str:
+  return urlsplit(path).path.split("/")[1]
+
+
+def percentile(ordered: list[float], q: float) -> float:
+  return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+def run_client(host: str, port: int, paths: list[str], revalidate: float, seed: int, out: list) -> None:
+  rng = random.Random(seed)
+  conn = http.client.HTTPConnection(host, port)
+  etags: dict[str, str] = {}
+  for path in paths:
+    headers = {}
+    if path in etags and rng.random() < revalidate:
+      headers["If-None-Match"] = etags[path]
+    started = time.perf_counter()
+    conn.request("GET", path, headers=headers)
+    response = conn.getresponse()
+    response.read()
+    out.append((endpoint(path), (time.perf_counter() - started) * 1000, response.status))
+    if response.getheader("ETag"):
+      etags[path] = response.getheader("ETag")
+  conn.close()
+
+
+def summarize(samples: list[tuple[str, float, int]], elapsed: float) -> dict:
+  def stats(latencies: list[float]) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "p50_ms": round(percentile(ordered, 0.5), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+    }
+
+  statuses: dict[int, int] = {}
+  for _, _, status in samples:
+    statuses[status] = statuses.get(status, 0) + 1
+  by_endpoint: dict[str, list[float]] = {}
+  for name, latency, _ in samples:
+    by_endpoint.setdefault(name, []).append(latency)
+  return {
+      **stats([latency for _, latency, _ in samples]),
+      "requests_per_s": round(len(samples) / elapsed, 1),
+      "statuses": {str(k): v for k, v in sorted(statuses.items())},
+      "endpoints": {name: stats(latencies) for name, latencies in sorted(by_endpoint.items())},
+  }
+
+
+def load(host: str, port: int, pool: list[str], args: argparse.Namespace) -> dict:
+  rng = random.Random(args.seed)
+  weights = [1 / (rank + 1) for rank in range(len(pool))]
+  # Warm up the connections and page cache with the hottest paths.
+  run_client(host, port, pool[:50], 0.0, args.seed, [])
+  requests = rng.choices(pool, weights, k=args.requests)
+
+  outputs: list[list] = [[] for _ in range(args.concurrency)]
+  threads = [
+      threading.Thread(
+          target=run_client,
+          args=(host, port, requests[i::args.concurrency], args.revalidate, args.seed + i, outputs[i]),
+      )
+      for i in range(args.concurrency)
+  ]
+  started = time.perf_counter()
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  elapsed = time.perf_counter() - started
+
+  result = summarize([sample for output in outputs for sample in output], elapsed)
+  conn = http.client.HTTPConnection(host, port)
+  conn.request("GET", "/_stats")
+  result["server"] = json.loads(conn.getresponse().read())
+  conn.close()
+  return result
+
+
+def print_result(label: str, result: dict) -> None:
+  cache = result["server"]["cache"]
+  lookups = cache["hits"] + cache["misses"]
+  print(
+      f"{label}: {result['requests']:,} requests, {result['requests_per_s']:,.0f} req/s, "
+      f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+      f"cache hits {cache['hits'] / max(lookups, 1):.0%}, statuses {result['statuses']}"
+  )
+  for name, stats in result["endpoints"].items():
+    print(f"  {name:<8} {stats['requests']:>7,}  p50 {stats['p50_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms")
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Load-test the quran.db query server on localhost.")
+  parser.add_argument("db", type=Path, nargs="?", default=Path("data/quran.db"))
+  parser.add_argument("--url", help="Test a running server instead of starting one")
+  parser.add_argument("--requests", type=int, default=10000)
+  parser.add_argument("--concurrency", type=int, default=8)
+  parser.add_argument("--distinct", type=int, default=2000, help="Distinct request paths")
+  parser.add_argument("--revalidate", type=float, default=0.0, help="Share of repeats sent with If-None-Match")
+  parser.add_argument("--cache-entries", default="0,4096", help="Comma-separated; one run per value")
+  parser.add_argument("--pool-size", type=int, default=4)
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--output", type=Path, default=REPORT_PATH)
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  if not args.db.exists():
+    raise SystemExit(f"❌ {args.db} not found; run build_quran_db.py first")
+  pool = build_paths(args.db, args.distinct, random.Random(args.seed))
+  print(
+      f"{len(pool):,} distinct paths, {args.requests:,} requests, "
+      f"{args.concurrency} clients, revalidate {args.revalidate:.0%}"
+  )
+
+  runs = {}
+  if args.url:
+    url = urlsplit(args.url)
+    runs[args.url] = load(url.hostname, url.port or 80, pool, args)
+    print_result(args.url, runs[args.url])
+  else:
+    for entries in [int(v) for v in args.cache_entries.split(",")]:
+      server = QueryServer(("127.0.0.1", 0), args.db, args.pool_size, entries)
+      thread = threading.Thread(target=server.serve_forever, daemon=True)
+      thread.start()
+      label = f"cache {entries:,} entries" if entries else "no cache"
+      try:
+        runs[label] = load("127.0.0.1", server.server_port, pool, args)
+      finally:
+        server.shutdown()
+        server.server_close()
+      print_result(label, runs[label])
+
+  atomic_write_json(args.output, {
+      "db": str(args.db),
+      "requests": args.requests,
+      "concurrency": args.concurrency,
+      "distinct": len(pool),
+      "revalidate": args.revalidate,
+      "runs": runs,
+  })
+  print(f"📄 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark the `user_progress` due-queue query at increasing collection sizes.
+
+Seeds progress rows into a scratch database built with `create_schema`, then
+times the due-queue lookup `due_queue` performs. For comparison it also times
+the previous layout: ISO-8601 text dates without an index.
+
+Usage:
+    python3 bench_review_queue.py
+    python3 bench_review_queue.py --rows 100000 --limit 50
+"""
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from build_quran_db import create_schema, due_queue, epoch_day
+
+LEGACY_QUERY = """
+  SELECT root_id FROM user_progress
+  WHERE next_review_date <= ?
+  ORDER BY next_review_date ASC
+  LIMIT ?
+"""
+
+
+def seed(conn: sqlite3.Connection, rows: int, today: date, legacy: bool) -> None:
+  rng = random.Random(rows)
+  conn.execute("PRAGMA foreign_keys = OFF")
+  records = []
+  for root_id in range(1, rows + 1):
+    due = today + timedelta(days=rng.randint(-30, 365))
+    records.append((
+        root_id,
+        "review",
+        rng.uniform(1, 400),
+        rng.uniform(1, 10),
+        due.isoformat() + "T00:00:00.000" if legacy else epoch_day(due),
+    ))
+  conn.executemany("INSERT INTO user_progress VALUES (?, ?, ?, ?, ?)", records)
+  conn.commit()
+
+
+def legacy_schema(conn: sqlite3.Connection) -> None:
+  conn.execute(
+      """
+      CREATE TABLE user_progress (
+        root_id INTEGER PRIMARY KEY,
+        srs_stage TEXT NOT NULL,
+        stability REAL NOT NULL,
+        difficulty REAL NOT NULL,
+        next_review_date TEXT NOT NULL
+      )
+      """
+  )
+
+
+def time_query(run, repeats: int) -> float:
+  run()
+  started = time.perf_counter()
+  for _ in range(repeats):
+    run()
+  return (time.perf_counter() - started) / repeats * 1e6
+
+
+def bench(rows: int, limit: int, repeats: int, workdir: Path) -> tuple[float, float, str]:
+  today = date.today()
+
+  indexed = sqlite3.connect(workdir / f"indexed_{rows}.db")
+  create_schema(indexed)
+  seed(indexed, rows, today, legacy=False)
+  plan = " | ".join(
+      row[-1] for row in indexed.execute(
+          "EXPLAIN QUERY PLAN SELECT root_id FROM user_progress "
+          "WHERE next_review_date <= ? ORDER BY next_review_date, root_id LIMIT ?",
+          (epoch_day(today), limit),
+      )
+  )
+  indexed_us = time_query(lambda: due_queue(indexed, epoch_day(today), limit), repeats)
+  indexed.close()
+
+  legacy = sqlite3.connect(workdir / f"legacy_{rows}.db")
+  legacy_schema(legacy)
+  seed(legacy, rows, today, legacy=True)
+  cutoff = today.isoformat() + "T23:59:59.999"
+  legacy_us = time_query(
+      lambda: legacy.execute(LEGACY_QUERY, (cutoff, limit)).fetchall(), repeats
+  )
+  legacy.close()
+  return indexed_us, legacy_us, plan
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Benchmark the review due queue.")
+  parser.add_argument("--rows", type=int, default=100_000)
+  parser.add_argument("--limit", type=int, default=50)
+  parser.add_argument("--repeats", type=int, default=200)
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  sizes = sorted({1_000, 10_000, args.rows})
+  with tempfile.TemporaryDirectory() as tmp:
+    print(f"{'rows':>8}  {'indexed (us)':>12}  {'legacy (us)':>12}")
+    plan = ""
+    for rows in sizes:
+      indexed_us, legacy_us, plan = bench(rows, args.limit, args.repeats, Path(tmp))
+      print(f"{rows:>8}  {indexed_us:>12.1f}  {legacy_us:>12.1f}")
+    print(f"Query plan: {plan}")
+
+
+if __name__ == "__main__":
+  main()
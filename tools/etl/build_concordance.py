@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Precompute a keyword-in-context concordance for every root and lemma.
+
+One pass over `words` in reading order, one ayah at a time. Each word that
+has a root or lemma produces a line
+
+    {"k": "2:255", "p": 3, "l": ["...", "..."], "w": "...", "r": ["...", "..."]}
+
+(verse key, word position, up to N words of left and right context within
+the ayah) that is appended to that term's shard, `root/<id>.ndjson` or
+`lemma/<id>.ndjson`. Shards fill in reading order. Lines are buffered in
+memory up to a fixed total and then flushed in one append per shard, so
+memory does not grow with the number of roots.
+
+`index.json` lists every term with its occurrence count and the byte offset
+of each page. A reader loads the index, then reads only one page's byte
+range of one shard (see `Concordance.page`).
+
+Usage:
+    python3 build_concordance.py --db data/quran.db --output data/concordance
+    python3 build_concordance.py --output data/concordance --show "ر ح م" --page 0
+"""
+import argparse
+import json
+import shutil
+import sqlite3
+import time
+from itertools import groupby
+from pathlib import Path
+
+from asset_io import atomic_write_json
+
+KINDS = ("root", "lemma")
+DEFAULT_CONTEXT = 4
+DEFAULT_PAGE_SIZE = 25
+DEFAULT_MAX_BUFFERED = 20_000
+
+
+class ShardWriter:
+  """Appends lines to per-term shard files through a bounded buffer."""
+
+  def __init__(self, directory: Path, max_buffered: int = DEFAULT_MAX_BUFFERED):
+    self.directory = directory
+    self.max_buffered = max_buffered
+    self._buffers: dict[tuple[str, int], list[str]] = {}
+    self._buffered = 0
+    self.flushes = 0
+
+  def append(self, kind: str, term_id: int, line: str) -> None:
+    self._buffers.setdefault((kind, term_id), []).append(line)
+    self._buffered += 1
+    if self._buffered >= self.max_buffered:
+      self.flush()
+
+  def flush(self) -> None:
+    for (kind, term_id), lines in self._buffers.items():
+      with (self.directory / kind / f"{term_id}.ndjson").open("a", encoding="utf-8") as f:
+        f.write("".join(lines))
+    self._buffers.clear()
+    self._buffered = 0
+    self.flushes += 1
+
+
+def iter_ayah_words(conn: sqlite3.Connection):
+  """Yield (surah, ayah, [(position, text, root_id, lemma_id)]) in reading order."""
+  rows = conn.execute(
+      """
+      SELECT ayahs.surah_id, ayahs.ayah_number, words.position, words.text_uthmani,
+             words.root_id, words.lemma_id
+      FROM words
+      JOIN ayahs ON ayahs.id = words.ayah_id
+      ORDER BY words.id
+      """
+  )
+  for (surah, ayah), group in groupby(rows, key=lambda row: (row[0], row[1])):
+    yield surah, ayah, [row[2:] for row in group]
+
+
+def build(conn: sqlite3.Connection, output: Path, context: int, max_buffered: int) -> dict:
+  for kind in KINDS:
+    shutil.rmtree(output / kind, ignore_errors=True)
+    (output / kind).mkdir(parents=True)
+  writer = ShardWriter(output, max_buffered)
+  lines = 0
+  for surah, ayah, words in iter_ayah_words(conn):
+    texts = [word[1] for word in words]
+    key = f"{surah}:{ayah}"
+    for index, (position, text, root_id, lemma_id) in enumerate(words):
+      if root_id is None and lemma_id is None:
+        continue
+      line = json.dumps(
+          {
+              "k": key,
+              "p": position,
+              "l": texts[max(0, index - context):index],
+              "w": text,
+              "r": texts[index + 1:index + 1 + context],
+          },
+          ensure_ascii=False,
+          separators=(",", ":"),
+      ) + "\n"
+      if root_id is not None:
+        writer.append("root", root_id, line)
+        lines += 1
+      if lemma_id is not None:
+        writer.append("lemma", lemma_id, line)
+        lines += 1
+  writer.flush()
+  return {"lines": lines, "flushes": writer.flushes}
+
+
+def page_offsets(path: Path, page_size: int) -> tuple[int, list[int]]:
+  """Stream a shard once; return its line count and each page's byte offset."""
+  offsets = []
+  count = 0
+  position = 0
+  with path.open("rb") as f:
+    for line in f:
+      if count % page_size == 0:
+        offsets.append(position)
+      position += len(line)
+      count += 1
+  return count, offsets
+
+
+def write_index(conn: sqlite3.Connection, output: Path, context: int, page_size: int) -> dict:
+  names = {
+      "root": dict(conn.execute("SELECT id, root_text FROM roots")),
+      "lemma": dict(conn.execute("SELECT id, lemma_text FROM lemmas")),
+  }
+  index = {"context": context, "page_size": page_size}
+  for kind in KINDS:
+    terms = {}
+    for shard in sorted((output / kind).glob("*.ndjson"), key=lambda p: int(p.stem)):
+      term_id = int(shard.stem)
+      count, offsets = page_offsets(shard, page_size)
+      terms[str(term_id)] = {
+          "text": names[kind].get(term_id, ""),
+          "count": count,
+          "bytes": shard.stat().st_size,
+          "pages": offsets,
+      }
+    index[f"{kind}s"] = terms
+  atomic_write_json(output / "index.json", index, indent=None)
+  return index
+
+
+class Concordance:
+  """Lazy reader: the index is loaded once, pages are read by byte range."""
+
+  def __init__(self, directory: Path):
+    self.directory = directory
+    self.index = json.loads((directory / "index.json").read_text(encoding="utf-8"))
+    self._by_text = {
+        (kind, entry["text"]): int(term_id)
+        for kind in KINDS
+        for term_id, entry in self.index[f"{kind}s"].items()
+    }
+
+  def entry(self, kind: str, term: str | int) -> tuple[int, dict]:
+    term_id = term if isinstance(term, int) else self._by_text[(kind, term)]
+    return term_id, self.index[f"{kind}s"][str(term_id)]
+
+  def page(self, kind: str, term: str | int, page: int) -> list[dict]:
+    term_id, entry = self.entry(kind, term)
+    pages = entry["pages"]
+    if not 0 <= page < len(pages):
+      return []
+    start = pages[page]
+    end = pages[page + 1] if page + 1 < len(pages) else entry["bytes"]
+    with (self.directory / kind / f"{term_id}.ndjson").open("rb") as f:
+      f.seek(start)
+      chunk = f.read(end - start)
+    return [json.loads(line) for line in chunk.decode("utf-8").splitlines()]
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Build the root/lemma concordance.")
+  parser.add_argument("--db", type=Path, default=Path("data/quran.db"))
+  parser.add_argument("--output", type=Path, default=Path("data/concordance"))
+  parser.add_argument("--context", type=int, default=DEFAULT_CONTEXT, help="Words on each side")
+  parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+  parser.add_argument(
+      "--max-buffered",
+      type=int,
+      default=DEFAULT_MAX_BUFFERED,
+      help="Lines held in memory before shards are flushed",
+  )
+  parser.add_argument("--show", help="Print a page for this root text instead of building")
+  parser.add_argument("--kind", choices=KINDS, default="root")
+  parser.add_argument("--page", type=int, default=0)
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  if args.show:
+    concordance = Concordance(args.output)
+    _, entry = concordance.entry(args.kind, args.show)
+    print(f"{args.show}: {entry['count']} occurrences, {len(entry['pages'])} pages")
+    for line in concordance.page(args.kind, args.show, args.page):
+      print(f"  {line['k']:>7}:{line['p']:<3} {' '.join(line['l'])} [{line['w']}] {' '.join(line['r'])}")
+    return
+
+  conn = sqlite3.connect(args.db)
+  started = time.perf_counter()
+  stats = build(conn, args.output, args.context, args.max_buffered)
+  index = write_index(conn, args.output, args.context, args.page_size)
+  conn.close()
+  print(
+      f"Wrote {stats['lines']:,} lines for {len(index['roots']):,} roots and "
+      f"{len(index['lemmas']):,} lemmas to {args.output} "
+      f"({stats['flushes']} flushes) in {time.perf_counter() - started:.1f}s"
+  )
+
+
+if __name__ == "__main__":
+  main()
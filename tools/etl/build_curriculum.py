@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Build a coverage-ordered curriculum from the word/root table.
+
+Roots are ordered by marginal coverage gain: the number of Quranic word
+occurrences a learner newly understands once the root is learned. Each word
+carries a single root, so the gain of a root never changes as others are
+learned; counts are precomputed in one pass over the words and the greedy
+order is drained from a priority queue.
+
+Constraints are expressed as surahs to finish first. With
+`--finish-first 1`, every root that occurs in Al-Fatiha is taught before any
+other root (most frequent first), then the remaining roots follow in global
+greedy order.
+
+Inputs:
+- quran_vocab/assets/data/words_full.json
+- quran_vocab/assets/data/roots.json
+- quran_vocab/assets/data/surahs.json
+
+Output (lessons.json-compatible):
+- quran_vocab/assets/data/lessons_generated.json
+
+Usage:
+    python3 build_curriculum.py
+    python3 build_curriculum.py --finish-first 1 --targets 20,35,50,65,75,80
+"""
+import argparse
+import heapq
+import json
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "quran_vocab" / "assets" / "data"
+WORDS_PATH = DATA_DIR / "words_full.json"
+ROOTS_PATH = DATA_DIR / "roots.json"
+SURAHS_PATH = DATA_DIR / "surahs.json"
+OUTPUT_PATH = DATA_DIR / "lessons_generated.json"
+
+DEFAULT_TARGETS = [20, 35, 50, 65, 75, 80]
+
+
+def load_json(path: Path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def count_roots(words: list[dict]) -> tuple[Counter, dict[int, set[str]], int]:
+    """Single pass: occurrences per root, roots per surah, total word count."""
+    counts: Counter = Counter()
+    roots_by_surah: dict[int, set[str]] = {}
+    for word in words:
+        root = (word.get("root") or "").strip()
+        if not root:
+            continue
+        counts[root] += 1
+        roots_by_surah.setdefault(word["surah_id"], set()).add(root)
+    return counts, roots_by_surah, len(words)
+
+
+def greedy_order(counts: Counter, candidates=None) -> list[str]:
+    """Order roots by marginal coverage gain using a max-heap.
+
+    Ties break on the root text so output is deterministic.
+    """
+    pool = counts.keys() if candidates is None else candidates
+    heap = [(-counts[root], root) for root in pool if counts[root] > 0]
+    heapq.heapify(heap)
+    order = []
+    while heap:
+        _, root = heapq.heappop(heap)
+        order.append(root)
+    return order
+
+
+def order_roots(
+    counts: Counter,
+    roots_by_surah: dict[int, set[str]],
+    finish_first: list[int],
+) -> list[tuple[str, int | None]]:
+    """Return (root, phase_surah) pairs; phase_surah is None for the tail."""
+    taught: set[str] = set()
+    ordered: list[tuple[str, int | None]] = []
+    for surah_id in finish_first:
+        phase = roots_by_surah.get(surah_id, set()) - taught
+        for root in greedy_order(counts, phase):
+            ordered.append((root, surah_id))
+            taught.add(root)
+    remaining = [root for root in counts if root not in taught]
+    for root in greedy_order(counts, remaining):
+        ordered.append((root, None))
+    return ordered
+
+
+def chunk_lessons(items: list, size: int) -> list[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def build_units(
+    ordered: list[tuple[str, int | None]],
+    counts: Counter,
+    total_words: int,
+    roots_meta: dict[str, dict],
+    surah_names: dict[int, str],
+    targets: list[int],
+    lesson_size: int,
+) -> list[dict]:
+    """Split the ordered roots into units at phase and coverage boundaries."""
+    groups: list[tuple[str, list[str], float]] = []
+    covered = 0
+    current: list[str] = []
+    current_phase = ordered[0][1] if ordered else None
+    pending_targets = list(targets)
+
+    def close(title: str):
+        nonlocal current
+        if current:
+            groups.append((title, current, 100.0 * covered / max(total_words, 1)))
+            current = []
+
+    for root, phase in ordered:
+        if phase != current_phase:
+            close(f"Finish {surah_names.get(current_phase, f'Surah {current_phase}')}")
+            current_phase = phase
+            # Targets already reached by the constrained phases are skipped.
+            already = 100.0 * covered / max(total_words, 1)
+            while pending_targets and already >= pending_targets[0]:
+                pending_targets.pop(0)
+        current.append(root)
+        covered += counts[root]
+        coverage = 100.0 * covered / max(total_words, 1)
+        if phase is None and pending_targets and coverage >= pending_targets[0]:
+            close(f"Toward {pending_targets[0]}% coverage")
+            while pending_targets and coverage >= pending_targets[0]:
+                pending_targets.pop(0)
+    if current_phase is not None:
+        close(f"Finish {surah_names.get(current_phase, f'Surah {current_phase}')}")
+    else:
+        close("Advanced Roots")
+
+    units = []
+    lesson_id = 1
+    for unit_index, (title, roots, coverage) in enumerate(groups, start=1):
+        lessons = []
+        for chunk in chunk_lessons(roots, lesson_size):
+            meanings = [
+                roots_meta.get(r, {}).get("meaning_short", "") for r in chunk
+            ]
+            description = ", ".join(
+                f"{r} ({m})" if m else r for r, m in zip(chunk, meanings)
+            )
+            lessons.append({
+                "id": lesson_id,
+                "title": f"Roots {chunk[0]} - {chunk[-1]}",
+                "description": description,
+                "vocabulary": chunk,
+                # Word occurrences the lesson's roots cover, as wordCount
+                # counts words in lessons.json; the root count is kept apart.
+                "wordCount": sum(counts[r] for r in chunk),
+                "rootCount": len(chunk),
+            })
+            lesson_id += 1
+        units.append({
+            "id": unit_index,
+            "title": title,
+            "description": f"{len(roots)} roots, {coverage:.1f}% cumulative coverage",
+            "targetCoverage": int(coverage),
+            "lessons": lessons,
+        })
+    return units
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build a coverage-ordered curriculum.")
+    parser.add_argument("--words", type=Path, default=WORDS_PATH)
+    parser.add_argument("--roots", type=Path, default=ROOTS_PATH)
+    parser.add_argument("--surahs", type=Path, default=SURAHS_PATH)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument(
+        "--finish-first",
+        default="",
+        help="Comma-separated surah ids whose roots are taught first, in order",
+    )
+    parser.add_argument(
+        "--targets",
+        default=",".join(str(t) for t in DEFAULT_TARGETS),
+        help="Comma-separated cumulative coverage percentages that close a unit",
+    )
+    parser.add_argument("--lesson-size", type=int, default=5)
+    return parser.parse_args()
+
+
+def parse_int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    args = parse_args()
+    words = load_json(args.words)
+    roots_meta = {r["root_text"]: r for r in load_json(args.roots)}
+    surah_names = {s["id"]: s["name_english"] for s in load_json(args.surahs)}
+
+    started = time.perf_counter()
+    counts, roots_by_surah, total_words = count_roots(words)
+    ordered = order_roots(counts, roots_by_surah, parse_int_list(args.finish_first))
+    units = build_units(
+        ordered,
+        counts,
+        total_words,
+        roots_meta,
+        surah_names,
+        parse_int_list(args.targets),
+        args.lesson_size,
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    args.output.write_text(
+        json.dumps({"units": units}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    covered = sum(counts.values())
+    print(
+        f"Ordered {len(ordered)} roots over {total_words} words "
+        f"({100.0 * covered / max(total_words, 1):.1f}% root-bearing) "
+        f"in {elapsed_ms:.0f} ms"
+    )
+    print(f"Wrote {len(units)} units to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,39 @@ Inputs:
 - abridged-explanation-of-the-quran.json (repo root)
 - quran_vocab/assets/data/ayahs_full.json
 - quran_vocab/assets/data/surahs.json
+- quran_vocab/assets/data/words_full.json and roots.json (optional, for
+  vocabulary links)
 
 Output:
-- quran_vocab/assets/data/daily_lessons.json
+- quran_vocab/assets/data/daily_lessons.json, streamed lesson by lesson and
+  renamed into place (`--format compact` for one record per line)
+
+When words_full.json is present, each lesson whose verses have words also
+links to its vocabulary:
+- `wordRange`: `[start, end)` indexes into words_full.json (word id - 1 in
+  DataLoader). A lesson's verses are consecutive, so its words are one range.
+- `rootIds`: roots.json ids of the distinct roots in the lesson, in reading
+  order.
+- `newRootIds`: those not met in any earlier lesson.
+- `coverageGain`: the share of all Quran words whose root is in `newRootIds`.
+- `coverage`: the running total of that share, up to this lesson.
+
+Usage:
+    python3 build_daily_lessons.py
+    python3 build_daily_lessons.py --format compact
 """
-import json
+import argparse
 import re
 from pathlib import Path
 
+from asset_io import ASSET_FORMATS, load_json, write_records
+
 ROOT = Path(__file__).resolve().parents[2]
 ABRIDGED_PATH = ROOT / "abridged-explanation-of-the-quran.json"
 AYAHS_PATH = ROOT / "quran_vocab" / "assets" / "data" / "ayahs_full.json"
 SURAHS_PATH = ROOT / "quran_vocab" / "assets" / "data" / "surahs.json"
+WORDS_PATH = ROOT / "quran_vocab" / "assets" / "data" / "words_full.json"
+ROOTS_PATH = ROOT / "quran_vocab" / "assets" / "data" / "roots.json"
 OUTPUT_PATH = ROOT / "quran_vocab" / "assets" / "data" / "daily_lessons.json"
 
 SOURCE = {
@@ -35,10 +56,6 @@ TAG_RULES = {
 }
 
 
-def load_json(path: Path):
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def normalize_text(value):
     if isinstance(value, dict):
         return value.get("text", "").strip()
@@ -191,18 +208,85 @@ def build_lesson(group, texts, surah_name, day_index):
     }
 
 
+def verse_word_ranges(words) -> dict[str, tuple[int, int]]:
+    """Verse key -> [start, end) of its words in file order."""
+    ranges = {}
+    previous = None
+    for index, word in enumerate(words):
+        key = f"{word['surah_id']}:{word['ayah_number']}"
+        if key != previous:
+            if key in ranges:
+                raise SystemExit(f"❌ words_full.json is not grouped by verse ({key} appears twice)")
+            ranges[key] = [index, index]
+            previous = key
+        ranges[key][1] = index + 1
+    return {key: tuple(span) for key, span in ranges.items()}
+
+
+def link_vocabulary(lessons, words, roots) -> dict:
+    """Add wordRange, rootIds, newRootIds and coverage to lessons in place."""
+    root_ids = {r["root_text"]: r["id"] for r in roots}
+    word_roots = [root_ids.get(w.get("root") or "") for w in words]
+    token_counts = {}
+    for root_id in word_roots:
+        if root_id is not None:
+            token_counts[root_id] = token_counts.get(root_id, 0) + 1
+    total = len(words) or 1
+
+    ranges = verse_word_ranges(words)
+    seen = set()
+    coverage = 0
+    for lesson in lessons:
+        spans = [ranges[key] for key in lesson["verseKeys"] if key in ranges]
+        if not spans:
+            # No words for these verses: leave the lesson unlinked.
+            continue
+        start, end = spans[0][0], spans[-1][1]
+        in_lesson = list(dict.fromkeys(r for r in word_roots[start:end] if r is not None))
+        new = [r for r in in_lesson if r not in seen]
+        seen.update(new)
+        gain = sum(token_counts[r] for r in new)
+        coverage += gain
+        lesson["wordRange"] = [start, end]
+        lesson["rootIds"] = in_lesson
+        lesson["newRootIds"] = new
+        lesson["coverageGain"] = round(gain / total, 5)
+        lesson["coverage"] = round(coverage / total, 5)
+    return {
+        "linked_words": sum(r is not None for r in word_roots),
+        "words": len(words),
+        "roots": len(seen),
+        "coverage": coverage / total,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build daily lessons from the abridged explanation.")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--format", choices=ASSET_FORMATS, default="json")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     abridged = load_json(ABRIDGED_PATH)
     ayahs = load_json(AYAHS_PATH)
     surahs = load_json(SURAHS_PATH)
 
     lessons = build_lessons(abridged, ayahs, surahs)
-
-    OUTPUT_PATH.write_text(
-        json.dumps(lessons, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    print(f"Wrote {len(lessons)} lessons to {OUTPUT_PATH}")
+    if WORDS_PATH.exists():
+        roots = load_json(ROOTS_PATH) if ROOTS_PATH.exists() else []
+        stats = link_vocabulary(lessons, load_json(WORDS_PATH), roots)
+        print(
+            f"Linked {stats['words']:,} words ({stats['linked_words']:,} with a known root, "
+            f"{stats['roots']:,} roots, {stats['coverage']:.1%} coverage)"
+        )
+    else:
+        print(f"⚠️  {WORDS_PATH} not found; lessons have no vocabulary links")
+
+    output = args.output
+    count = write_records(output, lessons, args.format)
+    print(f"Wrote {count} lessons to {output}")
 
 
 if __name__ == "__main__":
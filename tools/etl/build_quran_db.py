@@ -4,9 +4,16 @@ import json
 import sqlite3
 import urllib.request
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass
+from datetime import date
 from pathlib import Path
 
+from fuzzy_index import build_fuzzy_index
+from indopak_words import align_verse
+from ingest_morphology import ROOTS_PATH, populate_morphology
+from root_index import build_postings
+from tanzil import AyahText, parse_tanzil
+from translations import TRANSLATION_SCHEMA, Translation, parse_word_glosses, store_translations
+
 
 TANZIL_UTHMANI_URL = "https://tanzil.net/res/text/uthmani"
 TANZIL_INDOPAK_URL = "https://tanzil.net/res/text/indopak"
@@ -15,13 +22,7 @@ LEMMA_FREQ_URL = "https://raw.githubusercontent.com/kaisdukes/quranic-corpus/mas
 ALIGN_URL = (
     "https://raw.githubusercontent.com/cpfair/quran-align/master/output/align.json"
 )
-
-
-@dataclass
-class AyahText:
-    surah: int
-    ayah: int
-    text: str
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
 
 
 def download(url: str, dest: Path) -> None:
@@ -32,23 +33,6 @@ def download(url: str, dest: Path) -> None:
     dest.write_bytes(resp.read())
 
 
-def parse_tanzil(path: Path) -> list[AyahText]:
-  data = path.read_text(encoding="utf-8").splitlines()
-  entries: list[AyahText] = []
-  for line in data:
-    if not line.strip():
-      continue
-    surah_str, ayah_str, text = line.split("|", 2)
-    entries.append(
-        AyahText(
-            surah=int(surah_str),
-            ayah=int(ayah_str),
-            text=text.strip(),
-        )
-    )
-  return entries
-
-
 def load_wbw(path: Path) -> dict[tuple[int, int], list[dict]]:
   payload = json.loads(path.read_text(encoding="utf-8"))
   words: dict[tuple[int, int], list[dict]] = {}
@@ -81,6 +65,24 @@ def load_alignment(path: Path) -> dict[tuple[int, int, int], tuple[int, int]]:
   return alignment
 
 
+def load_translation_sources(manifest: Path) -> list[tuple[Translation, dict]]:
+  """Read a manifest of extra translations.
+
+  Each entry is {"lang", "name", "kind", "file"}; `file` is relative to the
+  manifest. Ayah translations use the Tanzil `surah|ayah|text` format, word
+  glosses use `surah|ayah|position|gloss`.
+  """
+  sources: list[tuple[Translation, dict]] = []
+  for entry in json.loads(manifest.read_text(encoding="utf-8")):
+    path = manifest.parent / entry["file"]
+    if entry["kind"] == "ayah":
+      values = {(a.surah, a.ayah): a.text for a in parse_tanzil(path)}
+    else:
+      values = parse_word_glosses(path)
+    sources.append((Translation(0, entry["lang"], entry["name"], entry["kind"]), values))
+  return sources
+
+
 def create_schema(conn: sqlite3.Connection) -> None:
   cur = conn.cursor()
   cur.executescript(
@@ -137,7 +139,7 @@ def create_schema(conn: sqlite3.Connection) -> None:
         srs_stage TEXT NOT NULL,
         stability REAL NOT NULL,
         difficulty REAL NOT NULL,
-        next_review_date TEXT NOT NULL,
+        next_review_date INTEGER NOT NULL,
         FOREIGN KEY (root_id) REFERENCES roots(id) ON DELETE CASCADE
       );
       CREATE TABLE IF NOT EXISTS curriculum (
@@ -154,11 +156,36 @@ def create_schema(conn: sqlite3.Connection) -> None:
       CREATE INDEX IF NOT EXISTS idx_ayahs_surah ON ayahs(surah_id);
       CREATE INDEX IF NOT EXISTS idx_words_ayah ON words(ayah_id);
       CREATE INDEX IF NOT EXISTS idx_words_root ON words(root_id);
+      CREATE INDEX IF NOT EXISTS idx_user_progress_due
+        ON user_progress(next_review_date, root_id);
       """
   )
+  cur.executescript(TRANSLATION_SCHEMA)
   conn.commit()
 
 
+def epoch_day(value: date) -> int:
+  """Days since 1970-01-01; `user_progress.next_review_date` uses this."""
+  return value.toordinal() - EPOCH_ORDINAL
+
+
+def due_queue(conn: sqlite3.Connection, today: int, limit: int = 50) -> list[int]:
+  """Root ids due on or before `today` (an epoch day), most overdue first.
+
+  Served entirely from `idx_user_progress_due`.
+  """
+  rows = conn.execute(
+      """
+      SELECT root_id FROM user_progress
+      WHERE next_review_date <= ?
+      ORDER BY next_review_date ASC, root_id ASC
+      LIMIT ?
+      """,
+      (today, limit),
+  )
+  return [row[0] for row in rows]
+
+
 def build_database(
     uthmani: list[AyahText],
     indopak: list[AyahText],
@@ -166,7 +193,9 @@ def build_database(
     lemmas: dict[str, int],
     alignment: dict[tuple[int, int, int], tuple[int, int]],
     out_path: Path,
-) -> None:
+    translation_sources: list[tuple[Translation, dict]] | None = None,
+) -> list[tuple[int, int]]:
+  """Write quran.db; returns the verses whose IndoPak words did not all align."""
   if out_path.exists():
     out_path.unlink()
   conn = sqlite3.connect(out_path)
@@ -186,12 +215,23 @@ def build_database(
         (surah_id, f"Surah {surah_id}", f"Surah {surah_id}", verse_count, "Meccan"),
     )
 
+  # Translation texts are collected per row and written once, interned, after
+  # the loop. The word-by-word English glosses are always translation 1.
+  wbw_glosses = Translation(1, "en", "quranwbw", "word")
+  translations = [wbw_glosses]
+  sources = translation_sources or []
+  for index, (translation, _) in enumerate(sources, start=2):
+    translation.id = index
+    translation.texts = []
+    translations.append(translation)
+
   uthmani_map = {(a.surah, a.ayah): a.text for a in uthmani}
   indopak_map = {(a.surah, a.ayah): a.text for a in indopak}
 
   ayah_id = 1
   word_id = 1
   lemma_id_map: dict[str, int] = {}
+  unaligned: list[tuple[int, int]] = []
   for (surah, ayah), text in uthmani_map.items():
     indopak_text = indopak_map.get((surah, ayah), text)
     cur.execute(
@@ -201,8 +241,16 @@ def build_database(
         """,
         (ayah_id, surah, ayah, text, indopak_text, ""),
     )
+    for translation, values in sources:
+      if translation.kind == "ayah":
+        translation.texts.append(values.get((surah, ayah), ""))
 
     word_entries = wbw.get((surah, ayah), [])
+    indopak_words, leftover = align_verse(
+        [word.get("arabic", "") for word in word_entries], indopak_map.get((surah, ayah), "")
+    )
+    if leftover or None in indopak_words:
+      unaligned.append((surah, ayah))
     for position, word in enumerate(word_entries, start=1):
       lemma_text = word.get("lemma") or ""
       lemma_id = None
@@ -223,6 +271,10 @@ def build_database(
           )
         lemma_id = lemma_id_map[lemma_text]
       start_ms, end_ms = alignment.get((surah, ayah, position), (None, None))
+      wbw_glosses.texts.append(word.get("english", ""))
+      for translation, values in sources:
+        if translation.kind == "word":
+          translation.texts.append(values.get((surah, ayah, position), ""))
       cur.execute(
           """
           INSERT INTO words (
@@ -237,7 +289,8 @@ def build_database(
               ayah_id,
               position,
               word.get("arabic", ""),
-              word.get("arabic", ""),
+              indopak_words[position - 1] or word.get("arabic", ""),
+              # Also kept in the legacy column until readers use word_glosses.
               word.get("english", ""),
               word.get("transliteration", ""),
               None,
@@ -250,8 +303,10 @@ def build_database(
 
     ayah_id += 1
 
+  store_translations(conn, translations)
   conn.commit()
   conn.close()
+  return unaligned
 
 
 def parse_args() -> argparse.Namespace:
@@ -259,6 +314,17 @@ def parse_args() -> argparse.Namespace:
   parser.add_argument("--data-dir", type=Path, default=Path("data/raw"))
   parser.add_argument("--output", type=Path, default=Path("data/quran.db"))
   parser.add_argument("--skip-download", action="store_true")
+  parser.add_argument(
+      "--translations",
+      type=Path,
+      help="Manifest of extra translations (default: <data-dir>/translations.json if present)",
+  )
+  parser.add_argument(
+      "--morphology",
+      type=Path,
+      help="Quranic Arabic Corpus morphology file used to fill root_id/lemma_id "
+      "(default: <data-dir>/quranic-corpus-morphology-0.4.txt if present)",
+  )
   return parser.parse_args()
 
 
@@ -284,10 +350,35 @@ def main() -> None:
   wbw = load_wbw(wbw_path)
   lemmas = load_lemmas(lemma_path)
   alignment = load_alignment(alignment_path)
+  manifest = args.translations or data_dir / "translations.json"
+  translation_sources = load_translation_sources(manifest) if manifest.exists() else []
 
   args.output.parent.mkdir(parents=True, exist_ok=True)
-  build_database(uthmani, indopak, wbw, lemmas, alignment, args.output)
+  unaligned = build_database(
+      uthmani, indopak, wbw, lemmas, alignment, args.output, translation_sources
+  )
   print(f"Built database at {args.output}")
+  if unaligned:
+    sample = ", ".join(f"{s}:{a}" for s, a in unaligned[:10])
+    print(f"⚠️  IndoPak words not fully aligned in {len(unaligned)} verses (Uthmani kept): {sample}")
+
+  conn = sqlite3.connect(args.output)
+  counts = build_fuzzy_index(conn)
+  conn.close()
+  print(f"Indexed {counts['terms']:,} search terms under {counts['trigrams']:,} trigrams")
+
+  morphology = args.morphology or data_dir / "quranic-corpus-morphology-0.4.txt"
+  if morphology.exists():
+    roots_meta = json.loads(ROOTS_PATH.read_text(encoding="utf-8")) if ROOTS_PATH.exists() else []
+    conn = sqlite3.connect(args.output)
+    stats = populate_morphology(conn, morphology, roots_meta)
+    counts = build_postings(conn)
+    conn.close()
+    print(
+        f"Filled root/lemma ids for {stats['updated']:,} words "
+        f"({stats['roots']:,} roots, {stats['lemmas']:,} lemmas); "
+        f"indexed {counts['root']:,} root and {counts['lemma']:,} lemma posting lists"
+    )
 
 
 if __name__ == "__main__":
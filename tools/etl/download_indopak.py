@@ -2,6 +2,9 @@
 """
 Download authentic IndoPak Quran text from quran.com API 
 and update ayahs_full.json with the correct text_indopak values.
+
+The text is stored as the `text_indopak` column source and merged by verse
+key (see merge_ayah_columns.py); other columns are not re-read.
 """
 
 import json
@@ -9,6 +12,9 @@ import urllib.request
 import time
 from pathlib import Path
 
+from asset_io import load_json
+from merge_ayah_columns import COLUMNS_DIR, apply_columns, load_column, write_column
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 ASSETS_DIR = SCRIPT_DIR.parent.parent / 'quran_vocab' / 'assets' / 'data'
@@ -37,60 +43,48 @@ def main():
     print("IndoPak Text Updater")
     print("=" * 50)
     
-    # Load existing ayahs
-    print(f"Loading {AYAHS_FILE}...")
-    with open(AYAHS_FILE, 'r', encoding='utf-8') as f:
-        ayahs = json.load(f)
-    
-    print(f"Found {len(ayahs)} ayahs")
-    
-    # Build lookup: verse_key -> ayah index
-    ayah_lookup = {}
-    for i, ayah in enumerate(ayahs):
-        key = f"{ayah['surah_id']}:{ayah['ayah_number']}"
-        ayah_lookup[key] = i
-    
-    # Download IndoPak text for each surah
-    total_updated = 0
+    # Download IndoPak text for each surah into one keyed column
+    indopak_texts = {}
+    failed = []
     
     for surah_num in range(1, 115):
         print(f"Fetching Surah {surah_num}/114...", end=' ', flush=True)
         
         try:
-            indopak_texts = fetch_indopak_for_surah(surah_num)
-            updated_count = 0
-            
-            for verse_key, text in indopak_texts.items():
-                if verse_key in ayah_lookup:
-                    idx = ayah_lookup[verse_key]
-                    ayahs[idx]['text_indopak'] = text
-                    updated_count += 1
-            
-            print(f"✓ {updated_count} verses updated")
-            total_updated += updated_count
+            texts = fetch_indopak_for_surah(surah_num)
+            indopak_texts.update(texts)
+            print(f"✓ {len(texts)} verses")
             
             # Rate limiting - be nice to the API
             time.sleep(0.1)
             
         except Exception as e:
             print(f"✗ Error: {e}")
+            failed.append(surah_num)
             continue
     
     print("=" * 50)
-    print(f"Total verses updated: {total_updated}")
+    print(f"Total verses fetched: {len(indopak_texts)}")
+    if failed:
+        print(f"Surahs not fetched (previous text kept): {failed}")
     
-    # Save updated file
-    print(f"Saving to {AYAHS_FILE}...")
-    with open(AYAHS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(ayahs, f, ensure_ascii=False, indent=2)
+    # Update the stored column, keeping earlier text for surahs that failed,
+    # then merge only this column into ayahs_full.json
+    column_path = COLUMNS_DIR / 'text_indopak.json'
+    values = load_column(column_path)[1] if column_path.exists() else {}
+    values.update(indopak_texts)
+    column_path = write_column('text_indopak', values, source=API_BASE)
+    print(f"Saved column source to {column_path}")
+    stats = apply_columns([column_path], ayahs_path=AYAHS_FILE)
+    print(f"Merged into {AYAHS_FILE.name}: {stats['text_indopak']['applied']} verses updated")
     
     print("Done! IndoPak text has been updated.")
     
     # Show sample
     print("\nSample (Al-Fatiha 1:6):")
-    for ayah in ayahs:
+    for ayah in load_json(AYAHS_FILE):
         if ayah['surah_id'] == 1 and ayah['ayah_number'] == 6:
-            print(f"  Uthmani: {ayah['text_uthmani']}")
+            print(f"  Uthmani: {ayah.get('text_uthmani', '')}")
             print(f"  IndoPak: {ayah['text_indopak']}")
             break
 
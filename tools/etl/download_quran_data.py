@@ -4,14 +4,30 @@
 Usage:
     python3 download_quran_data.py           # Download surahs, ayahs, and words
     python3 download_quran_data.py --words-only  # Only download word-by-word data
+    python3 download_quran_data.py --words-only --resume  # Continue a failed run
+    python3 download_quran_data.py --format compact  # One record per line
+
+Word pages are checkpointed to words_full.journal.ndjson as they arrive. A
+failed run exits non-zero without touching words_full.json. --resume skips
+work the journal already holds, and reuses surahs.json and ayahs_full.json if
+they were already saved. After download, verses with missing or
+non-contiguous word positions are re-fetched one by one; each complete verse
+is journaled too.
+
+Outputs are streamed record by record to a temporary file and renamed into
+place (see asset_io.write_records).
 """
 import json
+import os
 import sys
 import time
 import urllib.request
 import urllib.error
 from pathlib import Path
 
+from asset_io import ASSET_FORMATS, load_json, write_records
+from merge_ayah_columns import merge_columns, verse_key
+
 # Surah names for progress display
 SURAH_NAMES = [
     "", "Al-Fatiha", "Al-Baqarah", "Aal-E-Imran", "An-Nisa", "Al-Ma'idah",
@@ -76,119 +92,325 @@ def download_ayahs() -> list[dict]:
     # Get English translation
     english_data = fetch_json("https://api.alquran.cloud/v1/quran/en.sahih")
     
-    ayahs = []
-    arabic_surahs = {s["number"]: s for s in arabic_data["data"]["surahs"]}
-    english_surahs = {s["number"]: s for s in english_data["data"]["surahs"]}
-    
-    for surah_num in range(1, 115):
-        arabic_surah = arabic_surahs[surah_num]
-        english_surah = english_surahs[surah_num]
-        
-        for i, ayah in enumerate(arabic_surah["ayahs"]):
-            ayahs.append({
-                "surah_id": surah_num,
-                "ayah_number": ayah["numberInSurah"],
-                "text_uthmani": ayah["text"],
-                "text_indopak": ayah["text"],  # Using same for now
-                "translation_en": english_surah["ayahs"][i]["text"],
-            })
+    ayahs = [
+        {
+            "surah_id": surah["number"],
+            "ayah_number": ayah["numberInSurah"],
+            "text_uthmani": ayah["text"],
+            "text_indopak": ayah["text"],  # Using same for now
+            "translation_en": "",
+        }
+        for surah in sorted(arabic_data["data"]["surahs"], key=lambda s: s["number"])
+        for ayah in surah["ayahs"]
+    ]
+    # Join the translation by verse key rather than list position
+    translation = {
+        verse_key(surah["number"], ayah["numberInSurah"]): ayah["text"]
+        for surah in english_data["data"]["surahs"]
+        for ayah in surah["ayahs"]
+    }
+    stats = merge_columns(ayahs, {"translation_en": translation})["translation_en"]
+    if stats["missing"] or stats["unmatched"]:
+        print(f"  translation_en: {len(stats['missing'])} ayahs without translation, "
+              f"{len(stats['unmatched'])} unmatched keys")
     return ayahs
 
 
-def download_words() -> list[dict]:
-    """Download word-by-word data from quran.com API for all 114 surahs."""
+def parse_verse_words(verse: dict, surah_num: int) -> list[dict]:
+    """Convert one quran.com verse payload into word records."""
+    parts = verse.get("verse_key", "").split(":")
+    if len(parts) != 2:
+        return []
+
+    ayah_num = int(parts[1])
+    position = 0
+    records = []
+    for word in verse.get("words", []):
+        # Skip verse number markers (char_type_name: "end")
+        if word.get("char_type_name") != "word":
+            continue
+
+        position += 1
+        translation = word.get("translation", {})
+        transliteration = word.get("transliteration", {})
+
+        records.append({
+            "surah_id": surah_num,
+            "ayah_number": ayah_num,
+            "position": position,
+            "text_uthmani": word.get("text_uthmani", word.get("text", "")),
+            "translation_en": translation.get("text", "") if translation else "",
+            "transliteration": transliteration.get("text", "") if transliteration else "",
+            "root": "",  # Root data requires separate morphology lookup
+            "frequency": 1,
+        })
+    return records
+
+
+class DownloadJournal:
+    """Append-only NDJSON record of completed pages, surahs and re-fetched verses.
+
+    Each entry is written (and flushed to disk) as soon as it is fetched, so a
+    crashed or failed run can resume where it stopped.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.pages: dict[int, dict[int, list[dict]]] = {}
+        self.next_page: dict[int, int] = {}
+        self.complete: set[int] = set()
+        self.verses: dict[tuple[int, int], list[dict]] = {}
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        data = self.path.read_bytes()
+        if data and not data.endswith(b"\n"):
+            # Drop the torn final line of an interrupted write, so the next
+            # entry starts on a line of its own.
+            data = data[:data.rfind(b"\n") + 1]
+            with open(self.path, "r+b") as f:
+                f.truncate(len(data))
+        for line in data.decode("utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            surah = entry["surah"]
+            if entry.get("complete"):
+                self.complete.add(surah)
+            elif "ayah" in entry:
+                self.verses[(surah, entry["ayah"])] = entry["words"]
+            else:
+                self.pages.setdefault(surah, {})[entry["page"]] = entry["words"]
+                self.next_page[surah] = max(self.next_page.get(surah, 1), entry["page"] + 1)
+
+    def reset(self) -> None:
+        if self.path.exists():
+            self.path.unlink()
+
+    def _append(self, entry: dict) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record_page(self, surah: int, page: int, words: list[dict]) -> None:
+        self.pages.setdefault(surah, {})[page] = words
+        self.next_page[surah] = page + 1
+        self._append({"surah": surah, "page": page, "words": words})
+
+    def record_complete(self, surah: int) -> None:
+        self.complete.add(surah)
+        self._append({"surah": surah, "complete": True})
+
+    def record_verse(self, surah: int, ayah: int, words: list[dict]) -> None:
+        self.verses[(surah, ayah)] = words
+        self._append({"surah": surah, "ayah": ayah, "words": words})
+
+    def surah_words(self, surah: int) -> list[dict]:
+        pages = self.pages.get(surah, {})
+        return [w for page in sorted(pages) for w in pages[page]]
+
+
+def download_surah_words(surah_num: int, journal: DownloadJournal) -> bool:
+    """Fetch the remaining pages of a surah; returns True once it is complete."""
+    page = journal.next_page.get(surah_num, 1)
+    while True:
+        url = (
+            f"https://api.quran.com/api/v4/verses/by_chapter/{surah_num}"
+            f"?words=true&word_fields=text_uthmani&per_page=50&page={page}"
+        )
+        try:
+            data = fetch_json(url)
+        except Exception as e:
+            print(f" ERROR on page {page}: {e}")
+            return False
+
+        page_words = []
+        for verse in data.get("verses", []):
+            page_words.extend(parse_verse_words(verse, surah_num))
+        journal.record_page(surah_num, page, page_words)
+
+        pagination = data.get("pagination", {})
+        if pagination.get("next_page") is None:
+            journal.record_complete(surah_num)
+            return True
+        page += 1
+
+
+def download_words(journal: DownloadJournal) -> tuple[list[dict], list[int]]:
+    """Download word-by-word data for all 114 surahs.
+
+    Returns the words and the surahs that could not be completed.
+    """
     print("Downloading word-by-word data for all 114 surahs...")
     words = []
-    total_words = 0
-    
+    failed = []
+
     for surah_num in range(1, 115):
         surah_name = SURAH_NAMES[surah_num] if surah_num < len(SURAH_NAMES) else f"Surah {surah_num}"
         print(f"  [{surah_num:3}/114] {surah_name}...", end="", flush=True)
-        
-        surah_words = []
-        page = 1
-        
-        while True:
-            try:
-                # Use word_fields to get text_uthmani, and per_page for pagination
-                url = (
-                    f"https://api.quran.com/api/v4/verses/by_chapter/{surah_num}"
-                    f"?words=true&word_fields=text_uthmani&per_page=50&page={page}"
-                )
-                data = fetch_json(url)
-                
-                for verse in data.get("verses", []):
-                    verse_key = verse.get("verse_key", "")
-                    parts = verse_key.split(":")
-                    if len(parts) != 2:
-                        continue
-                    
-                    ayah_num = int(parts[1])
-                    position = 0
-                    
-                    for word in verse.get("words", []):
-                        # Skip verse number markers (char_type_name: "end")
-                        if word.get("char_type_name") != "word":
-                            continue
-                        
-                        position += 1
-                        translation = word.get("translation", {})
-                        transliteration = word.get("transliteration", {})
-                        
-                        surah_words.append({
-                            "surah_id": surah_num,
-                            "ayah_number": ayah_num,
-                            "position": position,
-                            "text_uthmani": word.get("text_uthmani", word.get("text", "")),
-                            "translation_en": translation.get("text", "") if translation else "",
-                            "transliteration": transliteration.get("text", "") if transliteration else "",
-                            "root": "",  # Root data requires separate morphology lookup
-                            "frequency": 1,
-                        })
-                
-                # Check pagination
-                pagination = data.get("pagination", {})
-                if pagination.get("next_page") is None:
-                    break
-                page += 1
-                
-            except Exception as e:
-                print(f" ERROR: {e}")
-                break
-        
+
+        if surah_num in journal.complete:
+            print(" (journal)", end="")
+        elif not download_surah_words(surah_num, journal):
+            failed.append(surah_num)
+            continue
+        else:
+            # Rate limiting: 0.3s delay between surahs to be nice to the API
+            time.sleep(0.3)
+
+        surah_words = journal.surah_words(surah_num)
         words.extend(surah_words)
-        total_words += len(surah_words)
         print(f" {len(surah_words)} words")
-        
-        # Rate limiting: 0.3s delay between surahs to be nice to the API
-        if surah_num < 114:
-            time.sleep(0.3)
-    
-    print(f"\nTotal words downloaded: {total_words}")
-    return words
+
+    print(f"\nTotal words downloaded: {len(words)}")
+    return words, failed
+
+
+def word_positions(words: list[dict]) -> dict[tuple[int, int], list[int]]:
+    positions: dict[tuple[int, int], list[int]] = {}
+    for w in words:
+        positions.setdefault((w["surah_id"], w["ayah_number"]), []).append(w["position"])
+    return positions
+
+
+def is_contiguous(found: list[int] | None) -> bool:
+    return bool(found) and sorted(found) == list(range(1, len(found) + 1))
+
+
+def find_word_gaps(words: list[dict], verse_counts: dict[int, int]) -> list[tuple[int, int]]:
+    """Verses that are missing or whose positions are not exactly 1..n."""
+    positions = word_positions(words)
+    gaps = []
+    for surah_num, count in verse_counts.items():
+        for ayah_num in range(1, count + 1):
+            if not is_contiguous(positions.get((surah_num, ayah_num))):
+                gaps.append((surah_num, ayah_num))
+    return gaps
+
+
+def is_complete_verse(verse_words: list[dict], surah_num: int, ayah_num: int) -> bool:
+    """Non-empty words of exactly this verse, at positions 1..n."""
+    positions = word_positions(verse_words)
+    return list(positions) == [(surah_num, ayah_num)] and is_contiguous(positions[(surah_num, ayah_num)])
+
+
+def refetch_verses(
+    words: list[dict], gaps: list[tuple[int, int]], journal: DownloadJournal
+) -> tuple[list[dict], list[tuple[int, int]]]:
+    """Replace the words of each gap verse with a fresh single-verse fetch.
+
+    A verse whose fetch fails, comes back empty or is still not contiguous
+    keeps its current words and is returned as unresolved. Only complete
+    verses are journaled, so `--resume` never reuses a broken fetch.
+    """
+    replacements: dict[tuple[int, int], list[dict]] = {}
+    unresolved = []
+    for surah_num, ayah_num in gaps:
+        journaled = journal.verses.get((surah_num, ayah_num))
+        if journaled is not None and is_complete_verse(journaled, surah_num, ayah_num):
+            replacements[(surah_num, ayah_num)] = journaled
+            continue
+        url = (
+            f"https://api.quran.com/api/v4/verses/by_key/{surah_num}:{ayah_num}"
+            f"?words=true&word_fields=text_uthmani"
+        )
+        try:
+            verse = fetch_json(url).get("verse", {})
+        except Exception as e:
+            print(f"  [{surah_num}:{ayah_num}] ERROR: {e}")
+            unresolved.append((surah_num, ayah_num))
+            continue
+        time.sleep(0.2)
+        verse_words = parse_verse_words(verse, surah_num)
+        if not is_complete_verse(verse_words, surah_num, ayah_num):
+            print(f"  [{surah_num}:{ayah_num}] ERROR: re-fetch returned {len(verse_words)} words, not 1..n")
+            unresolved.append((surah_num, ayah_num))
+            continue
+        replacements[(surah_num, ayah_num)] = verse_words
+        journal.record_verse(surah_num, ayah_num, verse_words)
+
+    if not replacements:
+        return words, unresolved
+
+    merged = [w for w in words if (w["surah_id"], w["ayah_number"]) not in replacements]
+    for verse_words in replacements.values():
+        merged.extend(verse_words)
+    merged.sort(key=lambda w: (w["surah_id"], w["ayah_number"], w["position"]))
+    # Check the replaced verses again in the merged list.
+    positions = word_positions(merged)
+    unresolved.extend(key for key in replacements if not is_contiguous(positions.get(key)))
+    return merged, sorted(unresolved)
 
 
 def main():
     words_only = "--words-only" in sys.argv
+    resume = "--resume" in sys.argv
+    fmt = "json"
+    if "--format" in sys.argv:
+        idx = sys.argv.index("--format")
+        fmt = sys.argv[idx + 1] if idx + 1 < len(sys.argv) else ""
+        if fmt not in ASSET_FORMATS:
+            # ndjson would be written beside the .json files the app and
+            # the other scripts read, leaving them on stale data.
+            print(f"❌ --format must be one of {', '.join(ASSET_FORMATS)}")
+            sys.exit(2)
     
     output_dir = Path(__file__).parent.parent.parent / "quran_vocab" / "assets" / "data"
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    surahs = None
+    surahs_path = output_dir / "surahs.json"
+    ayahs_path = output_dir / "ayahs_full.json"
+    if resume and not words_only and surahs_path.exists() and ayahs_path.exists():
+        print(f"Resuming: reusing {surahs_path.name} and {ayahs_path.name}")
+        words_only = True
     if not words_only:
         # Download and save surahs
         surahs = download_surahs()
-        (output_dir / "surahs.json").write_text(json.dumps(surahs, ensure_ascii=False, indent=2))
+        write_records(surahs_path, surahs, fmt)
         print(f"Saved {len(surahs)} surahs")
         
         # Download and save ayahs
         ayahs = download_ayahs()
-        (output_dir / "ayahs_full.json").write_text(json.dumps(ayahs, ensure_ascii=False, indent=2))
+        write_records(ayahs_path, ayahs, fmt)
         print(f"Saved {len(ayahs)} ayahs")
+    elif surahs_path.exists():
+        surahs = load_json(surahs_path)
+    
+    # Download words, checkpointing each page to the journal
+    journal = DownloadJournal(output_dir / "words_full.journal.ndjson")
+    if resume:
+        journal.load()
+        print(f"Resuming: {len(journal.complete)} surahs already in {journal.path.name}")
+    else:
+        journal.reset()
+    words, failed = download_words(journal)
+    if failed:
+        print(f"\n{len(failed)} surahs incomplete: {failed}")
+        print(f"Progress is kept in {journal.path.name}; rerun with --resume.")
+        sys.exit(1)
+    
+    # Re-fetch only verses with missing or non-contiguous positions
+    if surahs:
+        verse_counts = {s["id"]: s["verse_count"] for s in surahs}
+        gaps = find_word_gaps(words, verse_counts)
+        if gaps:
+            print(f"Re-fetching {len(gaps)} verses with missing or non-contiguous words...")
+            words, unresolved = refetch_verses(words, gaps, journal)
+            if unresolved:
+                print(f"{len(unresolved)} verses still incomplete: {unresolved[:10]}")
+                print(f"Progress is kept in {journal.path.name}; rerun with --resume.")
+                sys.exit(1)
+    else:
+        print("surahs.json not found; skipping gap detection")
     
-    # Download and save words
-    words = download_words()
-    (output_dir / "words_full.json").write_text(json.dumps(words, ensure_ascii=False, indent=2))
-    print(f"Saved {len(words)} words to words_full.json")
+    words_path = output_dir / "words_full.json"
+    write_records(words_path, words, fmt)
+    print(f"Saved {len(words)} words to {words_path.name}")
+    journal.reset()
     
     print("\nDone! Data saved to quran_vocab/assets/data/")
 
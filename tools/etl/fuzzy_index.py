@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""Trigram index for fuzzy search over transliterations and glosses.
+
+Learners type the same word many ways ("rahman", "ar-rahmani", "rahmaan").
+Search terms are folded before indexing and before querying:
+- NFKD, with combining marks dropped (`raḥmāni` -> `rahmani`), lowercased;
+- apostrophes, ayn/hamza signs and hyphens removed;
+- runs of a repeated letter collapsed (`rahmaan` -> `rahman`,
+  `arrahmani` -> `arahmani`).
+
+Terms are the folded transliteration of each word (plus the part after its
+last hyphen, so `ar-rahmani` is also found as `rahmani`) and each folded
+token of its gloss, split at spaces and brackets (`(the) Lord` -> `the`,
+`lord`). Every distinct term keeps a posting list of word ids. The
+trigrams of `$$term$$` map to posting lists of term ids. Both are delta +
+varint encoded as in root_index.py and stored in `search_terms` and
+`search_trigrams`.
+
+`FuzzyIndex.search` counts shared trigrams along the query's posting lists.
+It keeps terms that pass the q-gram bound for `max_distance` edits (at most 3
+trigrams lost per edit) and the length bound, ranks them with a bounded
+Levenshtein distance, and returns the top k. A multi-word query ("the lord")
+matches each token on its own and returns the words whose terms match every
+token, ranked by total distance, along with matches for the query with its
+spaces removed.
+
+Usage:
+    python3 fuzzy_index.py --db data/quran.db                     # build the tables
+    python3 fuzzy_index.py --db data/quran.db --query rahmaan --query mercifull
+    python3 fuzzy_index.py --db data/quran.db --benchmark
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from itertools import chain, groupby, product
+from pathlib import Path
+
+from root_index import decode_postings, encode_postings
+
+FIELDS = ("translit", "gloss")
+DEFAULT_LIMIT = 10
+# Upper bound on per-token term combinations tried for a multi-word query.
+MAX_COMBINATIONS = 1000
+
+FUZZY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_terms (
+  id INTEGER PRIMARY KEY,
+  field TEXT NOT NULL CHECK (field IN ('translit', 'gloss')),
+  term TEXT NOT NULL,
+  word_count INTEGER NOT NULL,
+  word_postings BLOB NOT NULL,
+  UNIQUE (field, term)
+);
+
+CREATE TABLE IF NOT EXISTS search_trigrams (
+  trigram TEXT PRIMARY KEY,
+  term_postings BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+_DROP = str.maketrans("", "", "'`ʿʾʼ‘’-_.")
+# Split glosses and queries into tokens: "(the) Lord," -> "the", "Lord".
+_SEPARATORS = str.maketrans({char: " " for char in '()[]{},;:!?"/'})
+
+
+def fold(text: str) -> str:
+  decomposed = unicodedata.normalize("NFKD", text.lower())
+  stripped = "".join(c for c in decomposed if not unicodedata.combining(c)).translate(_DROP)
+  return " ".join("".join(k for k, _ in groupby(token)) for token in stripped.split())
+
+
+def trigrams(term: str) -> set[str]:
+  padded = f"$${term}$$"
+  return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def translit_terms(transliteration: str) -> set[str]:
+  terms = {fold(transliteration).replace(" ", "")}
+  if "-" in transliteration:
+    terms.add(fold(transliteration.rsplit("-", 1)[1]))
+  return {t for t in terms if t}
+
+
+def tokens(text: str) -> list[str]:
+  return text.translate(_SEPARATORS).split()
+
+
+def gloss_terms(gloss: str) -> set[str]:
+  return {term for term in fold(" ".join(tokens(gloss))).split() if len(term) > 1}
+
+
+def iter_terms(conn: sqlite3.Connection, gloss_translation: int = 1):
+  """Yield (field, term, word_id) for every word's transliteration and gloss."""
+  rows = conn.execute(
+      """
+      SELECT words.id, words.transliteration, COALESCE(strings.text, words.translation_en)
+      FROM words
+      LEFT JOIN word_glosses ON word_glosses.word_id = words.id
+        AND word_glosses.translation_id = ?
+      LEFT JOIN strings ON strings.id = word_glosses.string_id
+      ORDER BY words.id
+      """,
+      (gloss_translation,),
+  )
+  for word_id, transliteration, gloss in rows:
+    for term in translit_terms(transliteration or ""):
+      yield "translit", term, word_id
+    for term in gloss_terms(gloss or ""):
+      yield "gloss", term, word_id
+
+
+def build_fuzzy_index(conn: sqlite3.Connection, gloss_translation: int = 1) -> dict[str, int]:
+  """(Re)build `search_terms` and `search_trigrams` from words and glosses."""
+  postings: dict[tuple[str, str], list[int]] = {}
+  for field, term, word_id in iter_terms(conn, gloss_translation):
+    postings.setdefault((field, term), []).append(word_id)
+
+  conn.executescript(FUZZY_SCHEMA)
+  conn.execute("DELETE FROM search_terms")
+  conn.execute("DELETE FROM search_trigrams")
+  grams: dict[str, list[int]] = {}
+  rows = []
+  # Term ids follow (field, term) order so trigram lists come out sorted.
+  for term_id, ((field, term), word_ids) in enumerate(sorted(postings.items()), start=1):
+    rows.append((term_id, field, term, len(word_ids), encode_postings(word_ids)))
+    for gram in trigrams(term):
+      grams.setdefault(gram, []).append(term_id)
+  conn.executemany("INSERT INTO search_terms VALUES (?, ?, ?, ?, ?)", rows)
+  conn.executemany(
+      "INSERT INTO search_trigrams VALUES (?, ?)",
+      ((gram, encode_postings(ids)) for gram, ids in grams.items()),
+  )
+  conn.commit()
+  return {"terms": len(rows), "trigrams": len(grams)}
+
+
+def pattern_masks(pattern: str) -> dict[str, int]:
+  masks: dict[str, int] = {}
+  for i, char in enumerate(pattern):
+    masks[char] = masks.get(char, 0) | (1 << i)
+  return masks
+
+
+def bounded_levenshtein(pattern: str, masks: dict[str, int], text: str, bound: int) -> int:
+  """Levenshtein distance, or bound + 1 as soon as it must exceed bound.
+
+  Bit-parallel (Myers 1999, Hyyrö 2001): one column of the DP matrix per
+  text character, held as vertical +1/-1 delta bit vectors over the pattern.
+  """
+  m, n = len(pattern), len(text)
+  if abs(m - n) > bound:
+    return bound + 1
+  if not m:
+    return n
+  full = (1 << m) - 1
+  top = 1 << (m - 1)
+  plus, minus, score = full, 0, m
+  for j, char in enumerate(text, start=1):
+    eq = masks.get(char, 0)
+    xv = eq | minus
+    xh = (((eq & plus) + plus) ^ plus) | eq
+    hplus = minus | (~(xh | plus) & full)
+    hminus = plus & xh
+    if hplus & top:
+      score += 1
+    elif hminus & top:
+      score -= 1
+    # The final distance can fall by at most one per remaining character.
+    if score - (n - j) > bound:
+      return bound + 1
+    hplus = ((hplus << 1) | 1) & full
+    hminus = (hminus << 1) & full
+    plus = hminus | (~(xv | hplus) & full)
+    minus = hplus & xv
+  return score if score <= bound else bound + 1
+
+
+def query_variants(query: str) -> set[str]:
+  """A hyphenated query is also tried without its article, like indexed terms."""
+  return translit_terms(query) if "-" in query else {fold(query)} - {""}
+
+
+def default_distance(term: str) -> int:
+  return 1 if len(term) <= 5 else 2 if len(term) <= 9 else 3
+
+
+@dataclass
+class Match:
+  field: str
+  term: str
+  distance: int
+  word_count: int
+  word_ids: list[int]
+
+
+class FuzzyIndex:
+  """In-memory trigram index; posting lists are decoded on first use."""
+
+  def __init__(self, terms: list[tuple[int, str, str, int, bytes]], grams: dict[str, bytes]):
+    self.terms = {term_id: (field, term, count, blob) for term_id, field, term, count, blob in terms}
+    self._grams = grams
+    self._decoded: dict[str, list[int]] = {}
+
+  @classmethod
+  def from_db(cls, conn: sqlite3.Connection) -> "FuzzyIndex":
+    terms = conn.execute("SELECT id, field, term, word_count, word_postings FROM search_terms").fetchall()
+    grams = dict(conn.execute("SELECT trigram, term_postings FROM search_trigrams"))
+    return cls(terms, grams)
+
+  def _postings(self, gram: str) -> list[int]:
+    ids = self._decoded.get(gram)
+    if ids is None:
+      blob = self._grams.get(gram)
+      ids = decode_postings(blob) if blob else []
+      self._decoded[gram] = ids
+    return ids
+
+  def candidates(
+      self, query: str, max_distance: int, field: str | None = None
+  ) -> list[tuple[int, int]]:
+    """(term id, shared trigrams) passing the q-gram and length bounds, most shared first."""
+    grams = trigrams(query)
+    needed = max(1, len(grams) - 3 * max_distance)
+    counts = Counter(chain.from_iterable(self._postings(gram) for gram in grams))
+    shortest, longest = len(query) - max_distance, len(query) + max_distance
+    terms = self.terms
+    passed = [
+        (term_id, shared)
+        for term_id, shared in counts.items()
+        if shared >= needed
+        and shortest <= len(terms[term_id][1]) <= longest
+        and (field is None or terms[term_id][0] == field)
+    ]
+    passed.sort(key=lambda item: -item[1])
+    return passed
+
+  def _best(
+      self, variants: set[str], limit: int, max_distance: int | None, field: str | None
+  ) -> dict[int, tuple[int, int, str]]:
+    """Term id -> (distance, -word count, term) for the top `limit` terms."""
+    best: dict[int, tuple[int, int, str]] = {}
+    for folded in variants:
+      bound = default_distance(folded) if max_distance is None else max_distance
+      grams = len(trigrams(folded))
+      masks = pattern_masks(folded)
+      for term_id, shared in self.candidates(folded, bound, field):
+        # Candidates come most-shared first: once the q-gram bound for the
+        # current distance fails, it fails for every later candidate too.
+        if shared < grams - 3 * bound:
+          break
+        _, term, count, _ = self.terms[term_id]
+        distance = bounded_levenshtein(folded, masks, term, bound)
+        if distance > bound or best.get(term_id, (bound + 1,))[0] <= distance:
+          continue
+        best[term_id] = (distance, -count, term)
+        if len(best) >= limit and distance < bound:
+          # Nothing farther than the k-th best distance can enter the top k.
+          bound = sorted(d for d, _, _ in best.values())[limit - 1]
+    return dict(sorted(best.items(), key=lambda item: item[1])[:limit])
+
+  def _word_ids(self, term_id: int) -> list[int]:
+    return decode_postings(self.terms[term_id][3])
+
+  def search(
+      self,
+      query: str,
+      limit: int = DEFAULT_LIMIT,
+      max_distance: int | None = None,
+      field: str | None = None,
+  ) -> list[Match]:
+    words = [token for token in tokens(query) if len(fold(token)) > 1]
+    if len(words) < 2:
+      best = self._best(query_variants(words[0] if words else query), limit, max_distance, field)
+      return [
+          Match(self.terms[term_id][0], term, distance, -negative_count, self._word_ids(term_id))
+          for term_id, (distance, negative_count, term) in best.items()
+      ]
+    return self._search_words(words, limit, max_distance, field)
+
+  def _search_words(
+      self, words: list[str], limit: int, max_distance: int | None, field: str | None
+  ) -> list[Match]:
+    """Words matching every token of a multi-word query ("the lord").
+
+    Each token is matched on its own; combinations of one term per token are
+    tried by total distance, and each yields the words in all of their
+    posting lists. The query with its spaces removed is also matched as one
+    term ("ar rahman" -> `arahman`). Both kinds are ranked together by
+    distance, then by word count.
+    """
+    matches = [
+        Match(self.terms[term_id][0], term, distance, -negative_count, self._word_ids(term_id))
+        for term_id, (distance, negative_count, term) in self._best(
+            query_variants("".join(words)), limit, max_distance, field
+        ).items()
+    ]
+    # Few enough terms per token that the combinations stay near MAX_COMBINATIONS.
+    per_token_limit = max(1, min(limit, int(MAX_COMBINATIONS ** (1 / len(words)))))
+    per_token = [
+        list(self._best(query_variants(word), per_token_limit, max_distance, field).items())
+        for word in words
+    ]
+    combinations = sorted(
+        product(*per_token), key=lambda combo: (sum(value[0] for _, value in combo), combo)
+    )
+    postings: dict[int, set[int]] = {}
+    found = 0
+    for combo in combinations:
+      if found >= limit:
+        break
+      word_ids = None
+      for term_id, _ in combo:
+        if term_id not in postings:
+          postings[term_id] = set(self._word_ids(term_id))
+        word_ids = postings[term_id] if word_ids is None else word_ids & postings[term_id]
+        if not word_ids:
+          break
+      if not word_ids:
+        continue
+      found += 1
+      fields = sorted({self.terms[term_id][0] for term_id, _ in combo})
+      matches.append(Match(
+          "+".join(fields),
+          " ".join(value[2] for _, value in combo),
+          sum(value[0] for _, value in combo),
+          len(word_ids),
+          sorted(word_ids),
+      ))
+    matches.sort(key=lambda match: (match.distance, -match.word_count, match.term))
+    return matches[:limit]
+
+
+def perturb(term: str, rng: random.Random) -> str:
+  """A misspelling of the kind users type: doubled vowel, dropped or swapped letter, article."""
+  choice = rng.randrange(4)
+  if choice == 0:
+    vowels = [i for i, c in enumerate(term) if c in "aiu"]
+    if vowels:
+      i = rng.choice(vowels)
+      return term[:i] + term[i] + term[i:]
+  if choice == 1 and len(term) > 4:
+    i = rng.randrange(len(term))
+    return term[:i] + term[i + 1:]
+  if choice == 2 and len(term) > 3:
+    i = rng.randrange(len(term) - 1)
+    return term[:i] + term[i + 1] + term[i] + term[i + 2:]
+  return "al-" + term
+
+
+def linear_scan(index: FuzzyIndex, query: str, limit: int) -> list[tuple[str, str]]:
+  """Reference ranking: bounded distance to every term, no trigram filter."""
+  best: dict[tuple[str, str], tuple[int, int]] = {}
+  for folded in query_variants(query):
+    bound = default_distance(folded)
+    masks = pattern_masks(folded)
+    for field, term, count, _ in index.terms.values():
+      distance = bounded_levenshtein(folded, masks, term, bound)
+      if distance <= bound:
+        best[(field, term)] = min(best.get((field, term), (distance, -count)), (distance, -count))
+  ranked = sorted((value, key[1], key[0]) for key, value in best.items())[:limit]
+  return [(field, term) for _, term, field in ranked]
+
+
+def benchmark(index: FuzzyIndex, queries: int, limit: int) -> None:
+  rng = random.Random(7)
+  pool = [term for field, term, _, _ in index.terms.values() if len(term) >= 4]
+  sample = [(term, perturb(term, rng)) for term in rng.sample(pool, min(queries, len(pool)))]
+  for _, query in sample[:20]:
+    index.search(query, limit)  # Warm the posting list cache.
+
+  timings, hits = [], 0
+  for term, query in sample:
+    started = time.perf_counter()
+    matches = index.search(query, limit)
+    timings.append((time.perf_counter() - started) * 1000)
+    hits += any(m.term == term for m in matches)
+  timings.sort()
+  print(
+      f"{len(index.terms):,} terms, {len(index._grams):,} trigrams; {len(sample):,} misspelled queries: "
+      f"p50 {statistics.median(timings):.2f} ms, p95 {timings[int(len(timings) * 0.95)]:.2f} ms, "
+      f"max {timings[-1]:.2f} ms; intended term in top {limit} for {hits / len(sample):.1%}"
+  )
+
+  scan = sample[:50]
+  agree = sum(
+      [(m.field, m.term) for m in index.search(query, limit)] == linear_scan(index, query, limit)
+      for _, query in scan
+  )
+  started = time.perf_counter()
+  for _, query in scan:
+    linear_scan(index, query, limit)
+  scan_ms = (time.perf_counter() - started) * 1000 / len(scan)
+  print(f"Linear scan: {scan_ms:.1f} ms/query; same top {limit} as the index for {agree}/{len(scan)} queries")
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Build or query the trigram fuzzy search index.")
+  parser.add_argument("--db", type=Path, default=Path("data/quran.db"))
+  parser.add_argument("--gloss-translation", type=int, default=1, help="Word translation id to index")
+  parser.add_argument("--query", action="append", help="Search instead of building (repeatable)")
+  parser.add_argument("--field", choices=FIELDS, help="Restrict queries to one field")
+  parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+  parser.add_argument("--max-distance", type=int, help="Default: 1-3 by query length")
+  parser.add_argument("--benchmark", action="store_true")
+  parser.add_argument("--queries", type=int, default=1000, help="Benchmark query count")
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  conn = sqlite3.connect(args.db)
+  if not args.query and not args.benchmark:
+    started = time.perf_counter()
+    counts = build_fuzzy_index(conn, args.gloss_translation)
+    print(
+        f"Indexed {counts['terms']:,} terms under {counts['trigrams']:,} trigrams "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    conn.close()
+    return
+
+  started = time.perf_counter()
+  index = FuzzyIndex.from_db(conn)
+  conn.close()
+  print(f"Loaded index in {(time.perf_counter() - started) * 1000:.0f} ms")
+  if args.benchmark:
+    benchmark(index, args.queries, args.limit)
+    return
+  for query in args.query:
+    started = time.perf_counter()
+    matches = index.search(query, args.limit, args.max_distance, args.field)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{query} -> {fold(query)!r} ({elapsed:.2f} ms)")
+    for match in matches:
+      print(f"  {match.field:<8} {match.term:<20} d={match.distance} words={match.word_count}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Per-word IndoPak text from the IndoPak verse text.
+
+The word-by-word sources only carry Uthmani word text. The IndoPak verse text
+(`text_indopak` in ayahs_full.json, see download_indopak.py) is split on
+whitespace. Tokens without letters, such as standalone pause marks and ayah
+numbers, are dropped. The remaining tokens are matched to the verse's Uthmani
+words by position and by skeleton. A skeleton keeps only letters, with the
+letter variants of the two scripts folded together (`ٱ`/`ا`, `ی`/`ي`, `ک`/`ك`,
+`ہ`/`ه`, ...). Diacritics and small letters are dropped.
+
+Most verses have one token per word, and every pair's skeletons agree; that
+check is one pass over the words. The other verses are aligned with a small
+dynamic program, banded around the diagonal, over the moves:
+- one word to one token;
+- one word to two tokens (joined with a space);
+- two words to one token (split at the letter boundary that best fits the
+  two skeletons);
+- a skipped word or token.
+
+A pair whose skeletons differ by more than half their length counts as
+unaligned. Unaligned words keep their Uthmani text, and their verses are
+reported.
+
+Usage:
+    python3 indopak_words.py                   # fill text_indopak in words_full.json
+    python3 indopak_words.py --dry-run
+"""
+import argparse
+import time
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+from asset_io import atomic_write_json, load_json
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "quran_vocab" / "assets" / "data"
+REPORT_PATH = DATA_DIR / "indopak_alignment_report.json"
+
+MAX_PAIR_COST = 0.5
+SKIP_COST = 1.0
+# The alignment stays within this many steps of the diagonal, plus the
+# difference between word and token counts.
+BAND = 3
+FOLD = str.maketrans({
+    "ٱ": "ا", "أ": "ا", "إ": "ا", "آ": "ا", "ٲ": "ا", "ٳ": "ا",
+    "ى": "ي", "ی": "ي", "ئ": "ي", "ۍ": "ي", "ې": "ي", "ے": "ي", "ۓ": "ي",
+    "ک": "ك",
+    "ہ": "ه", "ھ": "ه", "ۀ": "ه", "ە": "ه", "ة": "ه", "ۃ": "ه",
+    "ؤ": "و",
+})
+
+
+@lru_cache(maxsize=None)
+def skeleton(text: str) -> str:
+  """Base letters only, with IndoPak and Uthmani variants folded."""
+  return "".join(c for c in text if unicodedata.category(c) == "Lo").translate(FOLD)
+
+
+def tokenize(text: str) -> list[str]:
+  return [token for token in text.split() if skeleton(token)]
+
+
+def levenshtein(a: str, b: str) -> int:
+  previous = list(range(len(b) + 1))
+  for i, ca in enumerate(a, start=1):
+    current = [i]
+    for j, cb in enumerate(b, start=1):
+      current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+    previous = current
+  return previous[-1]
+
+
+def pair_cost(a: str, b: str) -> float:
+  if a == b:
+    return 0.0
+  longest = max(len(a), len(b), 1)
+  # The length difference alone bounds the distance from below.
+  if abs(len(a) - len(b)) > MAX_PAIR_COST * longest:
+    return float("inf")
+  return levenshtein(a, b) / longest
+
+
+def split_token(token: str, first: str, second: str) -> tuple[float, str, str]:
+  """Split `token` before a letter so the halves best match two skeletons."""
+  best = (float("inf"), token, "")
+  if pair_cost(skeleton(token), first + second) == float("inf"):
+    return best
+  letters = 0
+  for cut in range(1, len(token)):
+    if not unicodedata.category(token[cut]).startswith("L"):
+      continue
+    letters += 1
+    if abs(letters - len(first)) > 2:
+      continue
+    head, tail = token[:cut], token[cut:]
+    distance = levenshtein(skeleton(head), first) + levenshtein(skeleton(tail), second)
+    if distance < best[0]:
+      best = (distance, head, tail)
+  distance, head, tail = best
+  return distance / max(len(first) + len(second), 1), head, tail
+
+
+def align_span(
+    word_skeletons: list[str], tokens: list[str], token_skeletons: list[str]
+) -> tuple[list[str | None], list[str]]:
+  """Banded alignment of words to tokens; see the module docstring."""
+  n, m = len(word_skeletons), len(tokens)
+  inf = float("inf")
+  cost = [[inf] * (m + 1) for _ in range(n + 1)]
+  move = [[None] * (m + 1) for _ in range(n + 1)]
+  cost[0][0] = 0.0
+  band = abs(n - m) + BAND
+  for i in range(n + 1):
+    for j in range(max(0, i - band), min(m, i + band) + 1):
+      here = cost[i][j]
+      if here == inf:
+        continue
+      steps = [((1, 0), SKIP_COST, None), ((0, 1), SKIP_COST, None)]
+      if i < n and j < m:
+        steps.append(((1, 1), pair_cost(word_skeletons[i], token_skeletons[j]), None))
+      if i < n and j + 1 < m:
+        joined = token_skeletons[j] + token_skeletons[j + 1]
+        steps.append(((1, 2), pair_cost(word_skeletons[i], joined), None))
+      if i + 1 < n and j < m:
+        split_cost, head, tail = split_token(tokens[j], word_skeletons[i], word_skeletons[i + 1])
+        steps.append(((2, 1), split_cost, (head, tail)))
+      for (di, dj), step_cost, parts in steps:
+        if i + di > n or j + dj > m:
+          continue
+        if di and dj and step_cost > MAX_PAIR_COST:
+          step_cost = inf
+        if here + step_cost < cost[i + di][j + dj]:
+          cost[i + di][j + dj] = here + step_cost
+          move[i + di][j + dj] = (di, dj, parts)
+
+  aligned: list[str | None] = [None] * n
+  leftover: list[str] = []
+  i, j = n, m
+  while i or j:
+    di, dj, parts = move[i][j]
+    i, j = i - di, j - dj
+    if di == 1 and dj == 1:
+      aligned[i] = tokens[j]
+    elif di == 1 and dj == 2:
+      aligned[i] = f"{tokens[j]} {tokens[j + 1]}"
+    elif di == 2:
+      aligned[i], aligned[i + 1] = parts
+    elif dj:
+      leftover.append(tokens[j])
+  leftover.reverse()
+  return aligned, leftover
+
+
+def align_verse(words: list[str], text: str) -> tuple[list[str | None], list[str]]:
+  """(IndoPak text per word or None where unaligned, tokens left over)."""
+  tokens = tokenize(text)
+  word_skeletons = [skeleton(w) for w in words]
+  token_skeletons = [skeleton(t) for t in tokens]
+  n, m = len(words), len(tokens)
+  if n == m and all(
+      pair_cost(a, b) <= MAX_PAIR_COST for a, b in zip(word_skeletons, token_skeletons)
+  ):
+    return list(tokens), []
+
+  # Only the stretch between identical leading and trailing skeletons needs
+  # the dynamic program.
+  start = 0
+  while start < min(n, m) and word_skeletons[start] == token_skeletons[start]:
+    start += 1
+  end = 0
+  while end < min(n, m) - start and word_skeletons[n - 1 - end] == token_skeletons[m - 1 - end]:
+    end += 1
+  middle, leftover = align_span(
+      word_skeletons[start:n - end], tokens[start:m - end], token_skeletons[start:m - end]
+  )
+  return tokens[:start] + middle + tokens[m - end:], leftover
+
+
+def fill_words(ayahs: list[dict], words: list[dict]) -> dict:
+  """Set `text_indopak` on every word record; returns the alignment report."""
+  by_verse: dict[tuple[int, int], list[dict]] = {}
+  for word in words:
+    by_verse.setdefault((word["surah_id"], word["ayah_number"]), []).append(word)
+  indopak = {(a["surah_id"], a["ayah_number"]): a.get("text_indopak") or "" for a in ayahs}
+
+  unaligned = []
+  filled = 0
+  for key, verse_words in by_verse.items():
+    verse_words.sort(key=lambda w: w["position"])
+    aligned, leftover = align_verse([w["text_uthmani"] for w in verse_words], indopak.get(key, ""))
+    fallback = []
+    for word, text in zip(verse_words, aligned):
+      if text is None:
+        fallback.append(word["position"])
+        text = word["text_uthmani"]
+      else:
+        filled += 1
+      word["text_indopak"] = text
+    if fallback or leftover:
+      unaligned.append({
+          "verse": f"{key[0]}:{key[1]}",
+          "words": len(verse_words),
+          "tokens": len(tokenize(indopak.get(key, ""))),
+          "fallback_positions": fallback,
+          "leftover_tokens": leftover,
+      })
+  return {"verses": len(by_verse), "words": len(words), "filled": filled, "unaligned": unaligned}
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Fill per-word IndoPak text from verse text.")
+  parser.add_argument("--ayahs", type=Path, default=DATA_DIR / "ayahs_full.json")
+  parser.add_argument("--words", type=Path, default=DATA_DIR / "words_full.json")
+  parser.add_argument("--report", type=Path, default=REPORT_PATH)
+  parser.add_argument("--dry-run", action="store_true", help="Report only; leave words_full.json alone")
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  ayahs, words = load_json(args.ayahs), load_json(args.words)
+  started = time.perf_counter()
+  report = fill_words(ayahs, words)
+  elapsed = time.perf_counter() - started
+
+  for entry in report["unaligned"][:20]:
+    print(
+        f"  ⚠️  [{entry['verse']}] {entry['words']} words, {entry['tokens']} tokens; "
+        f"Uthmani kept at {entry['fallback_positions']}, leftover {entry['leftover_tokens']}"
+    )
+  if len(report["unaligned"]) > 20:
+    print(f"  ... {len(report['unaligned']) - 20} more")
+  print(
+      f"Filled {report['filled']:,} of {report['words']:,} words in {report['verses']:,} verses "
+      f"({len(report['unaligned'])} verses not fully aligned) in {elapsed:.2f}s"
+  )
+  atomic_write_json(args.report, report)
+  if not args.dry_run:
+    atomic_write_json(args.words, words)
+    print(f"Wrote {args.words}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Ingest the Quranic Arabic Corpus morphology file into quran.db.
+
+The corpus file (`quranic-corpus-morphology-0.4.txt`) has one morpheme
+segment per line, tab-separated, in Buckwalter transliteration:
+
+    LOCATION    FORM    TAG   FEATURES
+    (1:1:1:1)   bi      P     PREFIX|bi+
+    (1:1:1:2)   somi    N     STEM|POS:N|LEM:{som|ROOT:smw|M|GEN
+
+Segments are streamed in file order and grouped per word location
+`(surah, ayah, word)`. The root and lemma of a word come from its segment
+features. Roots and lemmas are interned into the `roots` and `lemmas` tables
+as they are met. Roots already listed in roots.json keep that file's id and
+meanings, and roots already in the database keep their text and meanings.
+Lemmas already in the database (from the word-by-word source) are reused
+when their text matches after folding spelling-only differences (alif
+wasla, tatweel, Quranic marks, sukun), or, for an unvocalized lemma, when it
+is the only one with the same letters. Word rows are then filled by one `UPDATE ... FROM` joined on
+`(surah, ayah, position)`. Memory is bounded by the number of distinct roots
+and lemmas, not by the corpus size.
+
+Usage:
+    python3 ingest_morphology.py data/raw/quranic-corpus-morphology-0.4.txt --db data/quran.db
+    python3 ingest_morphology.py CORPUS --words-json quran_vocab/assets/data/words_full.json
+"""
+import argparse
+import json
+import sqlite3
+import time
+import unicodedata
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import groupby
+from pathlib import Path
+
+from asset_io import atomic_write_json
+
+ROOT = Path(__file__).resolve().parents[2]
+ROOTS_PATH = ROOT / "quran_vocab" / "assets" / "data" / "roots.json"
+
+# Buckwalter transliteration as extended by the Quranic Arabic Corpus.
+BUCKWALTER = {
+    "'": "ء", ">": "أ", "&": "ؤ", "<": "إ", "}": "ئ",
+    "A": "ا", "b": "ب", "p": "ة", "t": "ت", "v": "ث",
+    "j": "ج", "H": "ح", "x": "خ", "d": "د", "*": "ذ",
+    "r": "ر", "z": "ز", "s": "س", "$": "ش", "S": "ص",
+    "D": "ض", "T": "ط", "Z": "ظ", "E": "ع", "g": "غ",
+    "_": "ـ", "f": "ف", "q": "ق", "k": "ك", "l": "ل",
+    "m": "م", "n": "ن", "h": "ه", "w": "و", "Y": "ى",
+    "y": "ي", "F": "ً", "N": "ٌ", "K": "ٍ", "a": "َ",
+    "u": "ُ", "i": "ِ", "~": "ّ", "o": "ْ", "^": "ٓ",
+    "#": "ٔ", "`": "ٰ", "{": "ٱ", "|": "آ", ":": "ۜ",
+    "@": "۟", '"': "۠", "[": "ۢ", ";": "ۣ", ",": "ۥ",
+    ".": "ۦ", "!": "ۨ", "-": "۪", "+": "۫", "%": "۬",
+    "]": "ۭ",
+}
+_TRANSLATE = str.maketrans(BUCKWALTER)
+
+# A bare alif in a root is a hamza radical (QAC writes أ ل ه as "Alh").
+_ROOT_LETTERS = {**BUCKWALTER, "A": "أ"}
+# Hamza seats differ between sources; fold them when matching roots.json.
+_HAMZA_FOLD = str.maketrans({c: "ء" for c in "أإآؤئا"})
+# Spelling-only differences between lemma sources: alif wasla, dagger alif,
+# tatweel, sukun and the Quranic annotation marks.
+_LEMMA_FOLD = str.maketrans(
+    {"ٱ": "ا", "ٰ": "ا", "ـ": None, "ْ": None, **{chr(c): None for c in range(0x06D6, 0x06EE)}}
+)
+_LETTER_FOLD = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ى": "ي"})
+
+
+def buckwalter_to_arabic(text: str) -> str:
+  return text.translate(_TRANSLATE)
+
+
+def root_to_arabic(root: str) -> str:
+  """`rHm` -> `ر ح م`, the spaced form used by roots.json."""
+  return " ".join(_ROOT_LETTERS.get(c, c) for c in root)
+
+
+def root_key(root_text: str) -> str:
+  return root_text.replace(" ", "").translate(_HAMZA_FOLD)
+
+
+def lemma_keys(text: str) -> tuple[str, str]:
+  """(vocalized text with spelling variants folded, bare letters)."""
+  vocalized = unicodedata.normalize("NFC", unicodedata.normalize("NFD", text).translate(_LEMMA_FOLD))
+  letters = "".join(c for c in vocalized if not unicodedata.combining(c)).translate(_LETTER_FOLD)
+  return vocalized, letters
+
+
+@dataclass
+class Segment:
+  surah: int
+  ayah: int
+  word: int
+  tag: str
+  root: str | None
+  lemma: str | None
+
+
+def parse_features(features: str) -> tuple[str | None, str | None]:
+  root = lemma = None
+  for feature in features.split("|"):
+    if feature.startswith("ROOT:"):
+      root = feature[5:]
+    elif feature.startswith("LEM:"):
+      lemma = feature[4:]
+  return root, lemma
+
+
+def iter_segments(path: Path) -> Iterator[Segment]:
+  """Stream segments from the corpus file, skipping comments and the header."""
+  with path.open(encoding="utf-8") as f:
+    for line in f:
+      if not line.startswith("("):
+        continue
+      location, _form, tag, features = line.rstrip("\n").split("\t", 3)
+      surah, ayah, word, _segment = location.strip("()").split(":")
+      root, lemma = parse_features(features)
+      yield Segment(int(surah), int(ayah), int(word), tag, root, lemma)
+
+
+def iter_words(segments: Iterable[Segment]) -> Iterator[tuple[int, int, int, str | None, str | None]]:
+  """Group consecutive segments into (surah, ayah, word, root, lemma).
+
+  A word has at most one stem carrying ROOT/LEM; prefixes and suffixes carry
+  neither. The first root and lemma found in the word are used.
+  """
+  for (surah, ayah, word), group in groupby(segments, key=lambda s: (s.surah, s.ayah, s.word)):
+    root = lemma = None
+    for segment in group:
+      root = root or segment.root
+      lemma = lemma or segment.lemma
+    yield surah, ayah, word, root, lemma
+
+
+class MorphologyInterner:
+  """Assigns ids to roots and lemmas on first sight and counts occurrences."""
+
+  def __init__(self, roots_meta: list[dict], existing_lemmas: dict[str, int]):
+    self.known_roots = {root_key(r["root_text"]): r for r in roots_meta}
+    self.root_ids: dict[str, int] = {}
+    self.root_text: dict[int, str] = {}
+    self.root_counts: dict[int, int] = {}
+    self._next_root = max((r["id"] for r in roots_meta), default=0) + 1
+    self.lemma_ids: dict[str, int] = {}
+    self.existing_vocalized: dict[str, int] = {}
+    by_letters: dict[str, list[int]] = {}
+    for text, lemma_id in existing_lemmas.items():
+      vocalized, letters = lemma_keys(text)
+      self.existing_vocalized.setdefault(vocalized, lemma_id)
+      if vocalized.translate(_LETTER_FOLD) == letters:
+        by_letters.setdefault(letters, []).append(lemma_id)
+    # A vocalized lemma that differs in its vowels is a different lemma, so
+    # only unvocalized ones match by letters, when unambiguous. Each is
+    # claimed by the first corpus lemma that uses it.
+    self.existing_letters = {k: ids[0] for k, ids in by_letters.items() if len(ids) == 1}
+    self.reused_lemmas = 0
+    self.new_lemmas: dict[int, str] = {}
+    self.lemma_root: dict[int, int] = {}
+    self.lemma_counts: dict[int, int] = {}
+    self._next_lemma = max(existing_lemmas.values(), default=0) + 1
+
+  def root(self, buckwalter: str) -> int:
+    root_id = self.root_ids.get(buckwalter)
+    if root_id is None:
+      text = root_to_arabic(buckwalter)
+      known = self.known_roots.get(root_key(text))
+      if known:
+        root_id, text = known["id"], known["root_text"]
+      else:
+        root_id = self._next_root
+        self._next_root += 1
+      self.root_ids[buckwalter] = root_id
+      self.root_text[root_id] = text
+    self.root_counts[root_id] = self.root_counts.get(root_id, 0) + 1
+    return root_id
+
+  def lemma(self, buckwalter: str, root_id: int | None) -> int:
+    text = buckwalter_to_arabic(buckwalter)
+    lemma_id = self.lemma_ids.get(text)
+    if lemma_id is None:
+      vocalized, letters = lemma_keys(text)
+      lemma_id = self.existing_vocalized.get(vocalized) or self.existing_letters.pop(letters, None)
+      if lemma_id is not None:
+        self.reused_lemmas += 1
+      else:
+        lemma_id = self._next_lemma
+        self._next_lemma += 1
+        self.new_lemmas[lemma_id] = text
+      self.lemma_ids[text] = lemma_id
+    if root_id is not None:
+      self.lemma_root.setdefault(lemma_id, root_id)
+    self.lemma_counts[lemma_id] = self.lemma_counts.get(lemma_id, 0) + 1
+    return lemma_id
+
+  def rows(self, words: Iterable[tuple]) -> Iterator[tuple[int, int, int, int | None, int | None]]:
+    for surah, ayah, word, root, lemma in words:
+      root_id = self.root(root) if root else None
+      lemma_id = self.lemma(lemma, root_id) if lemma else None
+      if root_id is not None or lemma_id is not None:
+        yield surah, ayah, word, root_id, lemma_id
+
+
+def populate_morphology(conn: sqlite3.Connection, corpus: Path, roots_meta: list[dict]) -> dict:
+  """Fill roots, lemmas and words.root_id/lemma_id from the corpus file."""
+  cur = conn.cursor()
+  existing_lemmas = {text: lemma_id for lemma_id, text in cur.execute("SELECT id, lemma_text FROM lemmas")}
+  interner = MorphologyInterner(roots_meta, existing_lemmas)
+
+  cur.execute(
+      """
+      CREATE TEMP TABLE word_morphology (
+        surah INTEGER NOT NULL,
+        ayah INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        root_id INTEGER,
+        lemma_id INTEGER,
+        PRIMARY KEY (surah, ayah, position)
+      ) WITHOUT ROWID
+      """
+  )
+  # Streams straight from the file into the temp table.
+  cur.executemany(
+      "INSERT INTO word_morphology VALUES (?, ?, ?, ?, ?)",
+      interner.rows(iter_words(iter_segments(corpus))),
+  )
+  located = cur.execute("SELECT COUNT(*) FROM word_morphology").fetchone()[0]
+
+  meta_by_id = {r["id"]: r for r in roots_meta}
+  cur.executemany(
+      """
+      INSERT INTO roots (id, root_text, frequency_count, meaning_short, meaning_long)
+      VALUES (?, ?, ?, ?, ?)
+      ON CONFLICT (id) DO UPDATE SET
+        root_text = COALESCE(NULLIF(roots.root_text, ''), excluded.root_text),
+        frequency_count = excluded.frequency_count,
+        meaning_short = COALESCE(NULLIF(roots.meaning_short, ''), excluded.meaning_short),
+        meaning_long = COALESCE(NULLIF(roots.meaning_long, ''), excluded.meaning_long)
+      """,
+      (
+          (
+              root_id,
+              interner.root_text[root_id],
+              count,
+              meta_by_id.get(root_id, {}).get("meaning_short", ""),
+              meta_by_id.get(root_id, {}).get("meaning_long", ""),
+          )
+          for root_id, count in interner.root_counts.items()
+      ),
+  )
+  cur.executemany(
+      "INSERT INTO lemmas (id, lemma_text, root_id, frequency_rank) VALUES (?, ?, ?, ?)",
+      (
+          (lemma_id, text, interner.lemma_root.get(lemma_id), interner.lemma_counts[lemma_id])
+          for lemma_id, text in interner.new_lemmas.items()
+      ),
+  )
+  cur.executemany(
+      "UPDATE lemmas SET root_id = ? WHERE id = ?",
+      ((root_id, lemma_id) for lemma_id, root_id in interner.lemma_root.items()),
+  )
+  cur.execute(
+      """
+      UPDATE words
+      SET root_id = m.root_id, lemma_id = COALESCE(m.lemma_id, words.lemma_id)
+      FROM word_morphology AS m
+      JOIN ayahs ON ayahs.surah_id = m.surah AND ayahs.ayah_number = m.ayah
+      WHERE words.ayah_id = ayahs.id AND words.position = m.position
+      """
+  )
+  updated = cur.rowcount
+  cur.execute("DROP TABLE word_morphology")
+  conn.commit()
+  return {
+      "words": located,
+      "updated": updated,
+      "roots": len(interner.root_counts),
+      "lemmas": len(interner.lemma_counts),
+      "new_lemmas": len(interner.new_lemmas),
+  }
+
+
+def fill_words_json(words: list[dict], corpus: Path) -> int:
+  """Set the "root" field of words_full.json records found in the corpus."""
+  index = {(w["surah_id"], w["ayah_number"], w["position"]): w for w in words}
+  filled = 0
+  for surah, ayah, word, root, _lemma in iter_words(iter_segments(corpus)):
+    record = index.get((surah, ayah, word))
+    if record is None:
+      continue
+    # The corpus is authoritative: particles and proper nouns have no root.
+    record["root"] = root_to_arabic(root) if root else ""
+    filled += bool(root)
+  return filled
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Ingest Quranic Arabic Corpus morphology.")
+  parser.add_argument("corpus", type=Path, help="quranic-corpus-morphology-0.4.txt")
+  parser.add_argument("--db", type=Path, help="quran.db to fill (root_id/lemma_id)")
+  parser.add_argument("--words-json", type=Path, help="words_full.json to fill (root)")
+  parser.add_argument("--roots", type=Path, default=ROOTS_PATH)
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  if not args.db and not args.words_json:
+    raise SystemExit("Pass --db and/or --words-json")
+  roots_meta = json.loads(args.roots.read_text(encoding="utf-8")) if args.roots.exists() else []
+
+  if args.db:
+    started = time.perf_counter()
+    conn = sqlite3.connect(args.db)
+    stats = populate_morphology(conn, args.corpus, roots_meta)
+    conn.close()
+    print(
+        f"{args.db}: {stats['updated']:,} of {stats['words']:,} corpus words matched, "
+        f"{stats['roots']:,} roots, {stats['lemmas']:,} lemmas "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+  if args.words_json:
+    words = json.loads(args.words_json.read_text(encoding="utf-8"))
+    filled = fill_words_json(words, args.corpus)
+    atomic_write_json(args.words_json, words)
+    print(f"{args.words_json}: filled root for {filled:,} of {len(words):,} words")
+
+
+if __name__ == "__main__":
+  main()
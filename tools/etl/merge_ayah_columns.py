@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Merge keyed column sources into ayahs_full.json.
+
+Every per-ayah column that comes from its own source (a script, a
+translation, a tafsir) is stored as a sidecar keyed by verse key:
+
+    data/ayah_columns/<column>.json
+    {"column": "text_indopak", "source": "api.quran.com", "values": {"1:1": "...", ...}}
+
+Fetch scripts write their sidecar with `write_column`. The merge reads the
+base ayahs plus only the sidecars being applied. It joins them in one pass by
+(surah, ayah) and writes the result atomically. Adding a second translation
+means writing one new sidecar and merging that column. No other source is
+fetched, parsed or re-serialized. Rows a source does not cover keep their
+current value. Keys the base does not have are reported, not appended.
+
+Usage:
+    python3 merge_ayah_columns.py                          # apply every sidecar
+    python3 merge_ayah_columns.py --columns text_indopak   # apply selected sidecars
+    python3 merge_ayah_columns.py --import translation_ur data/raw/ur.jalandhry.txt
+"""
+import argparse
+import time
+from pathlib import Path
+
+from asset_io import atomic_write_json, format_for, load_json, write_records
+from tanzil import parse_tanzil
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "quran_vocab" / "assets" / "data"
+AYAHS_PATH = DATA_DIR / "ayahs_full.json"
+SURAHS_PATH = DATA_DIR / "surahs.json"
+COLUMNS_DIR = ROOT / "data" / "ayah_columns"
+
+# Columns that identify a row and are never overwritten by a source.
+KEY_COLUMNS = ("surah_id", "ayah_number")
+
+
+def verse_key(surah: int, ayah: int) -> str:
+    return f"{surah}:{ayah}"
+
+
+def write_column(
+    column: str,
+    values: dict[str, str],
+    source: str = "",
+    columns_dir: Path = COLUMNS_DIR,
+) -> Path:
+    """Write one column source as a keyed sidecar and return its path."""
+    if column in KEY_COLUMNS:
+        raise ValueError(f"{column} is a key column")
+    path = columns_dir / f"{column}.json"
+    atomic_write_json(path, {"column": column, "source": source, "values": values}, indent=None)
+    return path
+
+
+def load_column(path: Path) -> tuple[str, dict[str, str]]:
+    payload = load_json(path)
+    return payload["column"], payload["values"]
+
+
+def skeleton_rows(surahs: list[dict]) -> list[dict]:
+    """Key-only rows for every ayah, used when no base file exists yet."""
+    return [
+        {"surah_id": surah["id"], "ayah_number": ayah}
+        for surah in sorted(surahs, key=lambda s: s["id"])
+        for ayah in range(1, surah["verse_count"] + 1)
+    ]
+
+
+def merge_columns(rows: list[dict], sources: dict[str, dict[str, str]]) -> dict[str, dict]:
+    """Join all sources into rows in a single pass; rows are updated in place.
+
+    Returns per-column stats: how many rows were set, which rows the source
+    does not cover, and which source keys match no row.
+    """
+    stats = {column: {"applied": 0, "missing": [], "unmatched": []} for column in sources}
+    seen: set[str] = set()
+    for row in rows:
+        key = verse_key(row["surah_id"], row["ayah_number"])
+        seen.add(key)
+        for column, values in sources.items():
+            value = values.get(key)
+            if value is None:
+                stats[column]["missing"].append(key)
+                continue
+            row[column] = value
+            stats[column]["applied"] += 1
+    for column, values in sources.items():
+        stats[column]["unmatched"] = [key for key in values if key not in seen]
+    return stats
+
+
+def apply_columns(
+    column_paths: list[Path],
+    ayahs_path: Path = AYAHS_PATH,
+    surahs_path: Path = SURAHS_PATH,
+) -> dict[str, dict]:
+    """Merge the given sidecars into ayahs_path and stream it back atomically.
+
+    An `.ndjson` ayahs_path is read and written as NDJSON.
+    """
+    if ayahs_path.exists():
+        rows = load_json(ayahs_path)
+    else:
+        rows = skeleton_rows(load_json(surahs_path))
+    sources = dict(load_column(path) for path in column_paths)
+    stats = merge_columns(rows, sources)
+    write_records(ayahs_path, rows, format_for(ayahs_path))
+    return stats
+
+
+def import_tanzil(column: str, path: Path, columns_dir: Path = COLUMNS_DIR) -> Path:
+    """Convert a Tanzil `surah|ayah|text` file into a column sidecar."""
+    values = {verse_key(entry.surah, entry.ayah): entry.text for entry in parse_tanzil(path)}
+    return write_column(column, values, source=path.name, columns_dir=columns_dir)
+
+
+def print_stats(stats: dict[str, dict]) -> None:
+    for column, result in stats.items():
+        line = f"  {column:<20} {result['applied']:>5} rows"
+        if result["missing"]:
+            line += f", {len(result['missing'])} not covered (e.g. {result['missing'][0]})"
+        if result["unmatched"]:
+            line += f", {len(result['unmatched'])} unmatched keys (e.g. {result['unmatched'][0]})"
+        print(line)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Merge keyed column sources into ayahs_full.json.")
+    parser.add_argument("--ayahs", type=Path, default=AYAHS_PATH)
+    parser.add_argument("--surahs", type=Path, default=SURAHS_PATH)
+    parser.add_argument("--columns-dir", type=Path, default=COLUMNS_DIR)
+    parser.add_argument(
+        "--columns",
+        default="",
+        help="Comma-separated columns to apply (default: every sidecar in --columns-dir)",
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_",
+        nargs=2,
+        metavar=("COLUMN", "FILE"),
+        help="Store a Tanzil surah|ayah|text file as a column sidecar, then apply it",
+    )
+    parser.add_argument("--list", action="store_true", help="List available sidecars")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.list:
+        for path in sorted(args.columns_dir.glob("*.json")):
+            column, values = load_column(path)
+            print(f"  {column:<20} {len(values):>5} ayahs  ({path.name})")
+        return
+
+    if args.import_:
+        column, source = args.import_
+        paths = [import_tanzil(column, Path(source), args.columns_dir)]
+        print(f"Stored {source} as {paths[0]}")
+    elif args.columns:
+        paths = [args.columns_dir / f"{c.strip()}.json" for c in args.columns.split(",") if c.strip()]
+    else:
+        paths = sorted(args.columns_dir.glob("*.json"))
+
+    missing = [p for p in paths if not p.exists()]
+    if missing:
+        raise SystemExit(f"Column sources not found: {', '.join(str(p) for p in missing)}")
+    if not paths:
+        raise SystemExit(f"No column sources in {args.columns_dir}")
+
+    started = time.perf_counter()
+    stats = apply_columns(paths, args.ayahs, args.surahs)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"Merged {len(paths)} columns into {args.ayahs} in {elapsed_ms:.0f} ms")
+    print_stats(stats)
+
+
+if __name__ == "__main__":
+    main()
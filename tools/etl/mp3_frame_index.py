@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Index MP3 frame offsets so single words can be fetched with HTTP Range.
+
+Scans local per-ayah recitation files (EveryAyah layout, `SSSAAA.mp3`) once.
+Only the 4-byte frame headers are read: the scanner seeks from one header to
+the next using the frame length computed from the header. An ID3v2 tag at
+the start is skipped, and an ID3v1/APE tag at the end stops the scan. A
+Xing/Info frame is not audio. If it carries a LAME tag, the encoder delay is
+read from it so times line up with decoded output.
+
+The frame table (byte offset and first sample of every frame) maps a
+millisecond to the frame that contains it. Word timings come from
+`Alafasy_128kbps.json` (segments `[word_start, word_end, start_ms, end_ms]`,
+with multi-word segments split evenly, as AudioAlignmentLoader does). Each
+word then gets an inclusive `(byte_start, byte_end)` range, from the frame
+holding its first sample to the frame holding its last. `--preroll` frames
+are prepended: a Layer III frame can borrow up to 511 bytes of main data
+from earlier frames (the bit reservoir), so decoding needs the frame before.
+
+Output (`Alafasy_128kbps.ranges.json`):
+
+    {"preroll": 1, "ayahs": {"1:1": {"file": "001001.mp3", "bytes": 104509,
+      "words": [[1, 1563, 11175], [2, 10341, 22460], ...]}}}
+
+A word is then played with `Range: bytes=1563-11175`.
+
+`--self-check` builds synthetic frame streams (CBR and VBR, MPEG-1 and
+MPEG-2, ID3v2, Xing/LAME, junk between frames, ID3v1) and checks the scanner
+and the ranges against them.
+
+Usage:
+    python3 mp3_frame_index.py --audio-dir data/audio/Alafasy_128kbps
+    python3 mp3_frame_index.py --self-check
+"""
+import argparse
+import json
+import tempfile
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+
+from asset_io import atomic_write_json
+
+ROOT = Path(__file__).resolve().parents[2]
+ALIGN_DIR = ROOT / "quran_vocab" / "assets" / "data" / "audio_align"
+SEGMENTS_PATH = ALIGN_DIR / "Alafasy_128kbps.json"
+OUTPUT_PATH = ALIGN_DIR / "Alafasy_128kbps.ranges.json"
+
+# kbps by (MPEG-1?, layer); index 0 (free format) and 15 are invalid.
+BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# Sample rates by version bits (0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1).
+SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+# Samples a decoder withholds beyond the LAME-reported encoder delay.
+DECODER_DELAY = 529
+RESYNC_CHUNK = 512
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    mpeg1: bool
+    layer: int
+    bitrate: int
+    sample_rate: int
+    padding: int
+    mono: bool
+
+    @property
+    def samples(self) -> int:
+        if self.layer == 1:
+            return 384
+        return 1152 if self.mpeg1 or self.layer == 2 else 576
+
+    @property
+    def length(self) -> int:
+        if self.layer == 1:
+            return (12 * self.bitrate * 1000 // self.sample_rate + self.padding) * 4
+        factor = 144 if self.mpeg1 or self.layer == 2 else 72
+        return factor * self.bitrate * 1000 // self.sample_rate + self.padding
+
+    @property
+    def side_info(self) -> int:
+        if self.mpeg1:
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+
+def parse_header(data: bytes) -> FrameHeader | None:
+    if len(data) < 4 or data[0] != 0xFF or data[1] & 0xE0 != 0xE0:
+        return None
+    version = (data[1] >> 3) & 0x03
+    layer = 4 - ((data[1] >> 1) & 0x03)
+    bitrate_index = data[2] >> 4
+    rate_index = (data[2] >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    return FrameHeader(
+        mpeg1=mpeg1,
+        layer=layer,
+        bitrate=BITRATES[(mpeg1, layer)][bitrate_index],
+        sample_rate=SAMPLE_RATES[version][rate_index],
+        padding=(data[2] >> 1) & 0x01,
+        mono=(data[3] >> 6) == 3,
+    )
+
+
+def id3v2_size(head: bytes) -> int:
+    """Bytes taken by a leading ID3v2 tag (0 if none)."""
+    if len(head) < 10 or head[:3] != b"ID3":
+        return 0
+    size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+    footer = 10 if head[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def info_frame_delay(frame: bytes, header: FrameHeader) -> int | None:
+    """None unless this is a Xing/Info frame; else the samples to skip.
+
+    A LAME tag gives the encoder delay, and the decoder adds DECODER_DELAY.
+    Without a LAME tag the delay is unknown and taken as 0.
+    """
+    tag = 4 + header.side_info
+    if frame[tag:tag + 4] not in (b"Xing", b"Info"):
+        return None
+    flags = int.from_bytes(frame[tag + 4:tag + 8], "big")
+    # Optional fields: frames (4), bytes (4), TOC (100), quality (4).
+    lame = tag + 8 + 4 * bool(flags & 1) + 4 * bool(flags & 2) + 100 * bool(flags & 4) + 4 * bool(flags & 8)
+    if frame[lame:lame + 4] != b"LAME" or len(frame) < lame + 24:
+        return 0
+    packed = frame[lame + 21:lame + 24]
+    return ((packed[0] << 4) | (packed[1] >> 4)) + DECODER_DELAY
+
+
+@dataclass
+class FrameTable:
+    offsets: array
+    first_samples: array
+    sample_rate: int
+    end: int
+    delay: int
+    bytes_read: int
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def frame_at(self, ms: float) -> int:
+        """Index of the frame holding the decoded sample at `ms`."""
+        sample = ms * self.sample_rate / 1000 + self.delay
+        return max(0, min(len(self) - 1, bisect_right(self.first_samples, sample) - 1))
+
+    def byte_range(self, start_ms: float, end_ms: float, preroll: int = 1) -> tuple[int, int]:
+        """Inclusive byte range covering [start_ms, end_ms) plus `preroll` frames."""
+        first = max(0, self.frame_at(start_ms) - preroll)
+        stop = bisect_left(self.first_samples, end_ms * self.sample_rate / 1000 + self.delay)
+        stop = max(stop, first + 1)
+        end = self.offsets[stop] if stop < len(self) else self.end
+        return self.offsets[first], end - 1
+
+
+def resync(f, position: int, size: int) -> tuple[int | None, int]:
+    """Next offset where two consecutive frame headers parse, and the bytes read."""
+    read = 0
+    while position < size:
+        f.seek(position)
+        chunk = f.read(RESYNC_CHUNK + 3)
+        read += len(chunk)
+        index = chunk.find(b"\xff")
+        while index != -1 and index < RESYNC_CHUNK:
+            header = parse_header(chunk[index:index + 4])
+            if header:
+                f.seek(position + index + header.length)
+                following = f.read(4)
+                read += len(following)
+                if not following or parse_header(following):
+                    return position + index, read
+            index = chunk.find(b"\xff", index + 1)
+        position += RESYNC_CHUNK
+    return None, read
+
+
+def scan_frames(path: Path) -> FrameTable:
+    offsets, first_samples = array("Q"), array("Q")
+    sample_rate = delay = 0
+    samples = 0
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        head = f.read(10)
+        position = id3v2_size(head)
+        bytes_read = len(head)
+        while position + 4 <= size:
+            f.seek(position)
+            data = f.read(4)
+            bytes_read += 4
+            header = parse_header(data)
+            if header is None:
+                if data[:3] == b"TAG" or data == b"APET":
+                    break
+                position, read = resync(f, position + 1, size)
+                bytes_read += read
+                if position is None:
+                    position = size
+                    break
+                continue
+            if not sample_rate:
+                # The first frame may be a Xing/Info header rather than audio.
+                sample_rate = header.sample_rate
+                f.seek(position)
+                first = f.read(header.length)
+                bytes_read += len(first)
+                info_delay = info_frame_delay(first, header)
+                if info_delay is not None:
+                    delay = info_delay
+                    position += header.length
+                    continue
+            offsets.append(position)
+            first_samples.append(samples)
+            samples += header.samples
+            position += header.length
+    return FrameTable(offsets, first_samples, sample_rate, min(position, size), delay, bytes_read)
+
+
+def word_times(segments: list[list[int]]) -> list[tuple[int, int, int]]:
+    """(position, start_ms, end_ms) per word; multi-word segments split evenly."""
+    words = []
+    for word_start, word_end, start_ms, end_ms in segments:
+        count, duration = word_end - word_start, end_ms - start_ms
+        if count <= 0 or duration <= 0:
+            continue
+        per_word = duration / count
+        for i in range(count):
+            words.append(
+                (word_start + i + 1, round(start_ms + per_word * i), round(start_ms + per_word * (i + 1)))
+            )
+    return words
+
+
+def build_ranges(audio_dir: Path, alignment: list[dict], preroll: int) -> tuple[dict, dict]:
+    ayahs = {}
+    stats = {"files": 0, "missing": 0, "frames": 0, "bytes": 0, "bytes_read": 0}
+    for entry in alignment:
+        surah, ayah = entry["surah"], entry["ayah"]
+        name = f"{surah:03d}{ayah:03d}.mp3"
+        path = audio_dir / name
+        if not path.exists():
+            stats["missing"] += 1
+            continue
+        table = scan_frames(path)
+        if not len(table):
+            stats["missing"] += 1
+            continue
+        stats["files"] += 1
+        stats["frames"] += len(table)
+        stats["bytes"] += path.stat().st_size
+        stats["bytes_read"] += table.bytes_read
+        ayahs[f"{surah}:{ayah}"] = {
+            "file": name,
+            "bytes": path.stat().st_size,
+            "words": [
+                [position, *table.byte_range(start, end, preroll)]
+                for position, start, end in word_times(entry["segments"])
+            ],
+        }
+    return ayahs, stats
+
+
+# --- Synthetic streams -------------------------------------------------------
+
+
+def frame_header(mpeg1: bool, bitrate_index: int, rate_index: int, padding: int, mono: bool = False) -> bytes:
+    version = 3 if mpeg1 else 2
+    return bytes([
+        0xFF,
+        0xE0 | (version << 3) | (1 << 1) | 1,  # Layer III, no CRC
+        (bitrate_index << 4) | (rate_index << 2) | (padding << 1),
+        (3 if mono else 1) << 6,
+    ])
+
+
+def synthetic_stream(
+    bitrate_indices: list[int],
+    mpeg1: bool = True,
+    rate_index: int = 0,
+    id3: bool = False,
+    xing_delay: int | None = None,
+    junk_every: int = 0,
+    id3v1: bool = False,
+) -> tuple[bytes, list[int]]:
+    """A stream of silent Layer III frames; returns it with the audio frame offsets."""
+    out = bytearray()
+    if id3:
+        body = b"\x00" * 300
+        out += b"ID3\x04\x00\x00" + bytes([0, 0, len(body) >> 7, len(body) & 0x7F]) + body
+    remainder = 0
+    offsets = []
+
+    def add_frame(bitrate_index: int, payload: bytes = b"") -> int:
+        nonlocal remainder
+        header = parse_header(frame_header(mpeg1, bitrate_index, rate_index, 0))
+        factor = 144 if mpeg1 else 72
+        exact = factor * header.bitrate * 1000
+        remainder += exact % header.sample_rate
+        padding = int(remainder >= header.sample_rate)
+        remainder -= padding * header.sample_rate
+        raw = frame_header(mpeg1, bitrate_index, rate_index, padding)
+        length = parse_header(raw).length
+        start = len(out)
+        out.extend(raw + payload + b"\x00" * (length - 4 - len(payload)))
+        return start
+
+    if xing_delay is not None:
+        side = b"\x00" * (32 if mpeg1 else 17)
+        lame = b"LAME3.100" + b"\x00" * 12 + bytes([xing_delay >> 4, (xing_delay & 0x0F) << 4, 0])
+        add_frame(9 if mpeg1 else 8, side + b"Info" + (0).to_bytes(4, "big") + lame)
+    for number, bitrate_index in enumerate(bitrate_indices):
+        if junk_every and number and number % junk_every == 0:
+            out += b"\x00\xff\x12junk"
+        offsets.append(add_frame(bitrate_index))
+    if id3v1:
+        out += b"TAG" + b"\x00" * 125
+    return bytes(out), offsets
+
+
+def self_check() -> None:
+    cases = {
+        "cbr": dict(bitrate_indices=[9] * 400, id3=True),
+        "vbr": dict(bitrate_indices=[(i * 7) % 13 + 1 for i in range(400)], xing_delay=576, id3v1=True),
+        "mpeg2": dict(bitrate_indices=[8] * 300, mpeg1=False, rate_index=1),
+        "junk": dict(bitrate_indices=[9] * 200, junk_every=37, id3=True, id3v1=True),
+    }
+    segments = [[0, 1, 40, 900], [1, 3, 910, 2500], [3, 4, 2600, 5000]]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, spec in cases.items():
+            data, expected = synthetic_stream(**spec)
+            path = Path(tmp) / f"{name}.mp3"
+            path.write_bytes(data)
+            table = scan_frames(path)
+            assert list(table.offsets) == expected, f"{name}: frame offsets differ"
+            assert table.bytes_read < len(data) / 20, f"{name}: read {table.bytes_read} of {len(data)} bytes"
+            for position, start, end in word_times(segments):
+                byte_start, byte_end = table.byte_range(start, end, preroll=0)
+                # Every frame overlapping [start, end) lies inside the range, and
+                # the range begins and ends on frame boundaries.
+                per_frame = 1152 if spec.get("mpeg1", True) else 576
+                rate = table.sample_rate
+                for index, offset in enumerate(expected):
+                    first = index * per_frame - table.delay
+                    last = first + per_frame
+                    if first * 1000 / rate < end and last * 1000 / rate > start:
+                        assert byte_start <= offset <= byte_end, f"{name}: word {position} misses frame {index}"
+                assert byte_start in expected
+                assert byte_end + 1 in expected or byte_end + 1 == table.end
+            print(
+                f"{name:<6} {len(expected):>4} frames, {len(data):>7,} bytes, "
+                f"read {table.bytes_read:,} bytes, delay {table.delay} samples: ok"
+            )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build per-word byte ranges for recitation MP3s.")
+    parser.add_argument("--audio-dir", type=Path, help="Directory of SSSAAA.mp3 files")
+    parser.add_argument("--segments", type=Path, default=SEGMENTS_PATH)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--preroll", type=int, default=1, help="Extra frames before each word")
+    parser.add_argument("--self-check", action="store_true", help="Check against synthetic streams")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.self_check:
+        self_check()
+        return
+    if not args.audio_dir:
+        raise SystemExit("Pass --audio-dir or --self-check")
+
+    alignment = json.loads(args.segments.read_text(encoding="utf-8"))
+    started = time.perf_counter()
+    ayahs, stats = build_ranges(args.audio_dir, alignment, args.preroll)
+    elapsed = time.perf_counter() - started
+    atomic_write_json(args.output, {"preroll": args.preroll, "ayahs": ayahs}, indent=None)
+    print(
+        f"Indexed {stats['frames']:,} frames in {stats['files']:,} files "
+        f"({stats['missing']:,} missing) in {elapsed:.1f}s; read {stats['bytes_read']:,} "
+        f"of {stats['bytes']:,} bytes"
+    )
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Publish generated assets under content-hashed names with a manifest.
+
+Each asset is copied to `<stem>.<hash>.<ext>`, where the hash is the first
+12 hex digits of its SHA-256. A changed asset gets a new name, so hashed
+files can be served as immutable
+(`Cache-Control: public, max-age=31536000, immutable`).
+`assets_manifest.json` is the only file clients revalidate. It maps each
+logical name to the hashed file, its size, its full SHA-256 and a
+Subresource Integrity string:
+
+    {"version": 2, "assets": {"ayahs_full.json": {
+      "file": "ayahs_full.5d41402abc4b.json", "bytes": 5123456,
+      "sha256": "5d41402abc4b2a76...", "integrity": "sha256-XUFAKrxLKna..."}}}
+
+`version` increases whenever any asset changes. A client compares the
+manifest with the one it has cached and fetches only the assets whose hash
+differs. Hashed files that already exist are not rewritten. `--prune`
+deletes hashed files that the new manifest no longer lists.
+
+With `--patches`, each changed asset whose previous hashed file is still in
+the output also gets a keyed delta from that release
+(`<stem>.<old>-<new>.patch.json`, see asset_delta.py). The patch is listed
+under the asset's `patches` with the SHA-256 it applies to.
+
+Usage:
+    python3 publish_assets.py
+    python3 publish_assets.py --output dist/assets --prune
+    python3 publish_assets.py --patches
+    python3 publish_assets.py --asset quran_vocab/assets/data/similar_verses.json
+"""
+import argparse
+import base64
+import hashlib
+import re
+from pathlib import Path
+
+from asset_delta import PatchError, diff, key_spec
+from asset_io import atomic_write_bytes, atomic_write_json, load_json
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "quran_vocab" / "assets" / "data"
+OUTPUT_DIR = ROOT / "dist" / "assets"
+MANIFEST_NAME = "assets_manifest.json"
+HASH_LENGTH = 12
+
+DEFAULT_ASSETS = (
+    "surahs.json",
+    "ayahs_full.json",
+    "words_full.json",
+    "daily_lessons.json",
+    "roots.json",
+    "lessons.json",
+    "audio_align/Alafasy_128kbps.json",
+)
+_HASHED = re.compile(r"\.[0-9a-f]{%d}(-[0-9a-f]{%d}\.patch)?(\.[^./]+)$" % (HASH_LENGTH, HASH_LENGTH))
+
+
+def hashed_name(logical: str, digest: str) -> str:
+    path = Path(logical)
+    return str(path.with_name(f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"))
+
+
+def describe(logical: str, data: bytes) -> dict:
+    digest = hashlib.sha256(data)
+    return {
+        "file": hashed_name(logical, digest.hexdigest()),
+        "bytes": len(data),
+        "sha256": digest.hexdigest(),
+        "integrity": "sha256-" + base64.b64encode(digest.digest()).decode("ascii"),
+    }
+
+
+def patch_name(logical: str, old_digest: str, new_digest: str) -> str:
+    path = Path(logical)
+    return str(path.with_name(
+        f"{path.stem}.{old_digest[:HASH_LENGTH]}-{new_digest[:HASH_LENGTH]}.patch{path.suffix}"
+    ))
+
+
+def write_patch(logical: str, old: dict, entry: dict, data: bytes, output: Path) -> dict | None:
+    """Delta from the previous release of an asset, if that release is still on disk."""
+    previous = output / old["file"]
+    try:
+        key_spec(logical)
+    except PatchError:
+        return None
+    if not previous.exists():
+        return None
+    patch, encoded = diff(logical, previous.read_bytes(), data)
+    # A patch without a known layout only rebuilds the records, not the
+    # bytes the manifest's sha256 describes.
+    if patch["layout"] is None or len(encoded) >= len(data):
+        return None
+    name = patch_name(logical, old["sha256"], entry["sha256"])
+    atomic_write_bytes(output / name, encoded)
+    return {"from": old["sha256"], "file": name, "bytes": len(encoded)}
+
+
+def publish(sources: dict[str, Path], output: Path, previous: dict, patches: bool) -> tuple[dict, dict]:
+    """Write hashed copies; return the manifest entries and per-asset status."""
+    assets, status = {}, {}
+    for logical, source in sources.items():
+        data = source.read_bytes()
+        entry = describe(logical, data)
+        target = output / entry["file"]
+        if not target.exists():
+            atomic_write_bytes(target, data)
+        old = previous.get(logical)
+        status[logical] = "new" if old is None else "unchanged" if old["sha256"] == entry["sha256"] else "changed"
+        if status[logical] == "unchanged":
+            entry["patches"] = old.get("patches", [])
+        elif status[logical] == "changed" and patches:
+            patch = write_patch(logical, old, entry, data, output)
+            entry["patches"] = [patch] if patch else []
+        assets[logical] = entry
+    return assets, status
+
+
+def prune(output: Path, assets: dict) -> list[Path]:
+    keep = {output / entry["file"] for entry in assets.values()}
+    keep |= {output / patch["file"] for entry in assets.values() for patch in entry.get("patches", [])}
+    removed = []
+    for path in output.rglob("*"):
+        if path.is_file() and _HASHED.search(path.name) and path not in keep:
+            path.unlink()
+            removed.append(path)
+    return removed
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Publish assets under content-hashed names.")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR)
+    parser.add_argument(
+        "--asset", type=Path, action="append",
+        help="Extra asset to publish (repeatable); named relative to --data-dir when inside it",
+    )
+    parser.add_argument("--prune", action="store_true", help="Delete hashed files no longer listed")
+    parser.add_argument("--patches", action="store_true", help="Write delta patches for changed assets")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sources = {}
+    for name in DEFAULT_ASSETS:
+        path = args.data_dir / name
+        if path.exists():
+            sources[name] = path
+        else:
+            print(f"⚠️  Skipping missing {path}")
+    for path in args.asset or []:
+        path = path.resolve()
+        data_dir = args.data_dir.resolve()
+        sources[str(path.relative_to(data_dir)) if path.is_relative_to(data_dir) else path.name] = path
+
+    manifest_path = args.output / MANIFEST_NAME
+    previous = load_json(manifest_path) if manifest_path.exists() else {"version": 0, "assets": {}}
+    assets, status = publish(sources, args.output, previous["assets"], args.patches)
+    removed_names = sorted(set(previous["assets"]) - set(assets))
+    changed = any(s != "unchanged" for s in status.values()) or removed_names
+    manifest = {"version": previous["version"] + 1 if changed else previous["version"], "assets": assets}
+    atomic_write_json(manifest_path, manifest)
+
+    for logical, entry in assets.items():
+        print(f"  {status[logical]:<9} {logical} -> {entry['file']} ({entry['bytes']:,} bytes)")
+        if status[logical] == "changed" and entry.get("patches"):
+            print(f"            patch {entry['patches'][0]['file']} ({entry['patches'][0]['bytes']:,} bytes)")
+    for logical in removed_names:
+        print(f"  removed   {logical}")
+    fetch = sum(
+        assets[n]["patches"][0]["bytes"] if assets[n].get("patches") else assets[n]["bytes"]
+        for n, s in status.items() if s != "unchanged"
+    )
+    total = sum(entry["bytes"] for entry in assets.values())
+    print(
+        f"Manifest v{manifest['version']}: {len(assets)} assets, {total:,} bytes; "
+        f"clients on the previous release fetch {fetch:,} bytes"
+    )
+    if args.prune:
+        removed = prune(args.output, assets)
+        print(f"Pruned {len(removed)} stale hashed files")
+    print(f"Wrote {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
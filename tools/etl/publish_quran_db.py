@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Publish `quran.db` as a read-only, read-optimized distribution file.
+
+Takes the output of `build_quran_db.py` and:
+- adds composite indexes for the reader's hot paths (words of an ayah in
+  position order, ayahs of a surah in order), replacing the single-column
+  indexes they make redundant, and an index on lemmas.root_id for root
+  lookups;
+- runs ANALYZE so the planner has statistics;
+- VACUUMs INTO a fresh file with the chosen page size, so the published file
+  is defragmented and its tables are laid out in rowid order;
+- sets the journal mode and marks the file with `user_version`.
+
+The published file is meant to be opened with
+`file:quran.db?mode=ro&immutable=1` (see `quran_db_client.py`). Immutable
+readers take no locks and never look at a journal. DELETE mode (the default)
+leaves no `-wal`/`-shm` side files to ship; `--journal-mode wal` is kept for
+clients that open the file read-write.
+"""
+import argparse
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+PUBLISH_VERSION = 1
+
+HOT_PATH_INDEXES = (
+    # Reader view: words of an ayah ordered by position.
+    "CREATE INDEX IF NOT EXISTS idx_words_ayah_position ON words(ayah_id, position)",
+    # Surah view: ayahs of a surah in order. The table is keyed by id, so the
+    # index alone answers "which ayah ids belong to surah N".
+    "CREATE INDEX IF NOT EXISTS idx_ayahs_surah_number ON ayahs(surah_id, ayah_number)",
+    # Root lookups (quran_query_server.py): lemmas of a root.
+    "CREATE INDEX IF NOT EXISTS idx_lemmas_root ON lemmas(root_id)",
+)
+REDUNDANT_INDEXES = ("idx_words_ayah", "idx_ayahs_surah")
+
+
+def prepare(conn: sqlite3.Connection) -> None:
+  cur = conn.cursor()
+  for statement in HOT_PATH_INDEXES:
+    cur.execute(statement)
+  for name in REDUNDANT_INDEXES:
+    cur.execute(f"DROP INDEX IF EXISTS {name}")
+  cur.execute("ANALYZE")
+  conn.commit()
+
+
+def publish(source: Path, output: Path, page_size: int, journal_mode: str) -> None:
+  if output.exists():
+    output.unlink()
+  # Work on a scratch copy so the build output is left untouched.
+  with tempfile.TemporaryDirectory(dir=output.parent) as tmp:
+    scratch = Path(tmp) / source.name
+    shutil.copyfile(source, scratch)
+    conn = sqlite3.connect(scratch)
+    prepare(conn)
+    conn.execute(f"PRAGMA page_size = {page_size}")
+    conn.execute("VACUUM INTO ?", (str(output),))
+    conn.close()
+
+  out = sqlite3.connect(output)
+  out.execute(f"PRAGMA journal_mode = {journal_mode}")
+  out.execute(f"PRAGMA user_version = {PUBLISH_VERSION}")
+  check = out.execute("PRAGMA integrity_check").fetchone()[0]
+  out.close()
+  if check != "ok":
+    raise SystemExit(f"Integrity check failed for {output}: {check}")
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Publish a read-only quran.db.")
+  parser.add_argument("--source", type=Path, default=Path("data/quran.db"))
+  parser.add_argument("--output", type=Path, default=Path("data/quran.publish.db"))
+  parser.add_argument(
+      "--page-size",
+      type=int,
+      default=16384,
+      help="Larger pages mean fewer reads per ayah/surah range scan",
+  )
+  parser.add_argument("--journal-mode", choices=["delete", "wal"], default="delete")
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  args.output.parent.mkdir(parents=True, exist_ok=True)
+  publish(args.source, args.output, args.page_size, args.journal_mode)
+  before = args.source.stat().st_size
+  after = args.output.stat().st_size
+  print(f"Published {args.output} ({after:,} bytes, source {before:,} bytes, "
+        f"page size {args.page_size})")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Read-only client for a published `quran.db`.
+
+Opens the file as `file:...?mode=ro&immutable=1`, so no locks or journal
+lookups happen, and memory-maps it (`PRAGMA mmap_size`), so page reads are
+served from the OS page cache without copying. Queries mirror `QuranDao`.
+
+Usage:
+    python3 quran_db_client.py data/quran.publish.db --benchmark
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+
+WORD_COLUMNS = (
+    "words.id, words.ayah_id, words.position, words.text_uthmani, words.text_indopak, "
+    "COALESCE(strings.text, words.translation_en) AS translation_en, "
+    "words.transliteration, words.root_id, words.lemma_id, "
+    "words.audio_start_ms, words.audio_end_ms"
+)
+# Glosses are interned: resolve the selected word translation's string id.
+GLOSS_JOIN = (
+    "LEFT JOIN word_glosses ON word_glosses.word_id = words.id "
+    "AND word_glosses.translation_id = ? "
+    "LEFT JOIN strings ON strings.id = word_glosses.string_id"
+)
+DEFAULT_GLOSS_TRANSLATION = 1
+
+
+def connect_readonly(path: Path, mmap_size: int = DEFAULT_MMAP_SIZE) -> sqlite3.Connection:
+  uri = f"file:{quote(str(path.resolve()))}?mode=ro&immutable=1"
+  conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+  conn.row_factory = sqlite3.Row
+  conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+  conn.execute("PRAGMA query_only = ON")
+  return conn
+
+
+class QuranDbClient:
+  def __init__(
+      self,
+      path: Path,
+      mmap_size: int = DEFAULT_MMAP_SIZE,
+      gloss_translation: int = DEFAULT_GLOSS_TRANSLATION,
+  ):
+    self.conn = connect_readonly(path, mmap_size)
+    self.gloss_translation = gloss_translation
+
+  def close(self) -> None:
+    self.conn.close()
+
+  def surahs(self) -> list[sqlite3.Row]:
+    return self.conn.execute("SELECT * FROM surahs ORDER BY id").fetchall()
+
+  def ayahs_for_surah(self, surah_id: int) -> list[sqlite3.Row]:
+    return self.conn.execute(
+        "SELECT * FROM ayahs WHERE surah_id = ? ORDER BY ayah_number",
+        (surah_id,),
+    ).fetchall()
+
+  def translations(self) -> list[sqlite3.Row]:
+    return self.conn.execute("SELECT * FROM translations ORDER BY id").fetchall()
+
+  def words_for_ayah(self, ayah_id: int) -> list[sqlite3.Row]:
+    return self.conn.execute(
+        f"SELECT {WORD_COLUMNS} FROM words {GLOSS_JOIN} "
+        "WHERE words.ayah_id = ? ORDER BY words.position",
+        (self.gloss_translation, ayah_id),
+    ).fetchall()
+
+  def words_for_surah(self, surah_id: int) -> list[sqlite3.Row]:
+    """All words of a surah in reading order, as the reader view renders them."""
+    return self.conn.execute(
+        f"""
+        SELECT {WORD_COLUMNS}
+        FROM ayahs
+        JOIN words ON words.ayah_id = ayahs.id
+        {GLOSS_JOIN}
+        WHERE ayahs.surah_id = ?
+        ORDER BY ayahs.ayah_number, words.position
+        """,
+        (self.gloss_translation, surah_id),
+    ).fetchall()
+
+  def explain(self, sql: str, params: tuple) -> str:
+    return " | ".join(row[-1] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float]:
+  ordered = sorted(samples)
+  p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+  return statistics.median(ordered), p99
+
+
+def benchmark(path: Path, iterations: int, mmap_size: int) -> None:
+  client = QuranDbClient(path, mmap_size)
+  surah_ids = [row["id"] for row in client.surahs()]
+  ayah_ids = [row[0] for row in client.conn.execute("SELECT id FROM ayahs")]
+  rng = random.Random(0)
+
+  cases = {
+      "ayahs_for_surah": lambda: client.ayahs_for_surah(rng.choice(surah_ids)),
+      "words_for_ayah": lambda: client.words_for_ayah(rng.choice(ayah_ids)),
+      "words_for_surah": lambda: client.words_for_surah(rng.choice(surah_ids)),
+  }
+  print(f"{path} (mmap_size={mmap_size:,})")
+  for name, run in cases.items():
+    run()
+    samples = []
+    for _ in range(iterations):
+      started = time.perf_counter()
+      run()
+      samples.append((time.perf_counter() - started) * 1e6)
+    p50, p99 = _percentiles(samples)
+    print(f"  {name:<16} p50 {p50:8.1f} us   p99 {p99:8.1f} us")
+  print("  plan words_for_ayah: " + client.explain(
+      f"SELECT {WORD_COLUMNS} FROM words {GLOSS_JOIN} "
+      "WHERE words.ayah_id = ? ORDER BY words.position", (1, 1)))
+  client.close()
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Query a published quran.db read-only.")
+  parser.add_argument("db", type=Path, nargs="?", default=Path("data/quran.publish.db"))
+  parser.add_argument("--benchmark", action="store_true")
+  parser.add_argument("--iterations", type=int, default=2000)
+  parser.add_argument("--mmap-size", type=int, default=DEFAULT_MMAP_SIZE)
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  if args.benchmark:
+    benchmark(args.db, args.iterations, args.mmap_size)
+    return
+  client = QuranDbClient(args.db, args.mmap_size)
+  surahs = client.surahs()
+  ayahs = client.conn.execute("SELECT COUNT(*) FROM ayahs").fetchone()[0]
+  words = client.conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+  print(f"{args.db}: {len(surahs)} surahs, {ayahs} ayahs, {words} words")
+  client.close()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""Read-only HTTP query service over quran.db.
+
+Serves the output of build_quran_db.py (or publish_quran_db.py) as JSON for
+non-web clients and internal tools:
+
+    GET /surahs                         all surahs
+    GET /surahs/2                       one surah with its ayahs
+    GET /ayahs/2:255  /ayahs/2:1-5      ayahs of one surah; `?words=1` adds words
+    GET /words/2:255  /words/2:1-5      word-by-word, grouped by verse
+    GET /roots/12  /roots/ر ح م          a root, its lemmas and the verses using it
+    GET /search?q=rahmaan               fuzzy word search plus root meanings
+    GET /_stats                         pool and cache counters (never cached)
+
+Each connection in the pool is a `QuranDbClient` (immutable, memory-mapped,
+query-only). A request borrows one for its queries and returns it. The pool
+is LIFO, so recently used connections, with their pages and statements still
+warm, are handed out first. Every query is a constant SQL string with `?`
+parameters, so sqlite3's per-connection statement cache prepares it once per
+connection. Lists of ids are passed as one JSON parameter (`json_each(?)`)
+rather than a variable number of `?` for the same reason.
+
+A root's verses come from the ayah posting lists of root_index.py when
+`term_postings` exists. Frequent roots then cost a slice of an already
+decoded list instead of a GROUP BY over thousands of words.
+
+Bodies are cached in an LRU keyed by path and sorted query string. The
+database is immutable, so cached bodies never go stale. Each body has an
+ETag: a hash of the body prefixed with the database's size and mtime. A
+request whose `If-None-Match` matches gets `304 Not Modified` with no body.
+`--cache-entries 0` turns the cache off; ETags are then still sent.
+
+Fuzzy search needs the tables built by fuzzy_index.py; without them
+`/search` returns only root meanings.
+
+Usage:
+    python3 quran_query_server.py data/quran.db
+    python3 quran_query_server.py data/quran.publish.db --port 8765 --pool-size 8
+    python3 bench_query_server.py data/quran.db        # load test
+"""
+import argparse
+import hashlib
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from fuzzy_index import FuzzyIndex
+from root_index import RootIndex
+from quran_db_client import DEFAULT_MMAP_SIZE, GLOSS_JOIN, WORD_COLUMNS, QuranDbClient
+
+DEFAULT_PORT = 8765
+DEFAULT_POOL_SIZE = os.cpu_count() or 4
+DEFAULT_CACHE_ENTRIES = 4096
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 500
+# Largest integer SQLite binds; bigger ids overflow in sqlite3.
+MAX_ID = 2**63 - 1
+
+SURAH_SQL = "SELECT * FROM surahs WHERE id = ?"
+AYAH_RANGE_SQL = (
+    "SELECT * FROM ayahs WHERE surah_id = ? AND ayah_number BETWEEN ? AND ? "
+    "ORDER BY ayah_number"
+)
+WORD_RANGE_SQL = f"""
+    SELECT ayahs.ayah_number, {WORD_COLUMNS}
+    FROM ayahs
+    JOIN words ON words.ayah_id = ayahs.id
+    {GLOSS_JOIN}
+    WHERE ayahs.surah_id = ? AND ayahs.ayah_number BETWEEN ? AND ?
+    ORDER BY ayahs.ayah_number, words.position
+"""
+WORDS_BY_ID_SQL = f"""
+    SELECT ayahs.surah_id, ayahs.ayah_number, {WORD_COLUMNS}
+    FROM words
+    JOIN ayahs ON ayahs.id = words.ayah_id
+    {GLOSS_JOIN}
+    WHERE words.id IN (SELECT value FROM json_each(?))
+    ORDER BY words.id
+"""
+ROOT_BY_ID_SQL = "SELECT * FROM roots WHERE id = ?"
+ROOT_BY_TEXT_SQL = "SELECT * FROM roots WHERE root_text = ?"
+ROOT_LEMMAS_SQL = "SELECT * FROM lemmas WHERE root_id = ? ORDER BY frequency_rank, id"
+ROOT_VERSES_SQL = """
+    SELECT ayahs.surah_id, ayahs.ayah_number, COUNT(*) AS occurrences
+    FROM words
+    JOIN ayahs ON ayahs.id = words.ayah_id
+    WHERE words.root_id = ?
+    GROUP BY words.ayah_id
+    ORDER BY words.ayah_id
+    LIMIT ?
+"""
+ROOT_MEANING_SQL = (
+    "SELECT * FROM roots "
+    "WHERE meaning_short LIKE ? ESCAPE '\\' OR meaning_long LIKE ? ESCAPE '\\' "
+    "ORDER BY frequency_count DESC LIMIT ?"
+)
+
+_VERSES = re.compile(r"(\d+):(\d+)(?:-(\d+))?")
+
+
+class NotFound(Exception):
+  pass
+
+
+class BadRequest(Exception):
+  pass
+
+
+class ConnectionPool:
+  """A fixed set of read-only clients, borrowed one per request."""
+
+  def __init__(self, path: Path, size: int, mmap_size: int = DEFAULT_MMAP_SIZE):
+    self.size = size
+    self._idle: queue.LifoQueue[QuranDbClient] = queue.LifoQueue()
+    for _ in range(size):
+      self._idle.put(QuranDbClient(path, mmap_size))
+
+  @contextmanager
+  def client(self):
+    client = self._idle.get()
+    try:
+      yield client
+    finally:
+      self._idle.put(client)
+
+  def close(self) -> None:
+    for _ in range(self.size):
+      self._idle.get().close()
+
+
+class ResponseCache:
+  """LRU of (etag, body) by request key, safe to share between threads."""
+
+  def __init__(self, max_entries: int):
+    self.max_entries = max_entries
+    self.hits = self.misses = 0
+    self._entries: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key: str) -> tuple[str, bytes] | None:
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        self.misses += 1
+        return None
+      self._entries.move_to_end(key)
+      self.hits += 1
+      return entry
+
+  def put(self, key: str, entry: tuple[str, bytes]) -> None:
+    if not self.max_entries:
+      return
+    with self._lock:
+      self._entries[key] = entry
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+
+  def stats(self) -> dict:
+    with self._lock:
+      return {
+          "entries": len(self._entries),
+          "max_entries": self.max_entries,
+          "hits": self.hits,
+          "misses": self.misses,
+      }
+
+
+def _int(params: dict, name: str, default: int) -> int:
+  try:
+    value = int(params.get(name, default))
+  except ValueError:
+    raise BadRequest(f"{name} must be an integer") from None
+  return max(1, min(value, MAX_LIMIT))
+
+
+def _id(text: str) -> int:
+  value = int(text)
+  if value > MAX_ID:
+    raise BadRequest(f"id out of range: {text}")
+  return value
+
+
+def parse_verses(spec: str) -> tuple[int, int, int]:
+  """`2:255` or `2:1-5` -> (surah, first ayah, last ayah)."""
+  match = _VERSES.fullmatch(spec)
+  if not match:
+    raise BadRequest(f"expected surah:ayah or surah:first-last, got {spec!r}")
+  surah, first = _id(match[1]), _id(match[2])
+  last = _id(match[3]) if match[3] else first
+  if last < first:
+    raise BadRequest(f"empty range {spec!r}")
+  return surah, first, last
+
+
+def like_escape(text: str) -> str:
+  """Escape LIKE wildcards so the query matches literally (with ESCAPE '\\')."""
+  return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def rows(cursor: sqlite3.Cursor) -> list[dict]:
+  return [dict(row) for row in cursor]
+
+
+class QueryService:
+  """Endpoint logic, independent of HTTP."""
+
+  def __init__(
+      self,
+      pool: ConnectionPool,
+      fuzzy: FuzzyIndex | None = None,
+      roots: RootIndex | None = None,
+      verse_keys: dict[int, str] | None = None,
+  ):
+    self.pool = pool
+    self.fuzzy = fuzzy
+    self.roots = roots
+    self.verse_keys = verse_keys or {}
+
+  def handle(self, path: str, params: dict) -> dict | list:
+    parts = [unquote(p) for p in path.strip("/").split("/")]
+    with self.pool.client() as client:
+      conn, gloss = client.conn, client.gloss_translation
+      if parts == ["surahs"]:
+        return rows(conn.execute("SELECT * FROM surahs ORDER BY id"))
+      if len(parts) == 2 and parts[0] == "surahs" and parts[1].isdecimal():
+        return self.surah(conn, _id(parts[1]))
+      if len(parts) == 2 and parts[0] == "ayahs":
+        return self.ayahs(conn, gloss, *parse_verses(parts[1]), words=params.get("words") == "1")
+      if len(parts) == 2 and parts[0] == "words":
+        return self.words(conn, gloss, *parse_verses(parts[1]))
+      if len(parts) == 2 and parts[0] == "roots":
+        return self.root(conn, parts[1], _int(params, "limit", DEFAULT_LIMIT))
+      if parts == ["search"]:
+        return self.search(conn, gloss, params)
+    raise NotFound(path)
+
+  def surah(self, conn: sqlite3.Connection, surah_id: int) -> dict:
+    surah = conn.execute(SURAH_SQL, (surah_id,)).fetchone()
+    if surah is None:
+      raise NotFound(f"surah {surah_id}")
+    return {**dict(surah), "ayahs": rows(conn.execute(AYAH_RANGE_SQL, (surah_id, 1, surah["verse_count"])))}
+
+  def ayahs(
+      self, conn: sqlite3.Connection, gloss: int, surah: int, first: int, last: int, words: bool
+  ) -> list[dict]:
+    ayahs = rows(conn.execute(AYAH_RANGE_SQL, (surah, first, last)))
+    if not ayahs:
+      raise NotFound(f"verses {surah}:{first}-{last}")
+    if words:
+      by_verse = {verse["ayah_number"]: verse["words"] for verse in self.words(conn, gloss, surah, first, last)}
+      for ayah in ayahs:
+        ayah["words"] = by_verse.get(ayah["ayah_number"], [])
+    return ayahs
+
+  def words(self, conn: sqlite3.Connection, gloss: int, surah: int, first: int, last: int) -> list[dict]:
+    verses: list[dict] = []
+    for row in conn.execute(WORD_RANGE_SQL, (gloss, surah, first, last)):
+      word = dict(row)
+      ayah_number = word.pop("ayah_number")
+      if not verses or verses[-1]["ayah_number"] != ayah_number:
+        verses.append({"surah_id": surah, "ayah_number": ayah_number, "words": []})
+      verses[-1]["words"].append(word)
+    if not verses:
+      raise NotFound(f"verses {surah}:{first}-{last}")
+    return verses
+
+  def root(self, conn: sqlite3.Connection, root: str, limit: int) -> dict:
+    if root.isdecimal():
+      row = conn.execute(ROOT_BY_ID_SQL, (_id(root),)).fetchone()
+    else:
+      # Accept both "ر ح م" and "رحم".
+      row = conn.execute(ROOT_BY_TEXT_SQL, (" ".join(root.replace(" ", "")),)).fetchone()
+    if row is None:
+      raise NotFound(f"root {root}")
+    if self.roots is not None:
+      ayah_ids, counts = self.roots.ayahs(row["id"])
+      verses = [
+          {"verse": self.verse_keys[ayah_id], "occurrences": count}
+          for ayah_id, count in zip(ayah_ids[:limit], counts)
+      ]
+    else:
+      verses = [
+          {"verse": f"{surah}:{ayah}", "occurrences": count}
+          for surah, ayah, count in conn.execute(ROOT_VERSES_SQL, (row["id"], limit))
+      ]
+    return {**dict(row), "lemmas": rows(conn.execute(ROOT_LEMMAS_SQL, (row["id"],))), "verses": verses}
+
+  def search(self, conn: sqlite3.Connection, gloss: int, params: dict) -> dict:
+    query = params.get("q", "").strip()
+    if not query:
+      raise BadRequest("missing q")
+    limit = _int(params, "limit", 10)
+    field = params.get("field")
+    meaning = f"%{like_escape(query)}%"
+    result = {
+        "query": query,
+        "roots": rows(conn.execute(ROOT_MEANING_SQL, (meaning, meaning, limit))),
+        "matches": [],
+    }
+    if self.fuzzy is None:
+      return result
+    words_per_match = _int(params, "words", 5)
+    for match in self.fuzzy.search(query, limit, field=field):
+      ids = match.word_ids[:words_per_match]
+      result["matches"].append({
+          "field": match.field,
+          "term": match.term,
+          "distance": match.distance,
+          "count": match.word_count,
+          "words": rows(conn.execute(WORDS_BY_ID_SQL, (gloss, json.dumps(ids)))),
+      })
+    return result
+
+
+def db_tag(path: Path) -> str:
+  stat = path.stat()
+  return f"{stat.st_size:x}-{int(stat.st_mtime):x}"
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+  protocol_version = "HTTP/1.1"
+  disable_nagle_algorithm = True
+
+  def do_GET(self):
+    url = urlsplit(self.path)
+    params = dict(parse_qsl(url.query))
+    if url.path == "/_stats":
+      self.send_json(200, self.server.stats())
+      return
+
+    key = f"{url.path}?{'&'.join(f'{k}={v}' for k, v in sorted(params.items()))}"
+    cache = self.server.cache
+    entry = cache.get(key)
+    if entry is None:
+      try:
+        body = json.dumps(self.server.service.handle(url.path, params), ensure_ascii=False).encode()
+      except NotFound as exc:
+        self.send_json(404, {"error": f"not found: {exc}"})
+        return
+      except BadRequest as exc:
+        self.send_json(400, {"error": str(exc)})
+        return
+      except Exception as exc:
+        # Keep the connection answering; the client gets JSON, not a dropped socket.
+        self.log_error("%s failed: %s: %s", self.path, type(exc).__name__, exc)
+        self.send_json(500, {"error": "internal error"})
+        return
+      etag = f'"{self.server.db_tag}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+      entry = (etag, body)
+      cache.put(key, entry)
+
+    etag, body = entry
+    if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+      self.send_response(304)
+      self.send_header("ETag", etag)
+      self.send_header("Content-Length", "0")
+      self.end_headers()
+      return
+    self.send_body(200, body, etag)
+
+  def send_json(self, status: int, payload) -> None:
+    self.send_body(status, json.dumps(payload, ensure_ascii=False).encode())
+
+  def send_body(self, status: int, body: bytes, etag: str | None = None) -> None:
+    self.send_response(status)
+    self.send_header("Content-Type", "application/json; charset=utf-8")
+    self.send_header("Content-Length", str(len(body)))
+    if etag:
+      self.send_header("ETag", etag)
+      self.send_header("Cache-Control", "no-cache")
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, format, *args):
+    if self.server.verbose:
+      super().log_message(format, *args)
+
+  def log_error(self, format, *args):
+    # Errors are logged even without --verbose.
+    super().log_message(format, *args)
+
+
+class QueryServer(ThreadingHTTPServer):
+  daemon_threads = True
+
+  def __init__(
+      self,
+      address: tuple[str, int],
+      db: Path,
+      pool_size: int = DEFAULT_POOL_SIZE,
+      cache_entries: int = DEFAULT_CACHE_ENTRIES,
+      mmap_size: int = DEFAULT_MMAP_SIZE,
+      verbose: bool = False,
+  ):
+    super().__init__(address, QueryHandler)
+    self.pool = ConnectionPool(db, pool_size, mmap_size)
+    with self.pool.client() as client:
+      conn = client.conn
+      tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+      fuzzy = FuzzyIndex.from_db(conn) if "search_terms" in tables else None
+      roots = RootIndex.from_db(conn) if "term_postings" in tables else None
+      verse_keys = {
+          ayah_id: f"{surah}:{ayah}"
+          for ayah_id, surah, ayah in conn.execute("SELECT id, surah_id, ayah_number FROM ayahs")
+      }
+    self.service = QueryService(self.pool, fuzzy, roots, verse_keys)
+    self.cache = ResponseCache(cache_entries)
+    self.db_tag = db_tag(db)
+    self.verbose = verbose
+
+  def stats(self) -> dict:
+    return {
+        "pool_size": self.pool.size,
+        "fuzzy_search": self.service.fuzzy is not None,
+        "root_postings": self.service.roots is not None,
+        "cache": self.cache.stats(),
+    }
+
+  def server_close(self) -> None:
+    super().server_close()
+    self.pool.close()
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Serve quran.db read-only over HTTP.")
+  parser.add_argument("db", type=Path, nargs="?", default=Path("data/quran.db"))
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+  parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE)
+  parser.add_argument("--cache-entries", type=int, default=DEFAULT_CACHE_ENTRIES, help="0 disables the cache")
+  parser.add_argument("--mmap-size", type=int, default=DEFAULT_MMAP_SIZE)
+  parser.add_argument("--verbose", action="store_true", help="Log every request")
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  if not args.db.exists():
+    raise SystemExit(f"❌ {args.db} not found; run build_quran_db.py first")
+  server = QueryServer(
+      (args.host, args.port), args.db, args.pool_size, args.cache_entries, args.mmap_size, args.verbose
+  )
+  stats = server.stats()
+  if not stats["fuzzy_search"]:
+    print("⚠️  search_terms missing; /search returns root meanings only (run fuzzy_index.py)")
+  print(f"Serving {args.db} on http://{args.host}:{server.server_port} ({args.pool_size} connections)")
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+
+
+if __name__ == "__main__":
+  main()
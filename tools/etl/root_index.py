@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""Inverted index from roots and lemmas to word and ayah ordinals.
+
+For every root and lemma the index stores two posting lists:
+- word postings: sorted `words.id` values;
+- ayah postings: sorted `ayahs.id` values, each followed by the number of
+  the term's occurrences in that ayah (used to rank results).
+
+Lists are delta-encoded and written as LEB128 varints. Most gaps are small,
+so most entries take one byte. They are stored in the `term_postings` table
+of quran.db and in a standalone binary asset (`root_index.bin`, layout in
+`write_asset`).
+
+`RootIndex` answers AND/OR queries over roots or lemmas. AND intersects the
+ayah lists smallest first with galloping (exponential) search. The cost then
+follows the shortest list, not the longest.
+
+Usage:
+    python3 root_index.py --db data/quran.db                     # build the table
+    python3 root_index.py --db data/quran.db --asset quran_vocab/assets/data/root_index.bin
+    python3 root_index.py --db data/quran.db --query "ر ح م" --query "أ ل ه"
+    python3 root_index.py --db data/quran.db --benchmark
+"""
+import argparse
+import struct
+import sqlite3
+import time
+from bisect import bisect_left
+from collections.abc import Iterable
+from itertools import groupby
+from pathlib import Path
+
+from asset_io import atomic_write_bytes
+
+KINDS = ("root", "lemma")
+
+POSTINGS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS term_postings (
+  kind TEXT NOT NULL CHECK (kind IN ('root', 'lemma')),
+  term_id INTEGER NOT NULL,
+  word_count INTEGER NOT NULL,
+  ayah_count INTEGER NOT NULL,
+  word_postings BLOB NOT NULL,
+  ayah_postings BLOB NOT NULL,
+  PRIMARY KEY (kind, term_id)
+) WITHOUT ROWID;
+"""
+
+ASSET_MAGIC = b"QRIX"
+ASSET_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+# kind, term_id, word_count, ayah_count, word offset/length, ayah offset/length
+_ENTRY = struct.Struct("<BIIIIIII")
+
+
+# --- Varint coding ----------------------------------------------------------
+
+
+def encode_varints(values: Iterable[int]) -> bytes:
+  out = bytearray()
+  for value in values:
+    while value >= 0x80:
+      out.append((value & 0x7F) | 0x80)
+      value >>= 7
+    out.append(value)
+  return bytes(out)
+
+
+def decode_varints(data: bytes) -> list[int]:
+  values = []
+  value = shift = 0
+  for byte in data:
+    value |= (byte & 0x7F) << shift
+    if byte & 0x80:
+      shift += 7
+    else:
+      values.append(value)
+      value = shift = 0
+  return values
+
+
+def encode_postings(ids: list[int]) -> bytes:
+  """Delta-encode sorted ids."""
+  previous = 0
+  deltas = []
+  for value in ids:
+    deltas.append(value - previous)
+    previous = value
+  return encode_varints(deltas)
+
+
+def decode_postings(data: bytes) -> list[int]:
+  ids = []
+  total = 0
+  for delta in decode_varints(data):
+    total += delta
+    ids.append(total)
+  return ids
+
+
+def encode_ayah_postings(ayahs: list[tuple[int, int]]) -> bytes:
+  """Delta-encode sorted (ayah_id, count) pairs as interleaved varints."""
+  previous = 0
+  values = []
+  for ayah_id, count in ayahs:
+    values.append(ayah_id - previous)
+    values.append(count)
+    previous = ayah_id
+  return encode_varints(values)
+
+
+def decode_ayah_postings(data: bytes) -> tuple[list[int], list[int]]:
+  raw = decode_varints(data)
+  ids = []
+  total = 0
+  for delta in raw[0::2]:
+    total += delta
+    ids.append(total)
+  return ids, raw[1::2]
+
+
+# --- Build ------------------------------------------------------------------
+
+
+def iter_postings(conn: sqlite3.Connection, kind: str):
+  """Yield (term_id, word_ids, [(ayah_id, count)]) in one ordered scan."""
+  column = f"{kind}_id"
+  rows = conn.execute(
+      f"SELECT {column}, id, ayah_id FROM words WHERE {column} IS NOT NULL ORDER BY {column}, id"
+  )
+  for term_id, group in groupby(rows, key=lambda row: row[0]):
+    word_ids = []
+    ayahs: list[list[int]] = []
+    for _, word_id, ayah_id in group:
+      word_ids.append(word_id)
+      if ayahs and ayahs[-1][0] == ayah_id:
+        ayahs[-1][1] += 1
+      else:
+        ayahs.append([ayah_id, 1])
+    yield term_id, word_ids, [(a, c) for a, c in ayahs]
+
+
+def build_postings(conn: sqlite3.Connection) -> dict[str, int]:
+  """(Re)build `term_postings` from words.root_id/lemma_id."""
+  conn.executescript(POSTINGS_SCHEMA)
+  conn.execute("DELETE FROM term_postings")
+  counts = {}
+  for kind in KINDS:
+    rows = [
+        (
+            kind,
+            term_id,
+            len(word_ids),
+            len(ayahs),
+            encode_postings(word_ids),
+            encode_ayah_postings(ayahs),
+        )
+        for term_id, word_ids, ayahs in iter_postings(conn, kind)
+    ]
+    conn.executemany("INSERT INTO term_postings VALUES (?, ?, ?, ?, ?, ?)", rows)
+    counts[kind] = len(rows)
+  conn.commit()
+  return counts
+
+
+def write_asset(conn: sqlite3.Connection, path: Path) -> int:
+  """Write `term_postings` as a binary asset.
+
+  Layout (little endian): header `QRIX`, u16 version, u32 entry count; one
+  fixed-size directory entry per term (u8 kind 0=root 1=lemma, u32 term id,
+  u32 word count, u32 ayah count, u32 offset + u32 length of the word list,
+  u32 offset + u32 length of the ayah list, offsets relative to the data
+  section); then the data section with all posting lists back to back.
+  """
+  rows = conn.execute(
+      "SELECT kind, term_id, word_count, ayah_count, word_postings, ayah_postings "
+      "FROM term_postings ORDER BY kind DESC, term_id"
+  ).fetchall()
+  directory = bytearray()
+  data = bytearray()
+  for kind, term_id, word_count, ayah_count, words, ayahs in rows:
+    word_offset = len(data)
+    data += words
+    ayah_offset = len(data)
+    data += ayahs
+    directory += _ENTRY.pack(
+        KINDS.index(kind), term_id, word_count, ayah_count,
+        word_offset, len(words), ayah_offset, len(ayahs),
+    )
+  payload = _HEADER.pack(ASSET_MAGIC, ASSET_VERSION, len(rows)) + directory + data
+  atomic_write_bytes(path, payload)
+  return len(payload)
+
+
+# --- Query ------------------------------------------------------------------
+
+
+def intersect(lists: list[list[int]]) -> list[int]:
+  """Intersect sorted lists, galloping through the longer ones.
+
+  Each candidate from the shorter list probes the longer list at 1, 2, 4, ...
+  positions ahead of the previous match and then bisects inside the last
+  step. The work is O(m log(n / m)) for lists of length m <= n.
+  """
+  if not lists:
+    return []
+  ordered = sorted(lists, key=len)
+  result = ordered[0]
+  for other in ordered[1:]:
+    n = len(other)
+    matched = []
+    position = 0
+    for value in result:
+      if position < n and other[position] < value:
+        step = 1
+        low = high = position + 1
+        while high < n and other[high] < value:
+          low = high + 1
+          step <<= 1
+          high = low + step
+        position = bisect_left(other, value, low, high + 1 if high < n else n)
+      if position == n:
+        break
+      if other[position] == value:
+        matched.append(value)
+        position += 1
+    result = matched
+    if not result:
+      break
+  return result
+
+
+class RootIndex:
+  """Posting lists loaded lazily from quran.db or from the binary asset."""
+
+  def __init__(self, blobs: dict[tuple[str, int], tuple[bytes, bytes]], terms: dict[tuple[str, str], int]):
+    self._blobs = blobs
+    self._terms = terms
+    self._ayahs: dict[tuple[str, int], tuple[list[int], list[int]]] = {}
+
+  @classmethod
+  def from_db(cls, conn: sqlite3.Connection) -> "RootIndex":
+    blobs = {
+        (kind, term_id): (words, ayahs)
+        for kind, term_id, words, ayahs in conn.execute(
+            "SELECT kind, term_id, word_postings, ayah_postings FROM term_postings"
+        )
+    }
+    return cls(blobs, _term_names(conn))
+
+  @classmethod
+  def from_asset(cls, path: Path, conn: sqlite3.Connection | None = None) -> "RootIndex":
+    payload = path.read_bytes()
+    magic, version, count = _HEADER.unpack_from(payload)
+    if magic != ASSET_MAGIC or version != ASSET_VERSION:
+      raise ValueError(f"{path} is not a version {ASSET_VERSION} root index")
+    base = _HEADER.size + count * _ENTRY.size
+    blobs = {}
+    for kind, term_id, _, _, w_off, w_len, a_off, a_len in _ENTRY.iter_unpack(
+        payload[_HEADER.size:base]
+    ):
+      blobs[(KINDS[kind], term_id)] = (
+          payload[base + w_off:base + w_off + w_len],
+          payload[base + a_off:base + a_off + a_len],
+      )
+    return cls(blobs, _term_names(conn) if conn else {})
+
+  def term_id(self, term: str | int, kind: str = "root") -> int:
+    if isinstance(term, int):
+      return term
+    try:
+      return self._terms[(kind, term)]
+    except KeyError:
+      raise KeyError(f"Unknown {kind}: {term}") from None
+
+  def words(self, term: str | int, kind: str = "root") -> list[int]:
+    blob = self._blobs.get((kind, self.term_id(term, kind)))
+    return decode_postings(blob[0]) if blob else []
+
+  def ayahs(self, term: str | int, kind: str = "root") -> tuple[list[int], list[int]]:
+    """(ayah ids, occurrence counts) for one term."""
+    key = (kind, self.term_id(term, kind))
+    if key not in self._ayahs:
+      blob = self._blobs.get(key)
+      self._ayahs[key] = decode_ayah_postings(blob[1]) if blob else ([], [])
+    return self._ayahs[key]
+
+  def query_and(self, terms: list, kind: str = "root") -> list[tuple[int, int]]:
+    """Ayahs containing every term, ranked by total occurrences."""
+    postings = [self.ayahs(t, kind) for t in terms]
+    matched = intersect([ids for ids, _ in postings])
+    return _rank(matched, postings)
+
+  def query_or(self, terms: list, kind: str = "root") -> list[tuple[int, int]]:
+    """Ayahs containing any term, ranked by total occurrences."""
+    postings = [self.ayahs(t, kind) for t in terms]
+    totals: dict[int, int] = {}
+    for ids, counts in postings:
+      for ayah_id, count in zip(ids, counts):
+        totals[ayah_id] = totals.get(ayah_id, 0) + count
+    return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _rank(ayah_ids: list[int], postings: list[tuple[list[int], list[int]]]) -> list[tuple[int, int]]:
+  scores = []
+  # ayah_ids is sorted, so each list is searched from the previous hit.
+  positions = [0] * len(postings)
+  for ayah_id in ayah_ids:
+    total = 0
+    for i, (ids, counts) in enumerate(postings):
+      positions[i] = bisect_left(ids, ayah_id, positions[i])
+      total += counts[positions[i]]
+    scores.append((ayah_id, total))
+  scores.sort(key=lambda item: (-item[1], item[0]))
+  return scores
+
+
+def _term_names(conn: sqlite3.Connection) -> dict[tuple[str, str], int]:
+  names = {("root", text): root_id for root_id, text in conn.execute("SELECT id, root_text FROM roots")}
+  names.update(
+      {("lemma", text): lemma_id for lemma_id, text in conn.execute("SELECT id, lemma_text FROM lemmas")}
+  )
+  return names
+
+
+# --- Benchmark --------------------------------------------------------------
+
+
+def _best_us(fn, repeat: int = 20) -> float:
+  best = float("inf")
+  for _ in range(repeat):
+    started = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - started)
+  return best * 1e6
+
+
+def benchmark(conn: sqlite3.Connection) -> None:
+  top = conn.execute(
+      "SELECT term_id, word_count, ayah_count, length(word_postings), length(ayah_postings) "
+      "FROM term_postings WHERE kind = 'root' ORDER BY word_count DESC LIMIT 5"
+  ).fetchall()
+  if not top:
+    raise SystemExit("term_postings is empty; is words.root_id filled?")
+  names = dict(conn.execute("SELECT id, root_text FROM roots"))
+  print("Largest root posting lists:")
+  for term_id, words, ayahs, word_bytes, ayah_bytes in top:
+    print(f"  {names.get(term_id, term_id):<8} {words:>6,} words ({word_bytes:,} B, "
+          f"{word_bytes / words:.2f} B/entry)  {ayahs:>5,} ayahs ({ayah_bytes:,} B)")
+
+  index = RootIndex.from_db(conn)
+  ids = [row[0] for row in top]
+
+  def decode_all():
+    index._ayahs.clear()
+    for term_id in ids:
+      index.ayahs(term_id)
+
+  def sets_and(terms):
+    result = set(index.ayahs(terms[0])[0])
+    for term in terms[1:]:
+      result &= set(index.ayahs(term)[0])
+    return result
+
+  def sql_and(terms):
+    sql = " INTERSECT ".join(["SELECT ayah_id FROM words WHERE root_id = ?"] * len(terms))
+    return conn.execute(sql, terms).fetchall()
+
+  print(f"  decode {len(ids)} lists: {_best_us(decode_all):,.0f} us")
+  decode_all()
+  rare = conn.execute(
+      "SELECT term_id FROM term_postings WHERE kind = 'root' AND ayah_count >= 10 "
+      "ORDER BY ayah_count LIMIT 1"
+  ).fetchone()
+  cases = [ids[:2], ids[:3], ids[:5]] + ([[ids[0], rare[0]]] if rare else [])
+  for terms in cases:
+    label = " & ".join(str(names.get(t, t)) for t in terms)
+    matched = index.query_and(terms)
+    assert {a for a, _ in matched} == sets_and(terms)
+    sizes = "/".join(f"{len(index.ayahs(t)[0]):,}" for t in terms)
+    print(f"  AND {label} ({sizes} ayahs): {len(matched):,} ayahs")
+    print(f"    galloping {_best_us(lambda: intersect([index.ayahs(t)[0] for t in terms])):>9,.0f} us   "
+          f"ranked {_best_us(lambda: index.query_and(terms)):>9,.0f} us   "
+          f"set {_best_us(lambda: sets_and(terms)):>9,.0f} us   "
+          f"SQL {_best_us(lambda: sql_and(terms), repeat=5):>9,.0f} us")
+  terms = ids[:3]
+  print(f"  OR top 3: {len(index.query_or(terms)):,} ayahs in "
+        f"{_best_us(lambda: index.query_or(terms)):,.0f} us")
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Root/lemma inverted index.")
+  parser.add_argument("--db", type=Path, default=Path("data/quran.db"))
+  parser.add_argument("--asset", type=Path, help="Also write the binary asset")
+  parser.add_argument("--query", action="append", default=[], help="Root (or lemma) text; repeatable")
+  parser.add_argument("--kind", choices=KINDS, default="root")
+  parser.add_argument("--any", action="store_true", help="OR the query terms instead of AND")
+  parser.add_argument("--limit", type=int, default=10)
+  parser.add_argument("--benchmark", action="store_true")
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  conn = sqlite3.connect(args.db)
+  if args.query:
+    index = RootIndex.from_db(conn)
+    ranked = index.query_or(args.query, args.kind) if args.any else index.query_and(args.query, args.kind)
+    print(f"{len(ranked):,} ayahs")
+    for ayah_id, score in ranked[:args.limit]:
+      surah, ayah = conn.execute(
+          "SELECT surah_id, ayah_number FROM ayahs WHERE id = ?", (ayah_id,)
+      ).fetchone()
+      print(f"  {surah}:{ayah}  ({score} occurrences)")
+  elif args.benchmark:
+    benchmark(conn)
+  else:
+    started = time.perf_counter()
+    counts = build_postings(conn)
+    print(f"Indexed {counts['root']:,} roots and {counts['lemma']:,} lemmas "
+          f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+    if args.asset:
+      size = write_asset(conn, args.asset)
+      print(f"Wrote {args.asset} ({size:,} bytes)")
+  conn.close()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Subset the bundled Arabic fonts to the codepoints the Quran text uses.
+
+Scans the Arabic text of ayahs_full.json and words_full.json (Uthmani and
+IndoPak) and collects the codepoint set for the whole corpus and for each
+surah. A base set is added to every subset: codepoints the UI draws around
+the text (ayah end marks, ornate parentheses, Arabic-Indic digits, ZWJ/ZWNJ
+and space) and the Arabic UI strings (surah names from surahs.json, root
+letters from roots.json), so the surah list and root pages render whichever
+subset is loaded. Every bundled font is then subset with fontTools once for
+the base set alone, once for the whole corpus and once per surah. All
+OpenType layout features are kept, and the subsetter follows GSUB
+substitutions, so contextual forms, ligatures and mark positioning still
+shape. Graphite tables are dropped: Flutter and browsers shape with
+OpenType. With `--woff2` the files are Brotli-compressed WOFF2 for the web
+build.
+
+Files are named by a hash of the source font's bytes and the codepoints they
+cover, counting only codepoints the font has (`Lateef-Regular.3f2a9c1e.woff2`).
+Surahs that need the same glyphs share one file, and a changed subset or an
+updated font gets a new name. Files from earlier runs of the processed fonts
+that the new manifest does not list are deleted. `manifest.json` maps the
+corpus and each surah to a file, with sizes and codepoint counts, and lists
+the codepoints each font lacks. Only the entries of the processed fonts are
+replaced, so `--font` keeps the other fonts' entries. The summary
+shows how many bytes a reader needs for one surah compared with the full
+font.
+
+Requires fontTools (and brotli for `--woff2`):
+
+    pip install fonttools brotli
+
+Usage:
+    python3 subset_fonts.py
+    python3 subset_fonts.py --woff2 --output quran_vocab/web/fonts
+    python3 subset_fonts.py --font quran_vocab/assets/fonts/Lateef-Regular.ttf --global-only
+"""
+import argparse
+import hashlib
+import json
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from fontTools import subset
+from fontTools.ttLib import TTFont
+
+from asset_io import atomic_write_json, load_json
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "quran_vocab" / "assets" / "data"
+FONTS_DIR = ROOT / "quran_vocab" / "assets" / "fonts"
+OUTPUT_DIR = FONTS_DIR / "subset"
+TEXT_FIELDS = ("text_uthmani", "text_indopak")
+# Arabic strings the UI shows outside the Quran text: (asset, field).
+UI_FIELDS = (("surahs.json", "name_arabic"), ("roots.json", "root_text"))
+GRAPHITE_TABLES = ["Silf", "Silt", "Glat", "Gloc", "Feat", "Sill"]
+
+# Drawn by the reader around or between verses, whatever the text contains.
+ALWAYS_KEEP = (
+    {0x20, 0x200C, 0x200D, 0x06DD, 0x06DE, 0xFD3E, 0xFD3F}
+    | set(range(0x0660, 0x066A))  # Arabic-Indic digits
+    | set(range(0x06F0, 0x06FA))  # Extended Arabic-Indic digits
+)
+
+
+def collect_codepoints(records: list[dict], into: dict[int, set[int]]) -> None:
+    for record in records:
+        used = into.setdefault(record["surah_id"], set())
+        for field in TEXT_FIELDS:
+            used.update(map(ord, record.get(field) or ""))
+
+
+def base_codepoints(data_dir: Path) -> set[int]:
+    """ALWAYS_KEEP plus the codepoints of the Arabic UI strings."""
+    base = set(ALWAYS_KEEP)
+    for name, field in UI_FIELDS:
+        path = data_dir / name
+        if not path.exists():
+            print(f"⚠️  {path} not found; its {field} strings are not in the base subset")
+            continue
+        for record in json.loads(path.read_text(encoding="utf-8")):
+            base.update(map(ord, record.get(field) or ""))
+    return base
+
+
+def codepoints_by_surah(paths: list[Path], base: set[int]) -> dict[int, set[int]]:
+    by_surah: dict[int, set[int]] = {}
+    for path in paths:
+        if path.exists():
+            collect_codepoints(json.loads(path.read_text(encoding="utf-8")), by_surah)
+    # Line breaks and BOMs never reach a glyph.
+    for used in by_surah.values():
+        used.difference_update({0x0A, 0x0D, 0xFEFF})
+        used.update(base)
+    return by_surah
+
+
+def subset_font(source: Path, codepoints: list[int], destination: Path, woff2: bool) -> int:
+    options = subset.Options()
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    options.name_languages = ["*"]
+    options.notdef_outline = True
+    options.glyph_names = False
+    options.hinting = False
+    options.flavor = "woff2" if woff2 else None
+    options.drop_tables += GRAPHITE_TABLES
+    font = TTFont(source)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    font.flavor = options.flavor
+    font.save(destination)
+    return destination.stat().st_size
+
+
+def _subset_job(job: tuple[Path, list[int], Path, bool]) -> int:
+    return subset_font(*job)
+
+
+def subset_name(stem: str, font_digest: str, codepoints: set[int], extension: str) -> str:
+    key = f"{font_digest}:{','.join(map(str, sorted(codepoints)))}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:8]
+    return f"{stem}.{digest}.{extension}"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Subset Arabic fonts to the Quran text.")
+    parser.add_argument("--ayahs", type=Path, default=DATA_DIR / "ayahs_full.json")
+    parser.add_argument("--words", type=Path, default=DATA_DIR / "words_full.json")
+    parser.add_argument(
+        "--data-dir", type=Path, default=DATA_DIR,
+        help="Directory with surahs.json and roots.json for the base subset",
+    )
+    parser.add_argument(
+        "--font", type=Path, action="append",
+        help="Font to subset (repeatable; default: every .ttf in assets/fonts)",
+    )
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--woff2", action="store_true", help="Write WOFF2 instead of TTF")
+    parser.add_argument("--global-only", action="store_true", help="Skip per-surah subsets")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    fonts = args.font or sorted(FONTS_DIR.glob("*.ttf"))
+    base = base_codepoints(args.data_dir)
+    by_surah = codepoints_by_surah([args.ayahs, args.words], base)
+    if not by_surah:
+        raise SystemExit(f"No text found in {args.ayahs} or {args.words}")
+    everything = set().union(*by_surah.values())
+    extension = "woff2" if args.woff2 else "ttf"
+
+    started = time.perf_counter()
+    jobs: dict[str, tuple[Path, list[int], Path, bool]] = {}
+    manifest_path = args.output / "manifest.json"
+    manifest = load_json(manifest_path) if manifest_path.exists() else None
+    if manifest is None or manifest.get("format") != extension:
+        if manifest is not None:
+            print(f"⚠️  {manifest_path} lists {manifest.get('format')} subsets; starting a new {extension} manifest")
+        manifest = {"format": extension, "fonts": {}}
+    stems = [font_path.stem for font_path in fonts]
+    for font_path in fonts:
+        cmap = set(TTFont(font_path).getBestCmap())
+        font_digest = hashlib.sha1(font_path.read_bytes()).hexdigest()
+
+        def plan(used: set[int]) -> dict:
+            covered = used & cmap
+            name = subset_name(font_path.stem, font_digest, covered, extension)
+            jobs.setdefault(name, (font_path, sorted(covered), args.output / name, args.woff2))
+            return {"file": name, "codepoints": len(covered)}
+
+        manifest["fonts"][font_path.stem] = {
+            "source": font_path.name,
+            "bytes": font_path.stat().st_size,
+            "missing": [f"U+{cp:04X}" for cp in sorted(everything - cmap - ALWAYS_KEEP)],
+            "base": plan(base),
+            "all": plan(everything),
+            "surahs": {} if args.global_only else {
+                str(surah): plan(used) for surah, used in sorted(by_surah.items())
+            },
+        }
+
+    with ProcessPoolExecutor(args.jobs) as pool:
+        sizes = dict(zip(jobs, pool.map(_subset_job, jobs.values())))
+    for entry in (manifest["fonts"][stem] for stem in stems):
+        entry["base"]["bytes"] = sizes[entry["base"]["file"]]
+        entry["all"]["bytes"] = sizes[entry["all"]["file"]]
+        for surah in entry["surahs"].values():
+            surah["bytes"] = sizes[surah["file"]]
+    for font_path in fonts:
+        for stale in args.output.glob(f"{font_path.stem}.*.{extension}"):
+            if stale.name not in jobs:
+                stale.unlink()
+    atomic_write_json(manifest_path, manifest)
+
+    print(f"{len(jobs)} distinct subsets of {len(fonts)} fonts in {time.perf_counter() - started:.1f}s")
+    for stem in stems:
+        entry = manifest["fonts"][stem]
+        original, whole = entry["bytes"], entry["all"]["bytes"]
+        line = (
+            f"  {stem}: {original:,} B -> base {entry['base']['bytes']:,} B, "
+            f"all {whole:,} B ({whole / original:.0%}, {entry['all']['codepoints']} codepoints)"
+        )
+        if entry["surahs"]:
+            per_surah = [s["bytes"] for s in entry["surahs"].values()]
+            median = statistics.median(per_surah)
+            line += f", per surah median {median:,.0f} B ({median / original:.0%}), max {max(per_surah):,} B"
+        print(line)
+        if entry["missing"]:
+            print(f"    not in font: {' '.join(entry['missing'][:12])}{' ...' if len(entry['missing']) > 12 else ''}")
+    print(f"Wrote {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
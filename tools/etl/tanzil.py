@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Reader for Tanzil text exports (`surah|ayah|text`, one verse per line).
+
+Kept apart from build_quran_db.py so that column tools (merge_ayah_columns,
+download_quran_data, download_indopak, validate_quran_text) can parse Tanzil
+files without importing the database build and its dependencies.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class AyahText:
+    surah: int
+    ayah: int
+    text: str
+
+
+def parse_tanzil(path: Path) -> list[AyahText]:
+  data = path.read_text(encoding="utf-8").splitlines()
+  entries: list[AyahText] = []
+  for line in data:
+    if not line.strip():
+      continue
+    surah_str, ayah_str, text = line.split("|", 2)
+    entries.append(
+        AyahText(
+            surah=int(surah_str),
+            ayah=int(ayah_str),
+            text=text.strip(),
+        )
+    )
+  return entries
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Translation registry and interned string storage.
+
+Translations are registered in `translations(id, lang, name, kind)`, where
+kind is `ayah` (one text per ayah) or `word` (one gloss per word). Their texts
+are stored once in `strings` and referenced by id from `ayah_translations` and
+`word_glosses`. Word glosses repeat heavily ("and", "Allah", "the Lord"), so
+each distinct gloss is stored once instead of once per occurrence.
+
+The same layout is used for the JSON asset (`translations.json`):
+
+    {"strings": ["", "and", ...],
+     "translations": [{"id": 1, "lang": "en", "name": "quranwbw", "kind": "word"}],
+     "ayahs": {"2": [string id per ayah, in ayahs_full.json order]},
+     "words": {"1": [string id per word, in words_full.json order]}}
+
+String ids are assigned by descending frequency, so the most common glosses
+get the shortest ids. Id 0 is always the empty string ("no translation").
+
+Usage:
+    python3 translations.py --asset quran_vocab/assets/data/translations.json
+    python3 translations.py --benchmark --translations 6
+"""
+import argparse
+import gzip
+import json
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from asset_io import atomic_write_json, load_json
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "quran_vocab" / "assets" / "data"
+
+TRANSLATION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+  id INTEGER PRIMARY KEY,
+  lang TEXT NOT NULL,
+  name TEXT NOT NULL,
+  kind TEXT NOT NULL CHECK (kind IN ('ayah', 'word')),
+  UNIQUE (kind, lang, name)
+);
+CREATE TABLE IF NOT EXISTS strings (
+  id INTEGER PRIMARY KEY,
+  text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ayah_translations (
+  translation_id INTEGER NOT NULL,
+  ayah_id INTEGER NOT NULL,
+  string_id INTEGER NOT NULL,
+  PRIMARY KEY (translation_id, ayah_id),
+  FOREIGN KEY (translation_id) REFERENCES translations(id) ON DELETE CASCADE,
+  FOREIGN KEY (ayah_id) REFERENCES ayahs(id) ON DELETE CASCADE,
+  FOREIGN KEY (string_id) REFERENCES strings(id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS word_glosses (
+  translation_id INTEGER NOT NULL,
+  word_id INTEGER NOT NULL,
+  string_id INTEGER NOT NULL,
+  PRIMARY KEY (translation_id, word_id),
+  FOREIGN KEY (translation_id) REFERENCES translations(id) ON DELETE CASCADE,
+  FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE,
+  FOREIGN KEY (string_id) REFERENCES strings(id)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class Translation:
+  id: int
+  lang: str
+  name: str
+  kind: str
+  # Texts aligned with ayah ids (kind "ayah") or word ids (kind "word"),
+  # starting at id 1. "" means no translation for that row.
+  texts: list[str] = field(default_factory=list)
+
+  def meta(self) -> dict:
+    return {"id": self.id, "lang": self.lang, "name": self.name, "kind": self.kind}
+
+
+def parse_word_glosses(path: Path) -> dict[tuple[int, int, int], str]:
+  """Read a `surah|ayah|position|gloss` file."""
+  glosses: dict[tuple[int, int, int], str] = {}
+  for line in path.read_text(encoding="utf-8").splitlines():
+    if not line.strip():
+      continue
+    surah, ayah, position, text = line.split("|", 3)
+    glosses[(int(surah), int(ayah), int(position))] = text.strip()
+  return glosses
+
+
+def intern_strings(translations: list[Translation]) -> tuple[list[str], dict[int, list[int]]]:
+  """Build the shared string table and encode every translation against it."""
+  counts = Counter(text for t in translations for text in t.texts if text)
+  strings = [""] + [text for text, _ in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+  ids = {text: index for index, text in enumerate(strings)}
+  encoded = {t.id: [ids[text] for text in t.texts] for t in translations}
+  return strings, encoded
+
+
+def store_translations(conn: sqlite3.Connection, translations: list[Translation]) -> list[str]:
+  """Write the registry, string table and id rows; returns the string table."""
+  strings, encoded = intern_strings(translations)
+  cur = conn.cursor()
+  cur.executemany(
+      "INSERT INTO translations (id, lang, name, kind) VALUES (?, ?, ?, ?)",
+      [(t.id, t.lang, t.name, t.kind) for t in translations],
+  )
+  cur.executemany("INSERT INTO strings (id, text) VALUES (?, ?)", enumerate(strings))
+  for t in translations:
+    table, key = ("ayah_translations", "ayah_id") if t.kind == "ayah" else ("word_glosses", "word_id")
+    cur.executemany(
+        f"INSERT INTO {table} (translation_id, {key}, string_id) VALUES (?, ?, ?)",
+        ((t.id, row_id, sid) for row_id, sid in enumerate(encoded[t.id], start=1) if sid),
+    )
+  conn.commit()
+  return strings
+
+
+def translation_asset(translations: list[Translation]) -> dict:
+  strings, encoded = intern_strings(translations)
+  return {
+      "strings": strings,
+      "translations": [t.meta() for t in translations],
+      "ayahs": {str(t.id): encoded[t.id] for t in translations if t.kind == "ayah"},
+      "words": {str(t.id): encoded[t.id] for t in translations if t.kind == "word"},
+  }
+
+
+def translations_from_assets(ayahs: list[dict], words: list[dict]) -> list[Translation]:
+  """The English translations currently embedded in the JSON assets."""
+  return [
+      Translation(1, "en", "quranwbw", "word", [w.get("translation_en") or "" for w in words]),
+      Translation(2, "en", "sahih", "ayah", [a.get("translation_en") or "" for a in ayahs]),
+  ]
+
+
+# --- Benchmark -------------------------------------------------------------
+
+
+def _variant(translations: list[Translation], count: int) -> list[Translation]:
+  """Derive extra languages with the same repetition structure as English.
+
+  Each derived language maps every distinct English text to a distinct
+  string of similar length. That keeps the gloss frequency distribution,
+  which is what the layouts are sensitive to.
+  """
+  out = list(translations)
+  next_id = max(t.id for t in translations) + 1
+  for n in range(count):
+    for base in translations:
+      tag = f"x{n}"
+      out.append(Translation(
+          next_id, tag, base.name, base.kind,
+          [f"{text[::-1]} {tag}" if text else "" for text in base.texts],
+      ))
+      next_id += 1
+  return out
+
+
+def _naive_db(path: Path, translations: list[Translation]) -> None:
+  conn = sqlite3.connect(path)
+  conn.executescript(
+      """
+      CREATE TABLE ayah_translations (translation_id INTEGER, ayah_id INTEGER, text TEXT,
+        PRIMARY KEY (translation_id, ayah_id)) WITHOUT ROWID;
+      CREATE TABLE word_glosses (translation_id INTEGER, word_id INTEGER, text TEXT,
+        PRIMARY KEY (translation_id, word_id)) WITHOUT ROWID;
+      """
+  )
+  for t in translations:
+    table, key = ("ayah_translations", "ayah_id") if t.kind == "ayah" else ("word_glosses", "word_id")
+    conn.executemany(
+        f"INSERT INTO {table} (translation_id, {key}, text) VALUES (?, ?, ?)",
+        ((t.id, row_id, text) for row_id, text in enumerate(t.texts, start=1) if text),
+    )
+  conn.commit()
+  conn.execute("VACUUM")
+  conn.close()
+
+
+def _interned_db(path: Path, translations: list[Translation]) -> None:
+  conn = sqlite3.connect(path)
+  # Only the translation tables; foreign keys are not enforced here.
+  conn.executescript(TRANSLATION_SCHEMA)
+  store_translations(conn, translations)
+  conn.execute("VACUUM")
+  conn.close()
+
+
+def _time_ms(fn, repeat: int = 3) -> float:
+  best = float("inf")
+  for _ in range(repeat):
+    started = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - started)
+  return best * 1000
+
+
+def benchmark(ayahs: list[dict], words: list[dict], extra: int) -> None:
+  base = translations_from_assets(ayahs, words)
+  translations = _variant(base, extra)
+  word_count = sum(1 for t in translations if t.kind == "word")
+  print(f"{len(translations)} translations ({word_count} word-level) over "
+        f"{len(ayahs)} ayahs and {len(words)} words")
+
+  naive_asset = json.dumps(
+      {str(t.id): t.texts for t in translations}, ensure_ascii=False, separators=(",", ":"))
+  interned_asset = json.dumps(
+      translation_asset(translations), ensure_ascii=False, separators=(",", ":"))
+
+  def load_naive():
+    payload = json.loads(naive_asset)
+    return [payload[str(t.id)] for t in translations]
+
+  def load_interned():
+    payload = json.loads(interned_asset)
+    strings = payload["strings"]
+    columns = {**payload["ayahs"], **payload["words"]}
+    return [[strings[sid] for sid in columns[str(t.id)]] for t in translations]
+
+  assert load_naive() == load_interned()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    naive_path = Path(tmp) / "naive.db"
+    interned_path = Path(tmp) / "interned.db"
+    _naive_db(naive_path, translations)
+    _interned_db(interned_path, translations)
+    naive_db = naive_path.stat().st_size
+    interned_db = interned_path.stat().st_size
+
+    # Reader access pattern: one word translation, the words of one ayah
+    # (contiguous word ids).
+    word_ids_by_ayah: dict[tuple[int, int], list[int]] = {}
+    for word_id, word in enumerate(words, start=1):
+      word_ids_by_ayah.setdefault((word["surah_id"], word["ayah_number"]), []).append(word_id)
+    ranges = [(ids[0], ids[-1]) for ids in list(word_ids_by_ayah.values())[::7]]
+    word_translations = [t.id for t in translations if t.kind == "word"]
+
+    def query(path: Path, sql: str):
+      conn = sqlite3.connect(path)
+      try:
+        for index, (first, last) in enumerate(ranges):
+          tid = word_translations[index % len(word_translations)]
+          conn.execute(sql, (tid, first, last)).fetchall()
+      finally:
+        conn.close()
+
+    naive_query = _time_ms(lambda: query(
+        naive_path,
+        "SELECT word_id, text FROM word_glosses "
+        "WHERE translation_id = ? AND word_id BETWEEN ? AND ?"))
+    interned_query = _time_ms(lambda: query(
+        interned_path,
+        "SELECT g.word_id, s.text FROM word_glosses g JOIN strings s ON s.id = g.string_id "
+        "WHERE g.translation_id = ? AND g.word_id BETWEEN ? AND ?"))
+
+  rows = [
+      ("JSON asset bytes", len(naive_asset.encode()), len(interned_asset.encode())),
+      ("JSON asset gzip bytes", len(gzip.compress(naive_asset.encode())),
+       len(gzip.compress(interned_asset.encode()))),
+      ("SQLite bytes", naive_db, interned_db),
+  ]
+  print(f"  {'':<24}{'naive':>14}{'interned':>14}{'ratio':>8}")
+  for label, naive, interned in rows:
+    print(f"  {label:<24}{naive:>14,}{interned:>14,}{interned / naive:>8.2f}")
+  for label, naive, interned in (
+      ("JSON decode + lookup ms", _time_ms(load_naive), _time_ms(load_interned)),
+      (f"SQLite {len(ranges)} ayahs ms", naive_query, interned_query),
+  ):
+    print(f"  {label:<24}{naive:>14.1f}{interned:>14.1f}{interned / naive:>8.2f}")
+  print(f"  distinct strings: {len(intern_strings(translations)[0]):,}")
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Interned translation storage.")
+  parser.add_argument("--ayahs", type=Path, default=DATA_DIR / "ayahs_full.json")
+  parser.add_argument("--words", type=Path, default=DATA_DIR / "words_full.json")
+  parser.add_argument("--asset", type=Path, help="Write the interned translations.json asset")
+  parser.add_argument("--benchmark", action="store_true")
+  parser.add_argument(
+      "--translations",
+      type=int,
+      default=6,
+      help="Benchmark: total languages, derived from the English ones",
+  )
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = parse_args()
+  ayahs = load_json(args.ayahs)
+  words = load_json(args.words)
+  if args.benchmark:
+    benchmark(ayahs, words, max(args.translations - 1, 0))
+  if args.asset:
+    asset = translation_asset(translations_from_assets(ayahs, words))
+    atomic_write_json(args.asset, asset, indent=None)
+    print(f"Wrote {len(asset['strings']):,} strings to {args.asset}")
+
+
+if __name__ == "__main__":
+  main()
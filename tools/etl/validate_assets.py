@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+"""Validate every generated asset in one pass with declared rules.
+
+Each asset is loaded once: surahs, ayahs, words, roots, the curriculum
+(lessons.json), daily lessons and every reciter in audio_align/. Cross-asset
+lookups (verse keys, verse counts, words per verse) are built once from that
+load. Rules are registered with `@rule` and are one of two kinds:
+- record rules: `check(record, ctx)` yields messages for one record. They run
+  over chunks of records in a process pool.
+- asset rules: `check(records, ctx)` yields `(record, message)` for whole-file
+  properties such as counts, ordering and duplicate keys.
+
+Every violation is collected; nothing stops at the first one. Each carries
+its rule, level, asset and record key (the keys asset_delta.py uses, e.g.
+`2:255` for an ayah or `2:255:3` for a word). The report is JSON, and
+`--sarif` also writes SARIF 2.1.0 for code-scanning viewers. The exit status
+is non-zero when any error-level rule fails.
+
+Usage:
+    python3 validate_assets.py
+    python3 validate_assets.py --asset daily_lessons.json --asset ayahs_full.json
+    python3 validate_assets.py --sarif validation.sarif --jobs 4
+    python3 validate_assets.py --list-rules
+"""
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from asset_delta import key_spec, split
+from asset_io import atomic_write_json, load_json
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "quran_vocab" / "assets" / "data"
+REPORT_PATH = DATA_DIR / "asset_validation.json"
+ASSET_FILES = [
+    "surahs.json",
+    "ayahs_full.json",
+    "words_full.json",
+    "roots.json",
+    "lessons.json",
+    "daily_lessons.json",
+]
+ALIGN_PREFIX = "audio_align/"
+CHUNK_SIZE = 5000
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+ARABIC_LETTER = re.compile(r"^[ء-يٱ-ۓ]$")
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    asset: str  # Logical asset name; "audio_align/" matches every reciter
+    level: str  # "error" or "warning"
+    description: str
+    check: Callable
+    scope: str  # "record" or "asset"
+
+
+RULES: list[Rule] = []
+
+
+def rule(rule_id: str, asset: str, description: str, level: str = "error", scope: str = "record"):
+    def register(check: Callable) -> Callable:
+        RULES.append(Rule(rule_id, asset, level, description, check, scope))
+        return check
+    return register
+
+
+@dataclass
+class Context:
+    """Lookups shared by rules, built once from the loaded assets."""
+    verse_counts: dict[int, int] | None = None
+    verses: set[tuple[int, int]] | None = None
+    words_per_verse: dict[tuple[int, int], int] | None = None
+    word_count: int | None = None
+
+
+@dataclass
+class Asset:
+    name: str
+    path: Path
+    records: list
+    key_fields: list[str]
+
+
+@dataclass
+class Violation:
+    rule: str
+    level: str
+    asset: str
+    key: str
+    message: str
+    index: int = field(default=-1, compare=False)
+
+
+def record_key(asset: Asset, record) -> str:
+    if not isinstance(record, dict):
+        return "?"
+    return ":".join(str(record.get(f, "?")) for f in asset.key_fields)
+
+
+def verse_of(key: str) -> tuple[int, int] | None:
+    try:
+        surah, ayah = key.split(":")
+        return int(surah), int(ayah)
+    except ValueError:
+        return None
+
+
+# --- Surahs -----------------------------------------------------------------
+
+@rule("SU001", "surahs.json", "Surah id is 1-114 and verse_count is positive")
+def surah_fields(surah, ctx):
+    if not 1 <= surah.get("id", 0) <= 114:
+        yield f"id {surah.get('id')!r} outside 1-114"
+    if not isinstance(surah.get("verse_count"), int) or surah["verse_count"] <= 0:
+        yield f"verse_count {surah.get('verse_count')!r} is not a positive integer"
+
+
+@rule("SU002", "surahs.json", "All 114 surahs are present once", scope="asset")
+def surah_set(surahs, ctx):
+    ids = [s.get("id") for s in surahs]
+    for missing in sorted(set(range(1, 115)) - set(ids)):
+        yield None, f"surah {missing} is missing"
+    seen = set()
+    for surah in surahs:
+        if surah.get("id") in seen:
+            yield surah, "duplicate surah id"
+        seen.add(surah.get("id"))
+
+
+# --- Ayahs ------------------------------------------------------------------
+
+@rule("AY001", "ayahs_full.json", "Uthmani text is present")
+def ayah_text(ayah, ctx):
+    if not (ayah.get("text_uthmani") or "").strip():
+        yield "empty text_uthmani"
+
+
+@rule("AY002", "ayahs_full.json", "IndoPak text is present", level="warning")
+def ayah_indopak(ayah, ctx):
+    if not (ayah.get("text_indopak") or "").strip():
+        yield "empty text_indopak"
+
+
+@rule("AY003", "ayahs_full.json", "Ayah number is within its surah's verse count")
+def ayah_in_surah(ayah, ctx):
+    if ctx.verse_counts is None:
+        return
+    count = ctx.verse_counts.get(ayah.get("surah_id"))
+    if count is None:
+        yield f"surah {ayah.get('surah_id')!r} not in surahs.json"
+    elif not 1 <= ayah.get("ayah_number", 0) <= count:
+        yield f"ayah_number {ayah.get('ayah_number')!r} outside 1-{count}"
+
+
+@rule("AY004", "ayahs_full.json", "Every verse appears exactly once", scope="asset")
+def ayah_coverage(ayahs, ctx):
+    seen = set()
+    for ayah in ayahs:
+        key = (ayah.get("surah_id"), ayah.get("ayah_number"))
+        if key in seen:
+            yield ayah, "duplicate verse"
+        seen.add(key)
+    if ctx.verse_counts is None:
+        return
+    for surah, count in sorted(ctx.verse_counts.items()):
+        missing = [a for a in range(1, count + 1) if (surah, a) not in seen]
+        if missing:
+            yield None, f"surah {surah} is missing ayahs {missing[:10]}{' ...' if len(missing) > 10 else ''}"
+
+
+# --- Words ------------------------------------------------------------------
+
+@rule("WD001", "words_full.json", "Word text is present")
+def word_text(word, ctx):
+    if not (word.get("text_uthmani") or "").strip():
+        yield "empty text_uthmani"
+
+
+@rule("WD002", "words_full.json", "Word belongs to a known verse")
+def word_verse(word, ctx):
+    if ctx.verses is not None and (word.get("surah_id"), word.get("ayah_number")) not in ctx.verses:
+        yield "verse not in ayahs_full.json"
+
+
+@rule("WD003", "words_full.json", "Root is written as spaced Arabic letters", level="warning")
+def word_root(word, ctx):
+    root = word.get("root")
+    if root and not (2 <= len(root.split()) <= 5 and all(ARABIC_LETTER.match(c) for c in root.split())):
+        yield f"malformed root {root!r}"
+
+
+@rule("WD004", "words_full.json", "Positions run 1..n within each verse", scope="asset")
+def word_positions(words, ctx):
+    by_verse: dict[tuple, list] = {}
+    for word in words:
+        by_verse.setdefault((word.get("surah_id"), word.get("ayah_number")), []).append(word)
+    for verse_words in by_verse.values():
+        positions = sorted(w.get("position") or 0 for w in verse_words)
+        if positions != list(range(1, len(positions) + 1)):
+            first = min(verse_words, key=lambda w: w.get("position") or 0)
+            yield first, f"positions {positions[:12]}{' ...' if len(positions) > 12 else ''}"
+    if ctx.verses is not None:
+        for surah, ayah in sorted(ctx.verses - set(by_verse)):
+            yield None, f"verse {surah}:{ayah} has no words"
+
+
+# --- Roots ------------------------------------------------------------------
+
+@rule("RT001", "roots.json", "Root text is 2-5 spaced Arabic letters")
+def root_text(root, ctx):
+    letters = (root.get("root_text") or "").split()
+    if not (2 <= len(letters) <= 5 and all(ARABIC_LETTER.match(c) for c in letters)):
+        yield f"malformed root_text {root.get('root_text')!r}"
+
+
+@rule("RT002", "roots.json", "Frequency is a non-negative integer")
+def root_frequency(root, ctx):
+    count = root.get("frequency_count")
+    if not isinstance(count, int) or count < 0:
+        yield f"frequency_count {count!r}"
+
+
+@rule("RT003", "roots.json", "Short meaning is present", level="warning")
+def root_meaning(root, ctx):
+    if not (root.get("meaning_short") or "").strip():
+        yield "empty meaning_short"
+
+
+@rule("RT004", "roots.json", "Root ids and texts are unique", scope="asset")
+def root_unique(roots, ctx):
+    for field_name in ("id", "root_text"):
+        seen = set()
+        for root in roots:
+            if root.get(field_name) in seen:
+                yield root, f"duplicate {field_name} {root.get(field_name)!r}"
+            seen.add(root.get(field_name))
+
+
+# --- Curriculum (lessons.json units) ----------------------------------------
+
+@rule("LS001", "lessons.json", "Lessons are surah-based (surahId, ayahRange) or list vocabulary")
+def unit_lesson_kind(unit, ctx):
+    for lesson in unit.get("lessons", []):
+        surah_based = lesson.get("surahId") is not None and lesson.get("ayahRange") is not None
+        if not surah_based and not lesson.get("vocabulary"):
+            yield f"lesson {lesson.get('id')}: neither surahId/ayahRange nor vocabulary"
+
+
+@rule("LS002", "lessons.json", "Lesson ayah ranges lie within their surah")
+def unit_lessons(unit, ctx):
+    for lesson in unit.get("lessons", []):
+        if lesson.get("ayahRange") is None:
+            continue
+        start, end = (list(lesson["ayahRange"]) + [0, 0])[:2]
+        if not 1 <= start <= end:
+            yield f"lesson {lesson.get('id')}: ayahRange {lesson.get('ayahRange')!r}"
+        elif ctx.verse_counts is not None:
+            count = ctx.verse_counts.get(lesson.get("surahId"))
+            if count is None:
+                yield f"lesson {lesson.get('id')}: surah {lesson.get('surahId')!r} not in surahs.json"
+            elif end > count:
+                yield f"lesson {lesson.get('id')}: ayahRange ends past ayah {count}"
+
+
+@rule("LS003", "lessons.json", "Unit and lesson ids are unique", scope="asset")
+def unit_ids(units, ctx):
+    seen_units, seen_lessons = set(), set()
+    for unit in units:
+        if unit.get("id") in seen_units:
+            yield unit, "duplicate unit id"
+        seen_units.add(unit.get("id"))
+        for lesson in unit.get("lessons", []):
+            if lesson.get("id") in seen_lessons:
+                yield unit, f"duplicate lesson id {lesson.get('id')!r}"
+            seen_lessons.add(lesson.get("id"))
+
+
+# --- Daily lessons ----------------------------------------------------------
+
+@rule("DL001", "daily_lessons.json", "At least 500 lessons", scope="asset")
+def daily_count(lessons, ctx):
+    if len(lessons) < 500:
+        yield None, f"expected at least 500 lessons, found {len(lessons)}"
+
+
+@rule("DL002", "daily_lessons.json", "dayIndex equals the lesson's position", scope="asset")
+def daily_order(lessons, ctx):
+    for idx, lesson in enumerate(lessons):
+        if lesson.get("dayIndex") != idx:
+            yield lesson, f"dayIndex {lesson.get('dayIndex')!r} at position {idx}"
+
+
+@rule("DL003", "daily_lessons.json", "verseKeys are present and within the lesson's surah")
+def daily_verses(lesson, ctx):
+    verse_keys = lesson.get("verseKeys") or []
+    if not verse_keys:
+        yield "missing verseKeys"
+    for key in verse_keys:
+        verse = verse_of(key)
+        if verse is None:
+            yield f"malformed verse key {key!r}"
+        elif verse[0] != lesson.get("surahId"):
+            yield f"cross-surah verse key {key}"
+        elif ctx.verses is not None and verse not in ctx.verses:
+            yield f"verse {key} not in ayahs_full.json"
+
+
+@rule("DL004", "daily_lessons.json", "bodyShort is at most 400 words")
+def daily_short(lesson, ctx):
+    words = len((lesson.get("bodyShort") or "").split())
+    if words > 400:
+        yield f"bodyShort has {words} words"
+
+
+@rule("DL005", "daily_lessons.json", "bodyFull is present")
+def daily_full(lesson, ctx):
+    if not lesson.get("bodyFull"):
+        yield "empty bodyFull"
+
+
+@rule("DL006", "daily_lessons.json", "wordRange is [start, end) within words_full.json and coverage is a share")
+def daily_vocabulary(lesson, ctx):
+    if "wordRange" not in lesson:
+        return
+    word_range = lesson["wordRange"]
+    if len(word_range) != 2 or not 0 <= word_range[0] < word_range[1]:
+        yield f"malformed wordRange {word_range!r}"
+    elif ctx.word_count is not None and word_range[1] > ctx.word_count:
+        yield f"wordRange {word_range!r} past the {ctx.word_count} words in words_full.json"
+    if not set(lesson.get("newRootIds", [])) <= set(lesson.get("rootIds", [])):
+        yield "newRootIds not a subset of rootIds"
+    for field in ("coverageGain", "coverage"):
+        if not 0 <= lesson.get(field, 0) <= 1:
+            yield f"{field} {lesson.get(field)!r} outside [0, 1]"
+
+
+@rule("DL007", "daily_lessons.json", "Coverage never decreases and new roots are new", scope="asset")
+def daily_coverage(lessons, ctx):
+    previous, seen = 0.0, set()
+    for lesson in lessons:
+        if "coverage" not in lesson:
+            continue
+        if lesson["coverage"] < previous:
+            yield lesson, f"coverage drops from {previous} to {lesson['coverage']}"
+        previous = lesson["coverage"]
+        repeated = seen & set(lesson.get("newRootIds", []))
+        if repeated:
+            yield lesson, f"roots {sorted(repeated)} already introduced"
+        seen.update(lesson.get("newRootIds", []))
+
+
+# --- Word alignment ---------------------------------------------------------
+
+@rule("AL001", ALIGN_PREFIX, "Aligned verse exists in ayahs_full.json")
+def align_verse(entry, ctx):
+    if ctx.verses is not None and (entry.get("surah"), entry.get("ayah")) not in ctx.verses:
+        yield "verse not in ayahs_full.json"
+
+
+@rule("AL002", ALIGN_PREFIX, "Segments are [word_start, word_end, start_ms, end_ms] with positive spans")
+def align_segments(entry, ctx):
+    for i, segment in enumerate(entry.get("segments", [])):
+        if len(segment) != 4 or not all(isinstance(v, int) for v in segment):
+            yield f"segment {i} malformed: {segment!r}"
+        elif segment[1] <= segment[0] or segment[3] <= segment[2]:
+            yield f"segment {i} has an empty span: {segment}"
+
+
+@rule("AL003", ALIGN_PREFIX, "Segments are ordered and do not overlap", level="warning")
+def align_order(entry, ctx):
+    segments = [s for s in entry.get("segments", []) if len(s) == 4]
+    for i in range(1, len(segments)):
+        if segments[i][2] < segments[i - 1][3]:
+            yield f"segment {i} starts {segments[i - 1][3] - segments[i][2]} ms before segment {i - 1} ends"
+
+
+@rule("AL004", ALIGN_PREFIX, "Segments stay within the verse's words")
+def align_words(entry, ctx):
+    if ctx.words_per_verse is None:
+        return
+    count = ctx.words_per_verse.get((entry.get("surah"), entry.get("ayah")))
+    ends = [s[1] for s in entry.get("segments", []) if len(s) == 4]
+    if count and ends and max(ends) > count:
+        yield f"word_end {max(ends)} past the verse's {count} words"
+
+
+# --- Engine -----------------------------------------------------------------
+
+def load_assets(data_dir: Path, names: list[str] | None) -> list[Asset]:
+    paths = [(name, data_dir / name) for name in ASSET_FILES]
+    paths += [
+        (ALIGN_PREFIX + path.name, path)
+        for path in sorted((data_dir / "audio_align").glob("*.json"))
+        if not path.name.endswith(".ranges.json")
+    ]
+    assets = []
+    for name, path in paths:
+        if names and name not in names and not (ALIGN_PREFIX in names and name.startswith(ALIGN_PREFIX)):
+            continue
+        if not path.exists():
+            print(f"⚠️  {path} not found; its rules are skipped")
+            continue
+        records_field, key_fields = key_spec(name)
+        records, _ = split(load_json(path), records_field)
+        assets.append(Asset(name, path, records, key_fields))
+    return assets
+
+
+def build_context(assets: list[Asset]) -> Context:
+    ctx = Context()
+    by_name = {asset.name: asset for asset in assets}
+    if "surahs.json" in by_name:
+        ctx.verse_counts = {s.get("id"): s.get("verse_count") for s in by_name["surahs.json"].records}
+    if "ayahs_full.json" in by_name:
+        ctx.verses = {(a.get("surah_id"), a.get("ayah_number")) for a in by_name["ayahs_full.json"].records}
+    if "words_full.json" in by_name:
+        ctx.words_per_verse = {}
+        for word in by_name["words_full.json"].records:
+            verse = (word.get("surah_id"), word.get("ayah_number"))
+            ctx.words_per_verse[verse] = ctx.words_per_verse.get(verse, 0) + 1
+        ctx.word_count = len(by_name["words_full.json"].records)
+    return ctx
+
+
+def rules_for(name: str, scope: str, rules: list[Rule]) -> list[Rule]:
+    return [
+        r for r in rules
+        if r.scope == scope and (r.asset == name or (r.asset.endswith("/") and name.startswith(r.asset)))
+    ]
+
+
+def crash_message(exc: Exception) -> str:
+    return f"rule failed on malformed data: {type(exc).__name__}: {exc}"
+
+
+# Set in the parent before the pool starts, and in each worker by _init_worker.
+_STATE: tuple[list[Asset], Context, list[Rule]] | None = None
+
+
+def _init_worker(state) -> None:
+    global _STATE
+    _STATE = state
+
+
+def _check_chunk(task: tuple[int, int, int]) -> list[Violation]:
+    asset_index, start, stop = task
+    assets, ctx, rules = _STATE
+    asset = assets[asset_index]
+    found = []
+    record_rules = rules_for(asset.name, "record", rules)
+    for index in range(start, stop):
+        record = asset.records[index]
+        for r in record_rules:
+            try:
+                for message in r.check(record, ctx):
+                    found.append(Violation(r.id, r.level, asset.name, record_key(asset, record), message, index))
+            except Exception as exc:  # A malformed record must not stop the run.
+                found.append(Violation(r.id, "error", asset.name, record_key(asset, record), crash_message(exc), index))
+    return found
+
+
+def validate(assets: list[Asset], rules: list[Rule], jobs: int | None = None) -> list[Violation]:
+    global _STATE
+    ctx = build_context(assets)
+    _STATE = (assets, ctx, rules)
+    tasks = [
+        (i, start, min(start + CHUNK_SIZE, len(asset.records)))
+        for i, asset in enumerate(assets)
+        if rules_for(asset.name, "record", rules)
+        for start in range(0, len(asset.records), CHUNK_SIZE)
+    ]
+    jobs = jobs or os.cpu_count() or 1
+    violations: list[Violation] = []
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(_STATE,)) as pool:
+            for found in pool.map(_check_chunk, tasks):
+                violations.extend(found)
+    else:
+        for task in tasks:
+            violations.extend(_check_chunk(task))
+
+    for asset in assets:
+        positions = {id(record): index for index, record in enumerate(asset.records)}
+        for r in rules_for(asset.name, "asset", rules):
+            try:
+                for record, message in r.check(asset.records, ctx):
+                    key = record_key(asset, record) if record is not None else ""
+                    index = positions.get(id(record), -1)
+                    violations.append(Violation(r.id, r.level, asset.name, key, message, index))
+            except Exception as exc:
+                violations.append(Violation(r.id, "error", asset.name, "", crash_message(exc)))
+
+    order = {asset.name: i for i, asset in enumerate(assets)}
+    violations.sort(key=lambda v: (order[v.asset], v.index, v.rule))
+    return violations
+
+
+def to_report(assets: list[Asset], rules: list[Rule], violations: list[Violation], seconds: float) -> dict:
+    counts: dict[str, int] = {}
+    for v in violations:
+        counts[v.rule] = counts.get(v.rule, 0) + 1
+    return {
+        "seconds": round(seconds, 3),
+        "assets": {asset.name: len(asset.records) for asset in assets},
+        "errors": sum(v.level == "error" for v in violations),
+        "warnings": sum(v.level == "warning" for v in violations),
+        "rules": {r.id: {"asset": r.asset, "level": r.level, "description": r.description,
+                         "violations": counts.get(r.id, 0)} for r in rules},
+        "violations": [
+            {"rule": v.rule, "level": v.level, "asset": v.asset, "key": v.key, "message": v.message}
+            for v in violations
+        ],
+    }
+
+
+def to_sarif(assets: list[Asset], rules: list[Rule], violations: list[Violation]) -> dict:
+    uris = {asset.name: asset.path.resolve().relative_to(ROOT).as_posix()
+            if asset.path.resolve().is_relative_to(ROOT) else asset.path.as_posix() for asset in assets}
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {
+                "name": "validate_assets",
+                "rules": [
+                    {
+                        "id": r.id,
+                        "shortDescription": {"text": r.description},
+                        "defaultConfiguration": {"level": r.level},
+                    }
+                    for r in rules
+                ],
+            }},
+            "results": [
+                {
+                    "ruleId": v.rule,
+                    "level": v.level,
+                    "message": {"text": v.message},
+                    "locations": [{
+                        "physicalLocation": {"artifactLocation": {"uri": uris[v.asset]}},
+                        "logicalLocations": [{"fullyQualifiedName": f"{v.asset}#{v.key}" if v.key else v.asset}],
+                    }],
+                }
+                for v in violations
+            ],
+        }],
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate the generated assets against declared rules.")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument(
+        "--asset", action="append",
+        help="Asset to validate (repeatable, e.g. daily_lessons.json or audio_align/; default: all)",
+    )
+    parser.add_argument("--rule", action="append", help="Only run these rule ids (repeatable)")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    parser.add_argument("--sarif", type=Path, help="Also write SARIF 2.1.0 here")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--list-rules", action="store_true")
+    return parser.parse_args()
+
+
+def print_violations(violations: Iterable[Violation], limit: int = 30) -> None:
+    violations = list(violations)
+    for v in violations[:limit]:
+        icon = "❌" if v.level == "error" else "⚠️ "
+        where = f"{v.asset}#{v.key}" if v.key else v.asset
+        print(f"  {icon} {v.rule} {where}: {v.message}")
+    if len(violations) > limit:
+        print(f"  ... {len(violations) - limit} more")
+
+
+def main():
+    args = parse_args()
+    rules = [r for r in RULES if not args.rule or r.id in args.rule]
+    if args.list_rules:
+        for r in rules:
+            print(f"{r.id}  {r.level:<7}  {r.asset:<20} {r.description}")
+        return
+
+    started = time.perf_counter()
+    assets = load_assets(args.data_dir, args.asset)
+    loaded = time.perf_counter()
+    violations = validate(assets, rules, args.jobs)
+    finished = time.perf_counter()
+
+    print_violations(violations)
+    report = to_report(assets, rules, violations, finished - started)
+    print(
+        f"{'✅' if not report['errors'] else '❌'} {sum(report['assets'].values()):,} records in "
+        f"{len(assets)} assets: {report['errors']} errors, {report['warnings']} warnings "
+        f"(load {loaded - started:.2f}s, rules {finished - loaded:.2f}s)"
+    )
+    atomic_write_json(args.output, report)
+    print(f"📄 Report saved to {args.output}")
+    if args.sarif:
+        atomic_write_json(args.sarif, to_sarif(assets, rules, violations))
+        print(f"📄 SARIF saved to {args.sarif}")
+    raise SystemExit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,30 @@
 #!/usr/bin/env python3
-"""Validate daily lessons JSON."""
-import json
+"""Validate daily lessons JSON.
+
+Runs the daily_lessons.json rules of validate_assets.py (with ayahs_full.json
+for verse lookups, if present) and lists every violation.
+"""
 from pathlib import Path
 
+from validate_assets import RULES, load_assets, print_violations, rules_for, validate
+
 ROOT = Path(__file__).resolve().parents[2]
 LESSONS_PATH = ROOT / "quran_vocab" / "assets" / "data" / "daily_lessons.json"
 
 
-def word_count(text: str) -> int:
-    return len(text.split())
-
-
 def main():
     if not LESSONS_PATH.exists():
         raise SystemExit(f"Missing {LESSONS_PATH}")
 
-    lessons = json.loads(LESSONS_PATH.read_text(encoding="utf-8"))
-    if len(lessons) < 500:
-        raise SystemExit("Expected at least 500 lessons")
-
-    for idx, lesson in enumerate(lessons):
-        day_index = lesson.get("dayIndex")
-        if day_index != idx:
-            raise SystemExit(f"dayIndex mismatch at {idx}")
-        surah_id = lesson.get("surahId")
-        verse_keys = lesson.get("verseKeys") or []
-        if not verse_keys:
-            raise SystemExit(f"Missing verseKeys at {lesson.get('id')}")
-        for key in verse_keys:
-            surah_str = key.split(":")[0]
-            if int(surah_str) != surah_id:
-                raise SystemExit(f"Cross-surah lesson {lesson.get('id')}")
-        body_short = lesson.get("bodyShort", "")
-        if word_count(body_short) > 400:
-            raise SystemExit(f"Body short too long at {lesson.get('id')}")
-        if not lesson.get("bodyFull"):
-            raise SystemExit(f"Empty body full at {lesson.get('id')}")
+    assets = load_assets(LESSONS_PATH.parent, [LESSONS_PATH.name, "ayahs_full.json"])
+    rules = rules_for(LESSONS_PATH.name, "record", RULES) + rules_for(LESSONS_PATH.name, "asset", RULES)
+    violations = validate(assets, rules, jobs=1)
+    errors = [v for v in violations if v.level == "error"]
+    print_violations(violations, limit=len(violations))
+    if errors:
+        raise SystemExit(f"{len(errors)} problems in {LESSONS_PATH.name}")
 
+    lessons = next(a for a in assets if a.name == LESSONS_PATH.name).records
     print(f"Validated {len(lessons)} lessons")
 
 
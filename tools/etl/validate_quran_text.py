@@ -13,6 +13,9 @@ import sys
 import urllib.request
 from pathlib import Path
 
+from asset_io import write_records
+from merge_ayah_columns import apply_columns, verse_key, write_column
+
 # Source: Tarteel AI's Quranic Universal Library (Medina Mushaf)
 QUL_URL = "https://raw.githubusercontent.com/yazinsai/quran-validator/main/data/quran-verses.json"
 
@@ -57,7 +60,7 @@ def normalize_arabic(text: str) -> str:
     return text.strip()
 
 
-def compare_verses(local_ayahs: list[dict], qul_verses: list[dict], fix_mode: bool = False) -> tuple[int, list[dict]]:
+def compare_verses(local_ayahs: list[dict], qul_verses: list[dict]) -> tuple[int, list[dict]]:
     """Compare local verses against QUL authentic text."""
     
     # Build QUL lookup: (surah, ayah) -> verse
@@ -71,7 +74,7 @@ def compare_verses(local_ayahs: list[dict], qul_verses: list[dict], fix_mode: bo
     
     print(f"\n🔍 Comparing {len(local_ayahs)} local ayahs against {len(qul_verses)} QUL verses...\n")
     
-    for i, local_ayah in enumerate(local_ayahs):
+    for local_ayah in local_ayahs:
         surah = local_ayah["surah_id"]
         ayah = local_ayah["ayah_number"]
         local_text = local_ayah["text_uthmani"]
@@ -112,10 +115,6 @@ def compare_verses(local_ayahs: list[dict], qul_verses: list[dict], fix_mode: bo
                 "qul": qul_text,
                 "match_type": "mismatch",
             })
-        
-        # Fix if requested
-        if fix_mode:
-            local_ayahs[i]["text_uthmani"] = qul_text
     
     # Summary
     print("=" * 60)
@@ -160,19 +159,19 @@ def main():
     local_ayahs = load_local_ayahs(ayahs_path)
     
     # Compare
-    issues, differences = compare_verses(local_ayahs, qul_verses, fix_mode=fix_mode)
+    issues, differences = compare_verses(local_ayahs, qul_verses)
     
     if fix_mode and issues > 0:
         print("\n✏️  Applying fixes from QUL data...")
-        with open(ayahs_path, "w", encoding="utf-8") as f:
-            json.dump(local_ayahs, f, ensure_ascii=False, indent=2)
-        print(f"   Saved corrected data to {ayahs_path.name}")
+        qul_column = {verse_key(v["surah"], v["ayah"]): v["text"] for v in qul_verses}
+        column_path = write_column("text_uthmani", qul_column, source=QUL_URL)
+        stats = apply_columns([column_path], ayahs_path=ayahs_path)
+        print(f"   Merged {stats['text_uthmani']['applied']:,} verses into {ayahs_path.name}")
     
     # Save diff report
     if differences:
         report_path = data_dir / "validation_report.json"
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(differences, f, ensure_ascii=False, indent=2)
+        write_records(report_path, differences)
         print(f"\n📄 Detailed report saved to {report_path.name}")
     
     sys.exit(0 if issues == 0 else 1)
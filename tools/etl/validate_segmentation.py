@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Check offline that the words of each verse spell the verse.
+
+For every verse in ayahs_full.json, the words in words_full.json, in position
+order, must concatenate to the verse text once separators are removed.
+Separators are whitespace, the BOM, pause marks (U+06D6-U+06DB), the ayah end
+mark, rub el hizb and the sajdah mark. Word positions must run 1, 2, ... n with
+no gaps or duplicates.
+
+All verses are checked in one pass. The stripped verse texts and word texts are
+each joined into one codepoint array. Each verse's characters are then
+compared with NumPy against the same span of the word array. For each verse
+that diverges, the report gives the character offset in the verse text, the
+word position at that point, and the expected and actual text there.
+
+This covers what validate_words.py checks against the quran.com API, except
+for the source text itself: run validate_quran_text.py for that.
+
+Usage:
+    python3 validate_segmentation.py
+    python3 validate_segmentation.py --field text_indopak --words words_indopak.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from asset_io import atomic_write_json
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "quran_vocab" / "assets" / "data"
+REPORT_PATH = DATA_DIR / "segmentation_report.json"
+
+SEPARATORS = (
+    {0x0020, 0x00A0, 0x0009, 0x000A, 0x000D, 0x3000, 0xFEFF}
+    | set(range(0x06D6, 0x06DC))  # Small high pause ligatures and marks
+    | {0x06DD, 0x06DE, 0x06E9}  # Ayah end, rub el hizb, sajdah
+)
+STRIP = dict.fromkeys(SEPARATORS)
+CONTEXT = 8
+
+
+def strip(text: str) -> str:
+    return text.translate(STRIP)
+
+
+def codepoints(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def original_offset(text: str, stripped_offset: int) -> int:
+    """Offset in `text` of the character at `stripped_offset` after stripping."""
+    kept = 0
+    for i, char in enumerate(text):
+        if ord(char) in SEPARATORS:
+            continue
+        if kept == stripped_offset:
+            return i
+        kept += 1
+    return len(text)
+
+
+def check_positions(keys: np.ndarray, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(verse starts, bad rows) for words sorted by (verse key, position)."""
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    rank = np.arange(len(keys)) - np.repeat(starts, np.diff(np.r_[starts, len(keys)])) + 1
+    return starts, np.flatnonzero(positions != rank)
+
+
+def validate(ayahs: list[dict], words: list[dict], field: str) -> dict:
+    verse_keys = np.array([a["surah_id"] * 1000 + a["ayah_number"] for a in ayahs], dtype=np.int64)
+    word_keys = np.array([w["surah_id"] * 1000 + w["ayah_number"] for w in words], dtype=np.int64)
+    positions = np.array([w["position"] for w in words], dtype=np.int64)
+    order = np.lexsort((positions, word_keys))
+    word_keys, positions = word_keys[order], positions[order]
+    word_texts = [strip(words[i].get(field) or "") for i in order.tolist()]
+
+    problems = []
+
+    def verse(key: int) -> str:
+        return f"{key // 1000}:{key % 1000}"
+
+    starts, bad_rows = check_positions(word_keys, positions)
+    bad_verses = np.unique(word_keys[bad_rows])
+    for key in bad_verses.tolist():
+        found = positions[word_keys == key].tolist()
+        problems.append({"verse": verse(key), "issue": "positions", "positions": found})
+
+    verse_row = {key: row for row, key in enumerate(verse_keys.tolist())}
+    grouped_keys = word_keys[starts]
+    for key in np.setdiff1d(grouped_keys, verse_keys).tolist():
+        problems.append({"verse": verse(key), "issue": "words_without_verse"})
+    for key in np.setdiff1d(verse_keys, grouped_keys).tolist():
+        problems.append({"verse": verse(key), "issue": "verse_without_words"})
+
+    # Verses and their words, in the same order, as two flat codepoint arrays.
+    shared = np.intersect1d(grouped_keys, verse_keys)
+    group_of = dict(zip(grouped_keys.tolist(), range(len(starts))))
+    group_ends = np.r_[starts[1:], len(word_keys)]
+    verse_texts = [strip(ayahs[verse_row[key]].get(field) or "") for key in shared.tolist()]
+    word_spans = [(int(starts[group_of[key]]), int(group_ends[group_of[key]])) for key in shared.tolist()]
+    joined_words = ["".join(word_texts[s:e]) for s, e in word_spans]
+
+    expected = codepoints("".join(verse_texts))
+    actual = codepoints("".join(joined_words))
+    expected_len = np.array([len(t) for t in verse_texts], dtype=np.int64)
+    actual_len = np.array([len(t) for t in joined_words], dtype=np.int64)
+    expected_start = np.r_[0, np.cumsum(expected_len)[:-1]]
+    actual_start = np.r_[0, np.cumsum(actual_len)[:-1]]
+
+    common = np.minimum(expected_len, actual_len)
+    row = np.repeat(np.arange(len(shared)), common)
+    local = np.arange(int(common.sum())) - np.repeat(np.r_[0, np.cumsum(common)[:-1]], common)
+    differs = expected[expected_start[row] + local] != actual[actual_start[row] + local]
+    # First differing character per verse; a length mismatch diverges at the shorter end.
+    divergence = np.where(expected_len != actual_len, common, -1)
+    hits = np.flatnonzero(differs)
+    first_rows, first_hits = np.unique(row[hits], return_index=True)
+    divergence[first_rows] = local[hits[first_hits]]
+
+    for i in np.flatnonzero(divergence >= 0).tolist():
+        key, at = int(shared[i]), int(divergence[i])
+        start, end = word_spans[i]
+        word_ends = np.cumsum([len(t) for t in word_texts[start:end]])
+        word = int(np.searchsorted(word_ends, at, side="right"))
+        original = ayahs[verse_row[key]].get(field) or ""
+        problems.append({
+            "verse": verse(key),
+            "issue": "text",
+            "offset": original_offset(original, at),
+            "word_position": int(positions[start + word]) if word < end - start else None,
+            "expected": verse_texts[i][max(0, at - CONTEXT):at + CONTEXT],
+            "actual": joined_words[i][max(0, at - CONTEXT):at + CONTEXT],
+        })
+
+    problems.sort(key=lambda p: tuple(map(int, p["verse"].split(":"))))
+    return {
+        "field": field,
+        "verses": len(verse_keys),
+        "words": len(words),
+        "checked_characters": int(common.sum()),
+        "problems": problems,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check that word texts concatenate to verse texts.")
+    parser.add_argument("--ayahs", type=Path, default=DATA_DIR / "ayahs_full.json")
+    parser.add_argument("--words", type=Path, default=DATA_DIR / "words_full.json")
+    parser.add_argument("--field", default="text_uthmani", help="Text field compared in both files")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    for path in (args.ayahs, args.words):
+        if not path.exists():
+            raise SystemExit(f"❌ {path} not found")
+
+    print(f"📂 Loading {args.ayahs.name} and {args.words.name}...")
+    ayahs = json.loads(args.ayahs.read_text(encoding="utf-8"))
+    words = json.loads(args.words.read_text(encoding="utf-8"))
+    started = time.perf_counter()
+    report = validate(ayahs, words, args.field)
+    elapsed = time.perf_counter() - started
+
+    problems = report["problems"]
+    for problem in problems[:20]:
+        detail = ""
+        if problem["issue"] == "text":
+            detail = (
+                f" at offset {problem['offset']} (word {problem['word_position']}): "
+                f"expected …{problem['expected']}… got …{problem['actual']}…"
+            )
+        elif problem["issue"] == "positions":
+            detail = f": {problem['positions']}"
+        print(f"  ❌ [{problem['verse']}] {problem['issue']}{detail}")
+    if len(problems) > 20:
+        print(f"  ... {len(problems) - 20} more")
+
+    print(
+        f"{'✅' if not problems else '❌'} {report['verses']:,} verses, {report['words']:,} words, "
+        f"{report['checked_characters']:,} characters compared in {elapsed:.2f}s; "
+        f"{len(problems)} problems"
+    )
+    atomic_write_json(args.output, report)
+    print(f"📄 Report saved to {args.output}")
+    sys.exit(0 if not problems else 1)
+
+
+if __name__ == "__main__":
+    main()
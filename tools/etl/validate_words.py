@@ -3,6 +3,8 @@
 
 Word-by-word data is harder to validate since QUL doesn't provide word boundaries.
 This script uses quran.com's API as the source of truth for word-level text.
+For a full offline check that words concatenate to their verses, see
+validate_segmentation.py.
 
 Usage:
     python3 validate_words.py              # Validate words_full.json
@@ -15,6 +17,8 @@ import time
 import urllib.request
 from pathlib import Path
 
+from asset_io import write_records
+
 
 def fetch_verse_words(surah: int, ayah: int) -> list[str]:
     """Fetch word-level data from quran.com API for a single verse."""
@@ -122,8 +126,7 @@ def main():
     
     if mismatches:
         report_path = data_dir / "word_validation_report.json"
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(mismatches, f, ensure_ascii=False, indent=2)
+        write_records(report_path, mismatches)
         print(f"\n📄 Report saved to {report_path.name}")
     
     sys.exit(0 if len(mismatches) == 0 else 1)
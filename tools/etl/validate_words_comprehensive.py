@@ -12,6 +12,8 @@ import time
 import urllib.request
 from pathlib import Path
 
+from asset_io import write_records
+
 
 def fetch_verse_words(surah: int, ayah: int) -> list[str]:
     """Fetch word-level data from quran.com API for a single verse."""
@@ -139,8 +141,7 @@ def main():
             print()
         
         report_path = data_dir / "word_validation_comprehensive.json"
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(all_mismatches, f, ensure_ascii=False, indent=2)
+        write_records(report_path, all_mismatches)
         print(f"📄 Full report: {report_path.name}")
     else:
         print("\n🎉 100% WORD-LEVEL ACCURACY CONFIRMED!")
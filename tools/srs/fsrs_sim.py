@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""Vectorized FSRS scheduler and review-load simulator.
+
+Mirrors `quran_vocab/lib/services/srs/fsrs.dart` (`FSRS.review` and its
+`_retrievability`, `_nextDifficulty`, `_nextStability`, `_nextIntervalDays`
+helpers) as NumPy array operations, then simulates learners x roots x days of
+daily reviews to measure review load and retention for a given weight set.
+
+The simulation follows the app's conventions:
+- new roots are seeded with stability 1.0, difficulty 5.0, due immediately
+  (`dueProgressProvider`);
+- the elapsed days passed to `review` are days overdue clamped to >= 1
+  (`ReviewView._handleReview`). `--elapsed-mode true` uses days since the
+  last review instead.
+
+Recall is sampled from the true retrievability (days since last review).
+
+Usage:
+    python3 fsrs_sim.py --learners 1000 --roots 2000 --days 730
+    python3 fsrs_sim.py --check-parity     # compare against fsrs_parity.json
+
+fsrs_parity.json is generated from fsrs.dart by
+`quran_vocab/tool/generate_fsrs_parity.dart`; fsrs_parity_test.dart checks
+the Dart side against the same file in CI.
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PARITY_PATH = SCRIPT_DIR / "fsrs_parity.json"
+
+# Official FSRS-5 default weights, identical to `FSRS()` in fsrs.dart.
+DEFAULT_WEIGHTS = [
+    0.4072, 1.1829, 3.1262, 15.4722, 7.2102, 0.5316, 1.0651, 0.0234, 1.616,
+    0.1544, 1.0824, 1.9813, 0.0953, 0.2975, 2.2042, 0.2407, 2.9466, 0.5034,
+    0.6567,
+]
+FACTOR = 19 / 81
+DECAY = -0.5
+
+# Initial state given to newly seeded roots by the app.
+INITIAL_STABILITY = 1.0
+INITIAL_DIFFICULTY = 5.0
+
+
+def retrievability(elapsed_days, stability, factor=FACTOR, decay=DECAY):
+    return np.power(1 + factor * elapsed_days / stability, decay)
+
+
+def next_difficulty(difficulty, rating, weights):
+    return np.clip(difficulty + weights[7] * (rating - 3), 1.0, 10.0)
+
+
+def next_stability(stability, difficulty, retrievability_, rating, weights):
+    w = weights
+    # Both branches are evaluated for the whole batch, so silence warnings
+    # from lanes whose result is discarded by np.where.
+    with np.errstate(over="ignore", invalid="ignore"):
+        forgot = (
+            w[0]
+            * np.power(difficulty, w[1])
+            * np.power(stability, w[2])
+            * np.exp(w[3] * (1 - retrievability_))
+        )
+        growth = (
+            np.exp(w[4])
+            * (11 - difficulty)
+            * np.power(stability, -w[5])
+            * (np.exp((1 - retrievability_) * w[6]) - 1)
+        )
+    return np.where(rating <= 1, forgot, stability * (1 + growth))
+
+
+def next_interval_days(stability):
+    # Dart's `double.round()` rounds half away from zero.
+    return np.maximum(1, np.floor(stability + 0.5)).astype(np.int64)
+
+
+def review(stability, difficulty, rating, elapsed_days=None, weights=DEFAULT_WEIGHTS,
+           factor=FACTOR, decay=DECAY):
+    """Batched `FSRS.review`; returns (stability, difficulty, interval, R)."""
+    stability = np.asarray(stability, dtype=np.float64)
+    difficulty = np.asarray(difficulty, dtype=np.float64)
+    rating = np.asarray(rating)
+    elapsed = stability if elapsed_days is None else np.asarray(elapsed_days, dtype=np.float64)
+    r = retrievability(elapsed, stability, factor, decay)
+    new_difficulty = next_difficulty(difficulty, rating, weights)
+    new_stability = next_stability(stability, new_difficulty, r, rating, weights)
+    return new_stability, new_difficulty, next_interval_days(new_stability), r
+
+
+def simulate(
+    learners: int,
+    roots: int,
+    days: int,
+    new_per_day: int = 10,
+    success_ratings=(0.15, 0.75, 0.10),
+    weights=DEFAULT_WEIGHTS,
+    elapsed_mode: str = "app",
+    seed: int = 0,
+) -> dict:
+    """Simulate daily reviews; state is one (learners, roots) array per field."""
+    rng = np.random.default_rng(seed)
+    shape = (learners, roots)
+    stability = np.zeros(shape, dtype=np.float64)
+    difficulty = np.zeros(shape, dtype=np.float64)
+    due_day = np.zeros(shape, dtype=np.int32)
+    last_review = np.zeros(shape, dtype=np.int32)
+    state_bytes = stability.nbytes + difficulty.nbytes + due_day.nbytes + last_review.nbytes
+
+    success_cdf = np.cumsum(np.asarray(success_ratings, dtype=np.float64))
+    success_cdf /= success_cdf[-1]
+
+    reviews_per_day = np.zeros(days, dtype=np.int64)
+    recalled_per_day = np.zeros(days, dtype=np.int64)
+    introduced = 0
+
+    for day in range(days):
+        # Roots are introduced in column order (most frequent first).
+        target = min(roots, introduced + new_per_day)
+        if target > introduced:
+            stability[:, introduced:target] = INITIAL_STABILITY
+            difficulty[:, introduced:target] = INITIAL_DIFFICULTY
+            due_day[:, introduced:target] = day
+            last_review[:, introduced:target] = day
+            introduced = target
+
+        active_due = due_day[:, :introduced]
+        rows, cols = np.nonzero(active_due <= day)
+        if rows.size == 0:
+            continue
+
+        s = stability[rows, cols]
+        d = difficulty[rows, cols]
+        since_last = (day - last_review[rows, cols]).astype(np.float64)
+        true_r = retrievability(np.maximum(since_last, 0.0), s)
+        recalled = rng.random(rows.size) < true_r
+
+        rating = np.ones(rows.size, dtype=np.int64)
+        picks = np.searchsorted(success_cdf, rng.random(rows.size), side="right")
+        rating[recalled] = 2 + np.minimum(picks[recalled], 2)
+
+        if elapsed_mode == "true":
+            elapsed = np.maximum(since_last, 1.0)
+        else:
+            overdue = (day - due_day[rows, cols]).astype(np.float64)
+            elapsed = np.where(overdue <= 0, 1.0, overdue)
+
+        new_s, new_d, interval, _ = review(s, d, rating, elapsed, weights)
+        stability[rows, cols] = new_s
+        difficulty[rows, cols] = new_d
+        due_day[rows, cols] = np.minimum(day + interval, np.iinfo(np.int32).max)
+        last_review[rows, cols] = day
+
+        reviews_per_day[day] = rows.size
+        recalled_per_day[day] = int(recalled.sum())
+
+    total_reviews = int(reviews_per_day.sum())
+    per_learner = reviews_per_day / learners
+    return {
+        "learners": learners,
+        "roots": roots,
+        "days": days,
+        "total_reviews": total_reviews,
+        "retention": float(recalled_per_day.sum() / max(total_reviews, 1)),
+        "mean_daily_reviews_per_learner": float(per_learner.mean()),
+        "peak_daily_reviews_per_learner": float(per_learner.max()),
+        "daily_reviews_per_learner": [round(float(v), 3) for v in per_learner],
+        "state_bytes": int(state_bytes),
+        "final_mean_stability": float(stability[:, :introduced].mean()) if introduced else 0.0,
+    }
+
+
+def _review_scalar(stability, difficulty, rating, elapsed_days, weights):
+    """Scalar reference that follows fsrs.dart line by line."""
+    elapsed = stability if elapsed_days is None else elapsed_days
+    r = math.pow(1 + FACTOR * elapsed / stability, DECAY)
+    d = min(max(difficulty + weights[7] * (rating - 3), 1.0), 10.0)
+    if rating <= 1:
+        s = (weights[0] * math.pow(d, weights[1]) * math.pow(stability, weights[2])
+             * math.exp(weights[3] * (1 - r)))
+    else:
+        growth = (math.exp(weights[4]) * (11 - d) * math.pow(stability, -weights[5])
+                  * (math.exp((1 - r) * weights[6]) - 1))
+        s = stability * (1 + growth)
+    return s, d, max(1, math.floor(s + 0.5)), r
+
+
+def check_parity(path: Path = PARITY_PATH, tolerance: float = 1e-9) -> int:
+    """Compare batched and scalar outputs against the Dart-generated fixture."""
+    cases = json.loads(path.read_text(encoding="utf-8"))["cases"]
+    failures = 0
+    for case in cases:
+        weights = case.get("weights", DEFAULT_WEIGHTS)
+        expected = case["expected"]
+        batched = review(
+            [case["stability"]],
+            [case["difficulty"]],
+            [case["rating"]],
+            None if case.get("elapsedDays") is None else [case["elapsedDays"]],
+            weights,
+        )
+        got = {
+            "stability": float(batched[0][0]),
+            "difficulty": float(batched[1][0]),
+            "nextIntervalDays": int(batched[2][0]),
+            "retrievability": float(batched[3][0]),
+        }
+        scalar = _review_scalar(
+            case["stability"], case["difficulty"], case["rating"],
+            case.get("elapsedDays"), weights,
+        )
+        mismatched = [
+            key for key, value in got.items()
+            if not math.isclose(value, expected[key], rel_tol=tolerance, abs_tol=tolerance)
+        ]
+        if got["nextIntervalDays"] != scalar[2]:
+            mismatched.append("scalar")
+        for key in mismatched:
+            print(f"  MISMATCH {case['name']} {key}: got {got.get(key)!r}, dart {expected.get(key)!r}")
+        failures += bool(mismatched)
+    print(f"Parity: {len(cases) - failures}/{len(cases)} cases match the Dart outputs in {path.name}")
+    return failures
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Simulate FSRS review load.")
+    parser.add_argument("--learners", type=int, default=1000)
+    parser.add_argument("--roots", type=int, default=1700)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--new-per-day", type=int, default=10)
+    parser.add_argument("--weights", type=Path, help="JSON weights file (see optimize_fsrs.py)")
+    parser.add_argument("--elapsed-mode", choices=["app", "true"], default="app")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", type=Path, help="Write the full report as JSON")
+    parser.add_argument("--check-parity", action="store_true")
+    return parser.parse_args()
+
+
+def load_weights(path: Path) -> list[float]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    weights = payload["weights"] if isinstance(payload, dict) else payload
+    if len(weights) != len(DEFAULT_WEIGHTS):
+        raise SystemExit(f"Expected {len(DEFAULT_WEIGHTS)} weights in {path}, got {len(weights)}")
+    return [float(w) for w in weights]
+
+
+def main():
+    args = parse_args()
+    if args.check_parity:
+        sys.exit(1 if check_parity() else 0)
+
+    weights = load_weights(args.weights) if args.weights else DEFAULT_WEIGHTS
+    started = time.perf_counter()
+    report = simulate(
+        args.learners,
+        args.roots,
+        args.days,
+        new_per_day=args.new_per_day,
+        weights=weights,
+        elapsed_mode=args.elapsed_mode,
+        seed=args.seed,
+    )
+    elapsed = time.perf_counter() - started
+    report["seconds"] = round(elapsed, 3)
+
+    print(f"Simulated {args.learners} learners x {args.roots} roots x {args.days} days "
+          f"in {elapsed:.2f}s")
+    print(f"  Total reviews:          {report['total_reviews']:,}")
+    print(f"  Retention:              {report['retention']:.3f}")
+    print(f"  Mean reviews/day/user:  {report['mean_daily_reviews_per_learner']:.1f}")
+    print(f"  Peak reviews/day/user:  {report['peak_daily_reviews_per_learner']:.1f}")
+    print(f"  State memory:           {report['state_bytes'] / 1e6:.1f} MB")
+    if report["final_mean_stability"] > args.days:
+        # Most roots were reviewed once and never came due again.
+        print(f"⚠️  Mean stability is {report['final_mean_stability']:,.0f} days, longer than the "
+              f"{args.days} simulated: the load curve is degenerate (see tools/srs/README.md)")
+
+    if args.report:
+        args.report.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote report to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
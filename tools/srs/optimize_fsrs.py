@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Fit FSRS weights to exported review logs.
+
+Input is a JSON array or NDJSON file of review events. Each event is a
+`UserProgress.toMap()` snapshot as saved by `ProgressStorage`, taken right
+after a review, plus the review itself:
+
+    {"root_id": 3, "srs_stage": "review", "stability": 12.1,
+     "difficulty": 4.9, "next_review_date": "2026-03-01T09:00:00.000",
+     "rating": 3, "reviewed_at": "2026-02-18T09:00:00.000",
+     "learner_id": "optional"}
+
+Events are grouped into (learner, root) sequences and replayed through the
+same update `fsrs_sim.review` uses. The predicted recall probability at each
+review is the retrievability since the previous review, and the loss is
+binary log-loss against `rating > 1`. `FSRS.review` reads only weights
+w0-w7, so only those are fitted; the remaining weights are copied from the
+defaults.
+
+The replay is vectorized across sequences (one NumPy op per review step)
+and carries forward-mode derivatives of stability and difficulty, so each
+full-batch Adam step costs a single pass. Cross-validation folds split by
+sequence. The output is loadable with `FSRSParameters.fromJson`.
+
+Usage:
+    python3 optimize_fsrs.py reviews.ndjson --output fsrs_weights.json
+    python3 optimize_fsrs.py --benchmark 1000000
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from fsrs_sim import (
+    DEFAULT_WEIGHTS,
+    DECAY,
+    FACTOR,
+    INITIAL_DIFFICULTY,
+    INITIAL_STABILITY,
+    next_difficulty,
+    next_interval_days,
+    next_stability,
+    retrievability,
+)
+
+FITTED = 8
+LOWER = np.array([0.01, 0.01, 0.01, 0.01, 0.0, 0.0, 0.01, 0.0])
+UPPER = np.array([100.0, 5.0, 5.0, 50.0, 10.0, 2.0, 10.0, 2.0])
+EPS = 1e-6
+BLOCK = 4096
+
+
+class Sequences:
+    """Review events packed into a (sequences, max_len) matrix, one row per
+    (learner, root) pair, ordered by review time.
+
+    Rows are sorted longest first so the sequences still active at any step
+    form a prefix of the matrix.
+    """
+
+    def __init__(self, seq_ids, days, overdue, ratings):
+        order = np.lexsort((days, seq_ids))
+        seq_ids, days = seq_ids[order], days[order]
+        overdue, ratings = overdue[order], ratings[order]
+
+        starts = np.flatnonzero(np.r_[True, seq_ids[1:] != seq_ids[:-1]])
+        lengths = np.diff(np.r_[starts, seq_ids.size])
+        rank = np.empty(starts.size, dtype=np.int64)
+        rank[np.argsort(-lengths, kind="stable")] = np.arange(starts.size)
+        row = np.repeat(rank, lengths)
+        col = np.arange(seq_ids.size) - np.repeat(starts, lengths)
+
+        shape = (starts.size, int(lengths.max()) if lengths.size else 0)
+        self.count = starts.size
+        self.events = seq_ids.size
+        self.mask = np.zeros(shape, dtype=bool)
+        self.since_last = np.zeros(shape)
+        self.overdue = np.zeros(shape)
+        self.rating = np.ones(shape, dtype=np.int64)
+        self.mask[row, col] = True
+        gaps = np.r_[0.0, np.diff(days)]
+        gaps[starts] = 0.0
+        self.since_last[row, col] = gaps
+        self.overdue[row, col] = overdue
+        self.rating[row, col] = ratings
+        # The first review of a root happens the day it is seeded, so it
+        # carries no recall signal; it only advances the state.
+        self.scored = self.mask.copy()
+        self.scored[:, 0] = False
+
+    def subset(self, rows):
+        rows = np.sort(rows)
+        part = object.__new__(Sequences)
+        for name in ("mask", "since_last", "overdue", "rating", "scored"):
+            setattr(part, name, getattr(self, name)[rows])
+        part.count = len(rows)
+        part.events = int(part.mask.sum())
+        return part
+
+
+def _retrievability_and_slope(elapsed, stability):
+    base = 1 + FACTOR * elapsed / stability
+    r = np.power(base, DECAY)
+    return r, DECAY * r / base * (-FACTOR * elapsed / (stability * stability))
+
+
+def replay(seqs: Sequences, theta: np.ndarray, elapsed_mode: str,
+           with_grad: bool = True) -> tuple[float, np.ndarray]:
+    """Mean log-loss of `theta` (weights w0-w7) and its exact gradient.
+
+    Forward-mode differentiation: alongside stability and difficulty, the
+    replay carries their derivatives with respect to each fitted weight, so
+    one pass yields the gradient. Sequences are replayed in blocks small
+    enough for the derivative arrays to stay in cache.
+    """
+    w = list(DEFAULT_WEIGHTS)
+    w[:FITTED] = [float(v) for v in theta]
+    loss = 0.0
+    grad = np.zeros(FITTED)
+    for start in range(0, seqs.count, BLOCK):
+        block = slice(start, min(start + BLOCK, seqs.count))
+        block_loss, block_grad = _replay_block(seqs, block, w, elapsed_mode, with_grad)
+        loss += block_loss
+        grad += block_grad
+    scored_total = max(int(seqs.scored.sum()), 1)
+    return loss / scored_total, np.nan_to_num(grad / scored_total)
+
+
+def _replay_block(seqs: Sequences, block: slice, w: list[float], elapsed_mode: str,
+                  with_grad: bool) -> tuple[float, np.ndarray]:
+    mask = seqs.mask[block]
+    since_last = seqs.since_last[block]
+    overdue_days = seqs.overdue[block]
+    ratings = seqs.rating[block]
+    scored_cells = seqs.scored[block]
+    count = mask.shape[0]
+
+    stability = np.full(count, INITIAL_STABILITY)
+    difficulty = np.full(count, INITIAL_DIFFICULTY)
+    d_stability = np.zeros((FITTED, count))
+    d_difficulty = np.zeros((FITTED, count))
+    loss = 0.0
+    grad = np.zeros(FITTED)
+
+    for step, n in enumerate(mask.sum(axis=0)):
+        if n == 0:
+            break
+        s = stability[:n]
+        d = difficulty[:n]
+        ds = d_stability[:, :n]
+        dd = d_difficulty[:, :n]
+        rating = ratings[:n, step]
+        scored = scored_cells[:n, step]
+
+        r, r_slope = _retrievability_and_slope(since_last[:n, step], s)
+        if scored.any():
+            p = np.clip(r, EPS, 1 - EPS)
+            y = rating > 1
+            loss -= float(np.where(y, np.log(p), np.log1p(-p))[scored].sum())
+            if with_grad:
+                dl_dr = np.where(y, -1 / p, 1 / (1 - p)) * ((r > EPS) & (r < 1 - EPS))
+                grad += ds @ (dl_dr * r_slope * scored)
+
+        if elapsed_mode == "true":
+            elapsed = np.maximum(since_last[:n, step], 1.0)
+        else:
+            overdue = overdue_days[:n, step]
+            elapsed = np.where(overdue <= 0, 1.0, overdue)
+        ru, ru_slope = _retrievability_and_slope(elapsed, s)
+
+        shift = rating - 3
+        raw_d = d + w[7] * shift
+        new_d = np.clip(raw_d, 1.0, 10.0)
+        fail = rating <= 1
+        log_s = np.log(s)
+        with np.errstate(over="ignore", invalid="ignore"):
+            forgot = w[0] * np.power(new_d, w[1]) * np.power(s, w[2]) * np.exp(w[3] * (1 - ru))
+            x = np.exp((1 - ru) * w[6])
+            b = np.exp(w[4]) * (11 - new_d) * np.power(s, -w[5])
+            growth = b * (x - 1)
+            new_s = np.where(fail, forgot, s * (1 + growth))
+
+        if with_grad:
+            d_new_d = dd.copy()
+            d_new_d[7] += shift
+            d_new_d *= (raw_d > 1) & (raw_d < 10)
+            dru = ds * ru_slope
+            ds_over_s = ds / s
+            db = d_new_d / (new_d - 11)
+            db -= w[5] * ds_over_s
+            db *= b
+            db[4] += b
+            db[5] -= b * log_s
+            dx = dru * (-w[6] * x)
+            dx[6] += x * (1 - ru)
+            d_new_s = ds * (1 + growth)
+            d_new_s += s * (db * (x - 1) + b * dx)
+            # Lapses are rare, so their branch is differentiated on its lanes only.
+            lapses = np.flatnonzero(fail)
+            if lapses.size:
+                d_log_forgot = (
+                    w[1] * d_new_d[:, lapses] / new_d[lapses]
+                    + w[2] * ds_over_s[:, lapses]
+                    - w[3] * dru[:, lapses]
+                )
+                d_log_forgot[0] += 1 / w[0]
+                d_log_forgot[1] += np.log(new_d[lapses])
+                d_log_forgot[2] += log_s[lapses]
+                d_log_forgot[3] += 1 - ru[lapses]
+                d_new_s[:, lapses] = forgot[lapses] * d_log_forgot
+            in_range = np.isfinite(new_s) & (new_s > 0.01) & (new_s < 36500.0)
+            d_stability[:, :n] = np.nan_to_num(d_new_s) * in_range
+            d_difficulty[:, :n] = d_new_d
+
+        stability[:n] = np.clip(np.nan_to_num(new_s, nan=INITIAL_STABILITY), 0.01, 36500.0)
+        difficulty[:n] = new_d
+
+    return loss, grad
+
+
+def replay_loss(seqs: Sequences, theta, elapsed_mode: str) -> float:
+    return replay(seqs, np.asarray(theta, dtype=np.float64), elapsed_mode, with_grad=False)[0]
+
+
+def fit(seqs: Sequences, initial, iterations: int, learning_rate: float,
+        elapsed_mode: str) -> tuple[np.ndarray, float]:
+    """Full-batch Adam on the exact log-loss gradient."""
+    theta = np.clip(np.asarray(initial[:FITTED], dtype=np.float64), LOWER, UPPER)
+    m = np.zeros(FITTED)
+    v = np.zeros(FITTED)
+    beta1, beta2 = 0.9, 0.999
+    best_theta, best_loss = theta, np.inf
+    for t in range(1, iterations + 1):
+        loss, grad = replay(seqs, theta, elapsed_mode)
+        if loss < best_loss:
+            best_theta, best_loss = theta, loss
+        m = beta1 * m + (1 - beta1) * grad
+        v = beta2 * v + (1 - beta2) * grad * grad
+        m_hat = m / (1 - beta1 ** t)
+        v_hat = v / (1 - beta2 ** t)
+        # Steps scale with each weight's magnitude; the weights span 0.02-15.
+        step = learning_rate * np.maximum(np.abs(theta), 0.1) * m_hat / (np.sqrt(v_hat) + 1e-8)
+        theta = np.clip(theta - step, LOWER, UPPER)
+    loss = replay_loss(seqs, theta, elapsed_mode)
+    if loss < best_loss:
+        best_theta, best_loss = theta, loss
+    return best_theta, best_loss
+
+
+def cross_validate(seqs: Sequences, folds: int, iterations: int, learning_rate: float,
+                   elapsed_mode: str, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    assignment = rng.integers(0, folds, seqs.count)
+    default = DEFAULT_WEIGHTS[:FITTED]
+    results = []
+    for fold in range(folds):
+        train = seqs.subset(np.flatnonzero(assignment != fold))
+        test = seqs.subset(np.flatnonzero(assignment == fold))
+        theta, train_loss = fit(train, DEFAULT_WEIGHTS, iterations, learning_rate, elapsed_mode)
+        results.append({
+            "fold": fold,
+            "train_log_loss": train_loss,
+            "test_log_loss": replay_loss(test, theta, elapsed_mode),
+            "test_log_loss_default": replay_loss(test, default, elapsed_mode),
+        })
+    return results
+
+
+def _epoch_days(values: list[str]) -> np.ndarray:
+    stamps = np.array([v.rstrip("Z") for v in values], dtype="datetime64[ms]")
+    return stamps.astype(np.int64) / 86_400_000.0
+
+
+def load_events(path: Path) -> Sequences:
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        events = json.loads(text)
+    else:
+        events = [json.loads(line) for line in text.splitlines() if line.strip()]
+    events = [e for e in events if e.get("rating") and e.get("reviewed_at")]
+    if not events:
+        raise SystemExit(f"No review events with rating and reviewed_at in {path}")
+
+    keys: dict[tuple, int] = {}
+    seq_ids = np.array(
+        [keys.setdefault((e.get("learner_id", ""), e["root_id"]), len(keys)) for e in events],
+        dtype=np.int64,
+    )
+    reviewed = _epoch_days([e["reviewed_at"] for e in events])
+    due = _epoch_days([e.get("next_review_date") or e["reviewed_at"] for e in events])
+    ratings = np.array([int(e["rating"]) for e in events], dtype=np.int64)
+
+    # `next_review_date` on a snapshot is the due date set by that review, so
+    # the days overdue at a review come from the previous snapshot in its
+    # sequence, truncated like `Duration.inDays`.
+    order = np.lexsort((reviewed, seq_ids))
+    prev_due = np.empty_like(due)
+    prev_due[order] = np.r_[reviewed[order][0], due[order][:-1]]
+    first = np.r_[True, seq_ids[order][1:] != seq_ids[order][:-1]]
+    prev_due[order[first]] = reviewed[order[first]]
+    overdue = np.trunc(reviewed - prev_due)
+    return Sequences(seq_ids, reviewed, overdue, ratings)
+
+
+def synthetic_events(count: int, seed: int) -> Sequences:
+    """Review histories drawn from the scheduler itself, for benchmarking."""
+    rng = np.random.default_rng(seed)
+    seq_len = 20
+    n_seq = max(1, count // seq_len)
+    true_w = np.asarray(DEFAULT_WEIGHTS, dtype=np.float64).copy()
+    true_w[4] = 0.5
+    days = np.zeros((n_seq, seq_len))
+    ratings = np.ones((n_seq, seq_len), dtype=np.int64)
+    overdue = np.zeros((n_seq, seq_len))
+    s = np.full(n_seq, INITIAL_STABILITY)
+    d = np.full(n_seq, INITIAL_DIFFICULTY)
+    now = np.zeros(n_seq)
+    for step in range(seq_len):
+        interval = next_interval_days(s) if step else np.zeros(n_seq, dtype=np.int64)
+        lateness = rng.integers(0, 3, n_seq) if step else np.zeros(n_seq, dtype=np.int64)
+        gap = interval + lateness
+        now = now + gap
+        r = retrievability(gap.astype(np.float64), s)
+        recalled = rng.random(n_seq) < r
+        rating = np.where(recalled, rng.choice([2, 3, 4], n_seq, p=[0.15, 0.75, 0.1]), 1)
+        elapsed = np.where(lateness <= 0, 1.0, lateness)
+        d = next_difficulty(d, rating, true_w)
+        s = np.clip(next_stability(s, d, retrievability(elapsed, s), rating, true_w), 0.01, 36500.0)
+        days[:, step] = now
+        ratings[:, step] = rating
+        overdue[:, step] = lateness
+    seq_ids = np.repeat(np.arange(n_seq), seq_len)
+    return Sequences(seq_ids, days.ravel(), overdue.ravel(), ratings.ravel())
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fit FSRS weights to review logs.")
+    parser.add_argument("reviews", type=Path, nargs="?", help="JSON or NDJSON review events")
+    parser.add_argument("--output", type=Path, default=Path("fsrs_weights.json"))
+    parser.add_argument("--iterations", type=int, default=25)
+    parser.add_argument("--learning-rate", type=float, default=0.05)
+    parser.add_argument("--folds", type=int, default=3, help="0 disables cross-validation")
+    parser.add_argument("--elapsed-mode", choices=["app", "true"], default="app")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="EVENTS",
+        help="Fit synthetic review histories of this size instead of a file",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    started = time.perf_counter()
+    if args.benchmark:
+        seqs = synthetic_events(args.benchmark, args.seed)
+    elif args.reviews:
+        seqs = load_events(args.reviews)
+    else:
+        raise SystemExit("Pass a review log or --benchmark EVENTS")
+    loaded = time.perf_counter()
+    print(f"Loaded {seqs.events:,} events in {seqs.count:,} sequences "
+          f"in {loaded - started:.2f}s")
+
+    folds = []
+    if args.folds > 1:
+        folds = cross_validate(seqs, args.folds, args.iterations, args.learning_rate,
+                               args.elapsed_mode, args.seed)
+        for result in folds:
+            print(f"  fold {result['fold']}: train {result['train_log_loss']:.4f}  "
+                  f"test {result['test_log_loss']:.4f}  "
+                  f"(default weights {result['test_log_loss_default']:.4f})")
+        mean_test = float(np.mean([r["test_log_loss"] for r in folds]))
+        print(f"  mean test log-loss: {mean_test:.4f}")
+
+    theta, loss = fit(seqs, DEFAULT_WEIGHTS, args.iterations, args.learning_rate,
+                      args.elapsed_mode)
+    weights = list(DEFAULT_WEIGHTS)
+    weights[:FITTED] = [round(float(w), 4) for w in theta]
+    elapsed = time.perf_counter() - started
+    print(f"Fitted log-loss {loss:.4f} in {elapsed:.1f}s total")
+
+    payload = {
+        "weights": weights,
+        "requestRetention": 0.9,
+        "logLoss": round(loss, 6),
+        "crossValidation": folds,
+        "events": seqs.events,
+    }
+    args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()